@@ -1,6 +1,15 @@
 """Module for providing base classes."""
 from .advanced import *
 from .auxiliary import *
+from .banstore import *
 from .cogs import *
+from .configcache import *
+from .configwatch import *
 from .data import *
+from .dispatch import *
 from .extension import *
+from .http import *
+from .ratelimit import *
+from .scheduler import *
+from .singleflight import *
+from .warnstore import *
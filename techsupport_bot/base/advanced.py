@@ -3,16 +3,22 @@ import asyncio
 import datetime
 import sys
 import time
+from collections import OrderedDict
 
 import discord
 import error
-import expiringdict
 import munch
 import util
 from base import auxiliary
 from discord.ext import commands
 
+from .banstore import BanStore
+from .configcache import GuildConfigCache
 from .data import DataBot
+from .dispatch import MatchDispatcher, MessageDispatch
+from .scheduler import CronScheduler
+from .singleflight import SingleFlight
+from .warnstore import WarningStore
 
 
 class AdvancedBot(DataBot):
@@ -23,23 +29,41 @@ class AdvancedBot(DataBot):
 
     GUILD_CONFIG_COLLECTION = "guild_config"
     CONFIG_RECEIVE_WARNING_TIME_MS = 1000
+    CONFIG_CACHE_REPORT_INTERVAL = 1000
+    MESSAGE_DISPATCH_CACHE_LENGTH = 256
     DM_GUILD_ID = "dmcontext"
 
     def __init__(self, *args, **kwargs):
         self.owner = None
         self.__startup_time = None
         self.guild_config_collection = None
-        self.guild_config_lock = None
+        self.guild_config_watcher = None
         super().__init__(*args, prefix=self.get_prefix, **kwargs)
-        self.guild_config_cache = expiringdict.ExpiringDict(
-            max_len=self.file_config.cache.guild_config_cache_length,
-            max_age_seconds=self.file_config.cache.guild_config_cache_seconds,
+        self.guild_config_cache = GuildConfigCache(
+            max_bytes=self.file_config.cache.get(
+                "guild_config_cache_bytes", 20_000_000
+            ),
+            ttl=self.file_config.cache.guild_config_cache_seconds,
+            stale_ttl=self.file_config.cache.get("guild_config_stale_seconds", 300),
         )
-
-    async def start(self, *args, **kwargs):
-        """Function is automatically called when the bot is started by discord.py"""
-        self.guild_config_lock = asyncio.Lock()
-        await super().start(*args, **kwargs)
+        # Loads of the same guild config share one Mongo round trip,
+        # this also keeps duplicate configs from being created
+        self.guild_config_flight = SingleFlight()
+        # Background refreshes of stale guild configs
+        self.config_refresh_tasks = set()
+        # Message ID to the resolving config/dispatch task of recent messages
+        self.message_configs = OrderedDict()
+        self.message_dispatches = OrderedDict()
+        self.match_dispatcher = MatchDispatcher(self)
+        self.add_listener(self.match_dispatcher.on_message, "on_message")
+        # Shared by every cog that runs cron jobs
+        self.scheduler = CronScheduler(self)
+        # Shared by every extension that reads or gives warnings
+        self.warning_store = WarningStore(self)
+        # Kept up to date by the member ban events
+        self.ban_store = BanStore()
+        self.add_listener(self.ban_store.on_member_ban, "on_member_ban")
+        self.add_listener(self.ban_store.on_member_unban, "on_member_unban")
 
     async def get_prefix(self, message):
         """Gets the appropriate prefix for a command.
@@ -47,11 +71,62 @@ class AdvancedBot(DataBot):
         parameters:
             message (discord.Message): the message to check against
         """
-        guild_config = await self.get_context_config(guild=message.guild)
+        guild_config = await self.get_message_config(message) if message.guild else None
         return getattr(
             guild_config, "command_prefix", self.file_config.bot_config.default_prefix
         )
 
+    def get_message_task(self, tasks, message, coro_fn):
+        """Gets the task resolving a value for a message, starting it if needed.
+
+        Only the most recent messages are remembered.
+
+        parameters:
+            tasks (OrderedDict): message ID to task mapping to look in
+            message (discord.Message): the message to resolve the value for
+            coro_fn (Callable): the coroutine function that resolves the value
+        """
+        task = tasks.get(message.id)
+        if not task:
+            task = asyncio.ensure_future(coro_fn(message))
+            tasks[message.id] = task
+            while len(tasks) > self.MESSAGE_DISPATCH_CACHE_LENGTH:
+                tasks.popitem(last=False)
+        return task
+
+    async def get_message_config(self, message):
+        """Gets the config for the context of a message, looked up once per message.
+
+        parameters:
+            message (discord.Message): the message to get the config for
+        """
+        # only the guild of the message is read, so it can stand in for a context
+        task = self.get_message_task(
+            self.message_configs, message, self.get_context_config
+        )
+        return await asyncio.shield(task)
+
+    async def get_message_dispatch(self, message):
+        """Gets the context and config of a message, resolved once per message.
+
+        parameters:
+            message (discord.Message): the message to get the dispatch for
+        """
+        task = self.get_message_task(
+            self.message_dispatches, message, self.build_message_dispatch
+        )
+        return await asyncio.shield(task)
+
+    async def build_message_dispatch(self, message):
+        """Builds the context and looks up the config of a message.
+
+        parameters:
+            message (discord.Message): the message to build the dispatch for
+        """
+        ctx = await self.get_context(message)
+        config = await self.get_message_config(message)
+        return MessageDispatch(message, ctx, config)
+
     async def get_all_context_configs(self, projection, limit=100):
         """Gets all context configs.
 
@@ -89,26 +164,29 @@ class AdvancedBot(DataBot):
         lookup = str(lookup)
 
         config_ = None
+        entry = self.guild_config_cache.get(lookup) if get_from_cache else None
 
-        if get_from_cache:
-            config_ = self.guild_config_cache.get(lookup)
-
-        if not config_:
-            # locking prevents duplicate configs being made
-            async with self.guild_config_lock:
-                config_ = await self.guild_config_collection.find_one(
-                    {"guild_id": {"$eq": lookup}}
-                )
-
-                if not config_:
-                    await self.logger.debug("No config found in MongoDB")
-                    if create_if_none:
-                        config_ = await self.create_new_context_config(lookup)
-                else:
-                    config_ = await self.sync_config(config_)
+        if entry and (entry.config or not create_if_none):
+            config_ = entry.config
+            if not self.guild_config_cache.is_fresh(entry):
+                self.refresh_context_config(lookup, create_if_none)
+        else:
+            config_ = await self.guild_config_flight.run(
+                (lookup, create_if_none),
+                self.load_context_config,
+                lookup,
+                create_if_none,
+            )
 
-                if config_:
-                    self.guild_config_cache[lookup] = config_
+        lookups = self.guild_config_cache.lookups
+        if get_from_cache and lookups % self.CONFIG_CACHE_REPORT_INTERVAL == 0:
+            stats = self.guild_config_cache.stats()
+            await self.logger.info(
+                f"Guild config cache hit ratio = {stats['hit_ratio']:.2%}"
+                f" ({stats['hits']} hits, {stats['stale_hits']} stale hits,"
+                f" {stats['misses']} misses, {stats['entries']} entries,"
+                f" {stats['bytes']} bytes)"
+            )
 
         time_taken = (time.time() - start) * 1000.0
 
@@ -121,6 +199,57 @@ class AdvancedBot(DataBot):
 
         return config_
 
+    async def load_context_config(self, lookup, create_if_none=True):
+        """Loads a guild config from MongoDB and stores it in the cache.
+
+        parameters:
+            lookup (str): the primary key for the guild config document object
+            create_if_none (bool): True if the config should be created if not found
+        """
+        config_ = await self.guild_config_collection.find_one(
+            {"guild_id": {"$eq": lookup}}
+        )
+
+        if not config_:
+            await self.logger.debug("No config found in MongoDB")
+            if create_if_none:
+                config_ = await self.create_new_context_config(lookup)
+        else:
+            config_ = await self.sync_config(config_)
+
+        # A missing config is cached too, so repeated lookups don't hit MongoDB
+        self.guild_config_cache.store(lookup, config_)
+
+        return config_
+
+    def refresh_context_config(self, lookup, create_if_none=True):
+        """Reloads a stale guild config in the background.
+
+        parameters:
+            lookup (str): the primary key for the guild config document object
+            create_if_none (bool): True if the config should be created if not found
+        """
+        key = (lookup, create_if_none)
+        if key in self.guild_config_flight:
+            return
+
+        async def refresh():
+            try:
+                await self.guild_config_flight.run(
+                    key, self.load_context_config, lookup, create_if_none
+                )
+            except Exception as exception:
+                # the stale config stays cached until it expires
+                await self.logger.error(
+                    f"Could not refresh guild config for lookup key: {lookup}",
+                    exception=exception,
+                )
+
+        task = asyncio.create_task(refresh())
+        # keep a reference so the refresh isn't garbage collected while it runs
+        self.config_refresh_tasks.add(task)
+        task.add_done_callback(self.config_refresh_tasks.discard)
+
     async def create_new_context_config(self, lookup):
         """Creates a new guild config based on a lookup key (usually a guild ID).
 
@@ -143,6 +272,7 @@ class AdvancedBot(DataBot):
         config_.guild_events_channel = None
         config_.private_channels = []
         config_.enabled_extensions = []
+        config_.config_version = 1
 
         config_.extensions = extensions_config
 
@@ -186,12 +316,23 @@ class AdvancedBot(DataBot):
             await self.logger.debug(
                 f"Updating guild config for lookup key: {config_object.guild_id}"
             )
-            await self.guild_config_collection.replace_one(
-                {"_id": config_object.get("_id")}, config_object
-            )
+            await self.write_context_config(config_object)
 
         return config_object
 
+    async def write_context_config(self, config_object):
+        """Replaces a guild config in MongoDB and bumps its version.
+
+        The version lets the config watcher notice the change when it's polling.
+
+        parameters:
+            config_object (dict): the guild config object
+        """
+        config_object["config_version"] = (config_object.get("config_version") or 0) + 1
+        await self.guild_config_collection.replace_one(
+            {"guild_id": config_object.get("guild_id")}, config_object
+        )
+
     async def can_run(self, ctx, *, call_once=False):
         """Wraps the default can_run check to evaluate bot-admin permission.
 
@@ -203,7 +344,7 @@ class AdvancedBot(DataBot):
 
         extension_name = self.get_command_extension_name(ctx.command)
         if extension_name:
-            config = await self.get_context_config(ctx)
+            config = await self.get_message_config(ctx.message)
             if not extension_name in config.enabled_extensions:
                 raise error.ExtensionDisabled
 
@@ -354,7 +495,12 @@ class AdvancedBot(DataBot):
                 send=True,
             )
 
-        await self.process_commands(message)
+        if message.author.bot:
+            return
+
+        # Same as process_commands, but with the context shared with the match cogs
+        dispatch = await self.get_message_dispatch(message)
+        await self.invoke(dispatch.ctx)
 
     async def on_command(self, ctx):
         """
@@ -0,0 +1,104 @@
+"""Module for tracking which users are banned from guilds."""
+
+import time
+from collections import OrderedDict
+
+import discord
+
+
+class BanStore:
+    """Cache of the ban state of users, checked with single ban lookups.
+
+    Instead of paging through a guild's whole ban list, a user is looked up
+    with one fetch_ban call. The result is cached, and the member ban and
+    unban events keep the cache up to date. Entries still expire after a
+    while, in case events were missed while the bot was disconnected.
+
+    parameters:
+        max_entries (int): the max number of ban states to cache
+        ttl (float): the number of seconds a ban state is trusted for
+    """
+
+    def __init__(self, max_entries=50000, ttl=3600):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def set_banned(self, guild_id, user_id, banned):
+        """Stores the ban state of a user.
+
+        parameters:
+            guild_id (int): the ID of the guild
+            user_id (int): the ID of the user
+            banned (bool): True if the user is banned from the guild
+        """
+        lookup = (guild_id, user_id)
+        self.entries[lookup] = (banned, time.monotonic())
+        self.entries.move_to_end(lookup)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def get_cached(self, guild_id, user_id):
+        """Gets the cached ban state of a user, None if it isn't known.
+
+        parameters:
+            guild_id (int): the ID of the guild
+            user_id (int): the ID of the user
+        """
+        entry = self.entries.get((guild_id, user_id))
+        if not entry:
+            return None
+        banned, stored_at = entry
+        if time.monotonic() - stored_at >= self.ttl:
+            del self.entries[(guild_id, user_id)]
+            return None
+        return banned
+
+    async def is_banned(self, guild, user):
+        """Checks if a user is banned from a guild.
+
+        parameters:
+            guild (discord.Guild): the guild to check
+            user (discord.abc.Snowflake): the user to check
+        """
+        banned = self.get_cached(guild.id, user.id)
+        if banned is not None:
+            self.hits += 1
+            return banned
+
+        self.misses += 1
+        try:
+            await guild.fetch_ban(user)
+            banned = True
+        except discord.NotFound:
+            banned = False
+        self.set_banned(guild.id, user.id, banned)
+        return banned
+
+    async def on_member_ban(self, guild, user):
+        """Marks a user as banned when the ban event is received.
+
+        parameters:
+            guild (discord.Guild): the guild the user was banned from
+            user (discord.User): the banned user
+        """
+        self.set_banned(guild.id, user.id, True)
+
+    async def on_member_unban(self, guild, user):
+        """Marks a user as not banned when the unban event is received.
+
+        parameters:
+            guild (discord.Guild): the guild the user was unbanned from
+            user (discord.User): the unbanned user
+        """
+        self.set_banned(guild.id, user.id, False)
+
+    def stats(self):
+        """Gets the hit/miss counters and size of the cache."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "entries": len(self.entries),
+        }
@@ -93,35 +93,62 @@ class MatchCog(BaseCog):
     """
 
     COG_TYPE = "Match"
+    # True if the cog should never see messages outside of guilds
+    GUILD_ONLY = False
 
-    @commands.Cog.listener()
-    async def on_message(self, message):
-        """Listens for a message and passes it to the response handler if valid.
+    async def cog_load(self):
+        """Registers the cog with the bot's match dispatcher."""
+        self.bot.match_dispatcher.register(self)
+
+    async def cog_unload(self):
+        """Unregisters the cog from the bot's match dispatcher."""
+        self.bot.match_dispatcher.unregister(self)
+
+    def match_channels(self, _config):
+        """Gets the IDs of the only channels the cog can match in.
+
+        This is a cheap pre-filter checked before match() is awaited,
+        None means the cog can match in any channel.
 
         parameters:
-            message (message): the message object
+            config (dict): the config associated with the context
         """
-        if message.author == self.bot.user:
-            return
+        return None
+
+    def match_prefix(self, _config):
+        """Gets the prefix that every message the cog can match starts with.
+
+        This is a cheap pre-filter checked before match() is awaited,
+        None means the cog can match any message.
 
-        ctx = await self.bot.get_context(message)
+        parameters:
+            config (dict): the config associated with the context
+        """
+        return None
+
+    async def handle_message(self, dispatch):
+        """Passes a message to the response handler if valid.
 
-        config = await self.bot.get_context_config(ctx)
+        This is called by the bot's match dispatcher.
+
+        parameters:
+            dispatch (base.MessageDispatch): the context and config of the message
+        """
+        ctx = dispatch.ctx
+        config = dispatch.config
         if not config:
             return
 
         if not self.extension_enabled(config):
             return
 
-        result = await self.match(config, ctx, message.content)
+        result = await self.match(config, ctx, dispatch.message.content)
         if not result:
             return
 
         try:
-            await self.response(config, ctx, message.content, result)
+            await self.response(config, ctx, dispatch.message.content, result)
         except Exception as e:
-            await self.bot.logger.debug("Checking config for log channel")
-            config = await self.bot.get_context_config(ctx)
             channel = config.get("logging_channel")
             await self.bot.logger.error(
                 f"Match cog error: {self.__class__.__name__} {e}!",
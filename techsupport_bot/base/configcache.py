@@ -0,0 +1,161 @@
+"""Module for caching guild configs."""
+
+import json
+import time
+from collections import OrderedDict
+
+
+class GuildConfigCacheEntry:
+    """An entry in the guild config cache.
+
+    parameters:
+        config (munch.Munch): the guild config, None if the guild has no config
+        size (int): the approximate size of the config in bytes
+    """
+
+    def __init__(self, config, size):
+        self.config = config
+        self.size = size
+        self.stored_at = time.monotonic()
+
+    @property
+    def age(self):
+        """Gets the number of seconds since the entry was stored."""
+        return time.monotonic() - self.stored_at
+
+
+class GuildConfigCache:
+    """Byte-size bounded LRU cache of guild configs.
+
+    Entries are fresh for `ttl` seconds. After that they are still served for
+    `stale_ttl` more seconds while they are refreshed in the background,
+    so a slow database doesn't hold up message handling.
+
+    parameters:
+        max_bytes (int): the max total size of the cached configs
+        ttl (float): the number of seconds a config is fresh for
+        stale_ttl (float): the number of seconds a config can be served stale
+    """
+
+    def __init__(self, max_bytes, ttl, stale_ttl=0):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.entries = OrderedDict()
+        self.current_bytes = 0
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+
+    def __contains__(self, lookup):
+        return lookup in self.entries
+
+    def __len__(self):
+        return len(self.entries)
+
+    @property
+    def lookups(self):
+        """Gets the total number of lookups made against the cache."""
+        return self.hits + self.stale_hits + self.misses
+
+    @staticmethod
+    def get_size(config):
+        """Gets the approximate size of a config in bytes.
+
+        parameters:
+            config (munch.Munch): the guild config
+        """
+        if config is None:
+            return 0
+        return len(json.dumps(config, default=str))
+
+    def is_fresh(self, entry):
+        """Checks if an entry can be served without a refresh.
+
+        parameters:
+            entry (GuildConfigCacheEntry): the cache entry
+        """
+        return entry.age < self.ttl
+
+    def get(self, lookup):
+        """Gets a cache entry, which may be stale and need a refresh.
+
+        parameters:
+            lookup (str): the guild ID lookup key
+        """
+        entry = self.entries.get(lookup)
+        if not entry:
+            self.misses += 1
+            return None
+
+        if entry.age >= self.ttl + self.stale_ttl:
+            self.pop(lookup)
+            self.misses += 1
+            return None
+
+        self.entries.move_to_end(lookup)
+        if self.is_fresh(entry):
+            self.hits += 1
+        else:
+            self.stale_hits += 1
+        return entry
+
+    def peek(self, lookup):
+        """Gets a fresh config without counting a lookup or marking it as used.
+
+        parameters:
+            lookup (str): the guild ID lookup key
+        """
+        entry = self.entries.get(lookup)
+        if not entry or not self.is_fresh(entry):
+            return None
+        return entry.config
+
+    def store(self, lookup, config):
+        """Stores a config, or a negative entry if the config is None.
+
+        parameters:
+            lookup (str): the guild ID lookup key
+            config (munch.Munch): the guild config
+        """
+        entry = GuildConfigCacheEntry(config, self.get_size(config))
+        self.pop(lookup)
+        self.entries[lookup] = entry
+        self.current_bytes += entry.size
+        self.evict()
+
+    def pop(self, lookup):
+        """Removes an entry from the cache.
+
+        parameters:
+            lookup (str): the guild ID lookup key
+        """
+        entry = self.entries.pop(lookup, None)
+        if entry:
+            self.current_bytes -= entry.size
+        return entry
+
+    def evict(self):
+        """Evicts the least recently used entries until the cache is within bounds."""
+        # Always keep the newest entry, even if it's bigger than the whole cache
+        while len(self.entries) > 1 and self.current_bytes > self.max_bytes:
+            _, entry = self.entries.popitem(last=False)
+            self.current_bytes -= entry.size
+
+    def clear(self):
+        """Removes every entry from the cache."""
+        self.entries.clear()
+        self.current_bytes = 0
+
+    def stats(self):
+        """Gets the hit/miss counters and size of the cache."""
+        return {
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "hit_ratio": (
+                (self.hits + self.stale_hits) / self.lookups if self.lookups else 0.0
+            ),
+            "entries": len(self.entries),
+            "bytes": self.current_bytes,
+        }
@@ -0,0 +1,159 @@
+"""Module for pushing guild config changes into the config cache."""
+
+import asyncio
+
+import munch
+from pymongo import errors
+
+
+class GuildConfigWatcher:
+    """Keeps the guild config cache in sync with the guild config collection.
+
+    This uses a MongoDB change stream when the server supports it (replica sets),
+    and otherwise polls the config_version field of the cached configs.
+    While the watcher is running the cache TTL is raised to `watched_ttl`.
+
+    parameters:
+        bot (bot.TechSupportBot): the bot object
+        collection (motor.motor_asyncio.AsyncIOMotorCollection): the config collection
+        cache (base.GuildConfigCache): the cache to keep in sync
+        watched_ttl (float): the cache TTL to use while the watcher is running
+        poll_seconds (float): the number of seconds between polls
+    """
+
+    VERSION_KEY = "config_version"
+    RETRY_SECONDS = 10
+
+    def __init__(self, bot, collection, cache, watched_ttl, poll_seconds=30):
+        self.bot = bot
+        self.collection = collection
+        self.cache = cache
+        self.watched_ttl = watched_ttl
+        self.poll_seconds = poll_seconds
+        self.unwatched_ttl = cache.ttl
+        self.mode = None
+        self.updates = 0
+        self.invalidations = 0
+        self.task = None
+
+    def start(self):
+        """Starts the watcher in the background."""
+        if not self.task or self.task.done():
+            self.task = asyncio.create_task(self.run())
+
+    async def stop(self):
+        """Stops the watcher and restores the cache TTL."""
+        if self.task:
+            self.task.cancel()
+            try:
+                await self.task
+            except asyncio.CancelledError:
+                pass
+            self.task = None
+        self.cache.ttl = self.unwatched_ttl
+
+    async def run(self):
+        """Watches the collection, falling back to polling if needed."""
+        try:
+            while True:
+                try:
+                    await self.watch()
+                except errors.OperationFailure as exception:
+                    # change streams need a replica set or sharded cluster
+                    await self.bot.logger.info(
+                        "Guild config change streams are unavailable"
+                        f" ({exception}) - polling for config versions instead"
+                    )
+                    await self.poll()
+                except errors.PyMongoError as exception:
+                    # anything could have changed while the stream was down
+                    self.cache.ttl = self.unwatched_ttl
+                    self.cache.clear()
+                    await self.bot.logger.warning(
+                        "Guild config change stream failed - retrying in"
+                        f" {self.RETRY_SECONDS} seconds: {exception}"
+                    )
+                    await asyncio.sleep(self.RETRY_SECONDS)
+        finally:
+            self.cache.ttl = self.unwatched_ttl
+            self.mode = None
+
+    async def watch(self):
+        """Applies change stream events to the cache as they come in."""
+        async with self.collection.watch(full_document="updateLookup") as stream:
+            self.mode = "change stream"
+            self.cache.ttl = self.watched_ttl
+            await self.bot.logger.info("Watching guild configs with a change stream")
+            async for change in stream:
+                self.apply_change(change)
+
+    async def poll(self):
+        """Invalidates cached configs whose version changed in the collection."""
+        self.mode = "polling"
+        self.cache.ttl = self.watched_ttl
+        while True:
+            try:
+                await self.poll_once()
+            except errors.PyMongoError as exception:
+                await self.bot.logger.warning(
+                    f"Could not poll guild config versions: {exception}"
+                )
+            await asyncio.sleep(self.poll_seconds)
+
+    async def poll_once(self):
+        """Checks the version of every cached config against the collection."""
+        lookups = list(self.cache.entries)
+        if not lookups:
+            return
+
+        versions = {}
+        cursor = self.collection.find(
+            {"guild_id": {"$in": lookups}},
+            {"guild_id": 1, self.VERSION_KEY: 1, "_id": 0},
+        )
+        async for document in cursor:
+            versions[document.get("guild_id")] = document.get(self.VERSION_KEY)
+
+        for lookup in lookups:
+            entry = self.cache.entries.get(lookup)
+            if not entry:
+                continue
+            if entry.config is None:
+                changed = lookup in versions
+            else:
+                changed = lookup not in versions or versions[
+                    lookup
+                ] != entry.config.get(self.VERSION_KEY)
+            if changed:
+                self.cache.pop(lookup)
+                self.invalidations += 1
+
+    def apply_change(self, change):
+        """Applies a single change stream event to the cache.
+
+        parameters:
+            change (dict): the change stream event
+        """
+        operation = change.get("operationType")
+        document = change.get("fullDocument")
+
+        if operation in ("insert", "replace", "update") and document:
+            lookup = document.get("guild_id")
+            # only configs that are already cached are patched
+            if lookup in self.cache:
+                self.cache.store(lookup, munch.munchify(document))
+                self.updates += 1
+            return
+
+        if operation in ("drop", "rename", "dropDatabase", "invalidate"):
+            self.cache.clear()
+            self.invalidations += 1
+            return
+
+        # deletes and updates without a full document only have the _id,
+        # so the cached config is dropped and the next load picks up the change
+        document_id = change.get("documentKey", {}).get("_id")
+        for lookup, entry in list(self.cache.entries.items()):
+            if entry.config is not None and entry.config.get("_id") == document_id:
+                self.cache.pop(lookup)
+                self.invalidations += 1
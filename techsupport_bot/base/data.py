@@ -1,18 +1,18 @@
 """Module for defining the data bot methods."""
 
-import time
+import hashlib
+import json
 import urllib
-from collections import deque
 from urllib.parse import urlparse
 
-import aiohttp
-import expiringdict
 import gino
 import munch
-from error import HTTPRateLimit
 from motor import motor_asyncio
 
 from .extension import ExtensionsBot
+from .http import HTTPResponse, HTTPResponseCache, HTTPSessionPool
+from .ratelimit import RateLimiter
+from .singleflight import SingleFlight
 
 
 class DataBot(ExtensionsBot):
@@ -22,11 +22,29 @@ class DataBot(ExtensionsBot):
         self.mongo = None
         self.db = None
         super().__init__(*args, **kwargs)
-        self.http_cache = expiringdict.ExpiringDict(
-            max_len=self.file_config.cache.http_cache_length,
-            max_age_seconds=self.file_config.cache.http_cache_seconds,
+        # Cache TTL overrides for each root URL, these win over Cache-Control max-age
+        # This is "URL": seconds
+        self.http_cache_ttls = {
+            "api.urbandictionary.com": 3600,
+            "api.openweathermap.org": 300,
+            "www.googleapis.com": 600,
+        }
+        self.http_cache = HTTPResponseCache(
+            max_bytes=self.file_config.cache.get("http_cache_bytes", 5_000_000),
+            max_entries=self.file_config.cache.http_cache_length,
+            default_ttl=self.file_config.cache.http_cache_seconds,
+            host_ttls=self.http_cache_ttls,
+        )
+        http_config = self.file_config.get("http") or munch.Munch()
+        self.http_pool = HTTPSessionPool(
+            limit=http_config.get("connection_limit", 100),
+            limit_per_host=http_config.get("connection_limit_per_host", 10),
+            keepalive_seconds=http_config.get("keepalive_seconds", 30),
+            dns_cache_seconds=http_config.get("dns_cache_seconds", 300),
+            dedicated_hosts=http_config.get("dedicated_hosts"),
         )
-        self.url_rate_limit_history = {}
+        # Identical GETs that are in flight at the same time share one request
+        self.http_inflight = SingleFlight()
         # Rate limit configurations for each root URL
         # This is "URL": (calls, seconds)
         self.rate_limits = {
@@ -64,6 +82,12 @@ class DataBot(ExtensionsBot):
             )
         except AttributeError:
             self.logger.warning("No linx API URL found. Not rate limiting linx")
+        # Calls over the limit wait up to rate_limit_wait_seconds for a token
+        self.rate_limiter = RateLimiter(
+            self.rate_limits,
+            max_wait=http_config.get("rate_limit_wait_seconds", 5),
+            queue_size=http_config.get("rate_limit_queue_size", 10),
+        )
 
     def generate_db_url(self, postgres=True):
         """Dynamically converts config to a Postgres/MongoDB url.
@@ -126,6 +150,74 @@ class DataBot(ExtensionsBot):
 
         return mongo_client[self.file_config.database.mongodb.name]
 
+    async def fetch_http_response(
+        self, method, url, root_url, cache_key, use_cache, api_key, *args, **kwargs
+    ):
+        """Gets a response from the cache or the upstream API.
+
+        This is the part of http_call that is shared between coalesced GETs,
+        it returns the response object and a message to log.
+
+        parameters:
+            method (str): the lowercase HTTP method to use
+            url (str): the URL to call
+            root_url (str): the root URL (netloc) being called
+            cache_key (str): the key of the request in the HTTP cache
+            use_cache (bool): True if the GET result should be grabbed from cache
+            api_key (str): the API key identifier used for rate limiting
+        """
+        cache_entry = self.http_cache.get(cache_key) if use_cache else None
+
+        if cache_entry and cache_entry.is_fresh():
+            response_object = cache_entry.response
+            log_message = f"Retrieving cached HTTP GET response ({cache_key})"
+        else:
+            # Cache hits don't count towards the rate limit
+            await self.rate_limiter.acquire(root_url, api_key)
+
+            if cache_entry:
+                # Stale entries with a validator are revalidated with a conditional GET
+                kwargs["headers"] = {
+                    **cache_entry.revalidation_headers(),
+                    **(kwargs.get("headers") or {}),
+                }
+
+            client = self.http_pool.get_session(root_url)
+            method_fn = getattr(client, method)
+            async with method_fn(url, *args, **kwargs) as client_response:
+                response_object = await HTTPResponse.from_client_response(
+                    client_response
+                )
+            self.rate_limiter.update_from_headers(
+                root_url, api_key, response_object.status, response_object.headers
+            )
+
+            if cache_entry and response_object.status == 304:
+                self.http_cache.revalidated(cache_key, response_object.headers)
+                response_object = cache_entry.response
+                log_message = f"Revalidated cached HTTP GET response ({cache_key})"
+            else:
+                if use_cache:
+                    self.http_cache.store(cache_key, root_url, response_object)
+                log_message = (
+                    f"Making HTTP {method.upper()} request to URL: {cache_key}"
+                )
+
+        return response_object, log_message
+
+    @staticmethod
+    def get_inflight_key(cache_key, *args, **kwargs):
+        """Gets the key GETs are coalesced by.
+
+        The headers (including any API key) and other request arguments are
+        hashed in, so only calls that send the same request share a response.
+
+        parameters:
+            cache_key (str): the key of the request in the HTTP cache
+        """
+        request = json.dumps([args, kwargs], sort_keys=True, default=str)
+        return (cache_key, hashlib.sha256(request.encode()).hexdigest())
+
     async def http_call(self, method, url, *args, **kwargs):
         """Makes an HTTP request.
 
@@ -135,50 +227,15 @@ class DataBot(ExtensionsBot):
             method (str): the HTTP method to use
             url (str): the URL to call
             use_cache (bool): True if the GET result should be grabbed from cache
-            get_raw_response (bool): True if the actual response object should be returned
+            get_raw_response (bool): True if the response object should be returned
         """
         # Get the URL not the endpoint being called
-        ignore_rate_limit = False
         root_url = urlparse(url).netloc
 
-        # If the URL is not rate limited, we assume it can be executed an unlimited amount of times
-        if root_url in self.rate_limits:
-            executions_allowed, time_window = self.rate_limits[root_url]
-
-            now = time.time()
-
-            # If the URL being called is not in the history, add it
-            # A deque allows easy max limit length
-            if root_url not in self.url_rate_limit_history:
-                self.url_rate_limit_history[root_url] = deque(
-                    [], maxlen=executions_allowed
-                )
-
-            # Determine which calls, if any, have to be removed because they are out of the time
-            while (
-                self.url_rate_limit_history[root_url]
-                and now - self.url_rate_limit_history[root_url][0] >= time_window
-            ):
-                self.url_rate_limit_history[root_url].popleft()
-
-            # Determind if we hit or exceed the limit, and we should observe the limit
-            if (
-                not ignore_rate_limit
-                and len(self.url_rate_limit_history[root_url]) >= executions_allowed
-            ):
-                time_to_wait = time_window - (
-                    now - self.url_rate_limit_history[root_url][0]
-                )
-                time_to_wait = max(time_to_wait, 0)
-                raise HTTPRateLimit(time_to_wait)
-
-            # Add an entry for this call with the timestamp the call was placed
-            self.url_rate_limit_history[root_url].append(now)
-
         url = url.replace(" ", "%20").replace("+", "%2b")
 
         method = method.lower()
-        use_cache = kwargs.pop("use_cache", False)
+        use_cache = kwargs.pop("use_cache", False) and method == "get"
         get_raw_response = kwargs.pop("get_raw_response", False)
 
         cache_key = url.lower()
@@ -186,21 +243,27 @@ class DataBot(ExtensionsBot):
             params = urllib.parse.urlencode(kwargs.get("params"))
             cache_key = f"{cache_key}?{params}"
 
-        cached_response = (
-            self.http_cache.get(cache_key) if (use_cache and method == "get") else None
+        api_key = self.rate_limiter.get_api_key(
+            kwargs.get("params"), kwargs.get("headers")
         )
 
-        client = None
-        if cached_response:
-            response_object = cached_response
-            log_message = f"Retrieving cached HTTP GET response ({cache_key})"
+        if method == "get":
+            response_object, log_message = await self.http_inflight.run(
+                self.get_inflight_key(cache_key, *args, **kwargs),
+                self.fetch_http_response,
+                method,
+                url,
+                root_url,
+                cache_key,
+                use_cache,
+                api_key,
+                *args,
+                **kwargs,
+            )
         else:
-            client = aiohttp.ClientSession()
-            method_fn = getattr(client, method.lower())
-            response_object = await method_fn(url, *args, **kwargs)
-            if method == "get":
-                self.http_cache[cache_key] = response_object
-            log_message = f"Making HTTP {method.upper()} request to URL: {cache_key}"
+            response_object, log_message = await self.fetch_http_response(
+                method, url, root_url, cache_key, use_cache, api_key, *args, **kwargs
+            )
 
         await self.logger.info(log_message)
 
@@ -213,7 +276,4 @@ class DataBot(ExtensionsBot):
             )
             response["status_code"] = getattr(response_object, "status", None)
 
-        if client:
-            await client.close()
-
         return response
@@ -0,0 +1,169 @@
+"""Module for dispatching messages to their handlers."""
+
+import asyncio
+
+
+class MessageDispatch:
+    """The context and guild config of a message, resolved once.
+
+    Every handler of a message (commands and match cogs) gets the same
+    object, so the context is built and the config is looked up only once.
+
+    parameters:
+        message (discord.Message): the message being handled
+        ctx (discord.ext.Context): the context of the message
+        config (munch.Munch): the guild config of the context
+    """
+
+    def __init__(self, message, ctx, config):
+        self.message = message
+        self.ctx = ctx
+        self.config = config
+
+
+class MatchIndex:
+    """Index of the match cogs that could match a message for one guild config.
+
+    parameters:
+        config (munch.Munch): the guild config the index was built for
+        cogs (list): the registered match cogs
+        in_guild (bool): True if the config belongs to a guild and not DMs
+    """
+
+    def __init__(self, config, cogs, in_guild):
+        self.config = config
+        self.version = config.get("config_version")
+        self.unfiltered = []
+        self.by_channel = {}
+        self.by_prefix = []
+
+        for cog in cogs:
+            if cog.GUILD_ONLY and not in_guild:
+                continue
+            if not cog.extension_enabled(config):
+                continue
+
+            channels = cog.match_channels(config)
+            prefix = cog.match_prefix(config)
+            if channels is not None:
+                for channel_id in channels:
+                    self.by_channel.setdefault(str(channel_id), []).append(cog)
+            elif prefix is not None:
+                self.by_prefix.append((prefix, cog))
+            else:
+                self.unfiltered.append(cog)
+
+    def is_current(self, config):
+        """Checks if the index was built for this version of the config.
+
+        parameters:
+            config (munch.Munch): the current guild config
+        """
+        return config is self.config and config.get("config_version") == self.version
+
+    def candidates(self, message):
+        """Gets the match cogs that could match a message.
+
+        parameters:
+            message (discord.Message): the message to match
+        """
+        cogs = list(self.unfiltered)
+
+        channel_ids = [str(message.channel.id)]
+        # threads are matched by their parent channel too
+        parent_id = getattr(message.channel, "parent_id", None)
+        if parent_id:
+            channel_ids.append(str(parent_id))
+        for channel_id in channel_ids:
+            for cog in self.by_channel.get(channel_id, []):
+                if cog not in cogs:
+                    cogs.append(cog)
+
+        for prefix, cog in self.by_prefix:
+            if message.content.startswith(prefix):
+                cogs.append(cog)
+
+        return cogs
+
+
+class MatchDispatcher:
+    """Routes messages to the match cogs that could match them.
+
+    Match cogs declare cheap pre-filters (channels, prefix, guild only),
+    so only the cogs that pass them build a context and await match().
+
+    parameters:
+        bot (bot.TechSupportBot): the bot object
+    """
+
+    def __init__(self, bot):
+        self.bot = bot
+        self.cogs = []
+        self.indexes = {}
+
+    def register(self, cog):
+        """Adds a match cog to the dispatcher.
+
+        parameters:
+            cog (base.MatchCog): the cog to add
+        """
+        if cog not in self.cogs:
+            self.cogs.append(cog)
+        self.invalidate()
+
+    def unregister(self, cog):
+        """Removes a match cog from the dispatcher.
+
+        parameters:
+            cog (base.MatchCog): the cog to remove
+        """
+        if cog in self.cogs:
+            self.cogs.remove(cog)
+        self.invalidate()
+
+    def invalidate(self):
+        """Drops every index, this has to be called when a cog's filters change."""
+        self.indexes = {}
+
+    def get_index(self, message, config):
+        """Gets the index for the config of a message, building it if needed.
+
+        parameters:
+            message (discord.Message): the message being dispatched
+            config (munch.Munch): the guild config of the message
+        """
+        lookup = config.get("guild_id")
+        index = self.indexes.get(lookup)
+        if not index or not index.is_current(config):
+            index = MatchIndex(config, self.cogs, message.guild is not None)
+            self.indexes[lookup] = index
+        return index
+
+    async def on_message(self, message):
+        """Runs the match cogs that could match a message.
+
+        parameters:
+            message (discord.Message): the message object
+        """
+        if message.author == self.bot.user or not self.cogs:
+            return
+
+        config = await self.bot.get_message_config(message)
+        if not config:
+            return
+
+        cogs = self.get_index(message, config).candidates(message)
+        if not cogs:
+            return
+
+        dispatch = await self.bot.get_message_dispatch(message)
+        results = await asyncio.gather(
+            *(cog.handle_message(dispatch) for cog in cogs), return_exceptions=True
+        )
+        for cog, result in zip(cogs, results):
+            if isinstance(result, Exception):
+                await self.bot.logger.error(
+                    f"Match cog error: {cog.__class__.__name__} {result}!",
+                    exception=result,
+                    channel=config.get("logging_channel"),
+                )
@@ -63,6 +63,7 @@ class ExtensionsBot(commands.Bot):
                 bot=self,
                 name=self.__class__.__name__,
                 send=not self.file_config.logging.block_discord_send,
+                fire_and_forget=self.file_config.logging.get("fire_and_forget", True),
                 wait_time=self.file_config.logging.queue_wait_seconds,
             )
 
@@ -71,6 +72,7 @@ class ExtensionsBot(commands.Bot):
                 bot=self,
                 name=self.__class__.__name__,
                 send=not self.file_config.logging.block_discord_send,
+                fire_and_forget=self.file_config.logging.get("fire_and_forget", True),
             )
 
     def run(self, *args, **kwargs):
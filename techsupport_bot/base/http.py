@@ -0,0 +1,402 @@
+"""Module for the HTTP plumbing used by the data bot."""
+
+import json
+import re
+import time
+from collections import OrderedDict
+
+import aiohttp
+from multidict import CIMultiDict
+
+
+class HTTPSessionPool:
+    """Bot-lifetime pool of aiohttp sessions.
+
+    Every request shares a long-lived session (and its connection pool),
+    so repeated calls to the same API reuse keep-alive connections and cached DNS
+    lookups instead of doing a fresh TCP/TLS handshake each time.
+
+    parameters:
+        limit (int): the max number of open connections for a session
+        limit_per_host (int): the max number of open connections to a single host
+        keepalive_seconds (float): how long idle connections are kept open
+        dns_cache_seconds (int): how long resolved hostnames are cached
+        dedicated_hosts (dict): host to connection limit mapping for hosts that
+            should get their own session instead of the shared one
+    """
+
+    SHARED_SESSION_KEY = "shared"
+
+    def __init__(
+        self,
+        limit=100,
+        limit_per_host=10,
+        keepalive_seconds=30,
+        dns_cache_seconds=300,
+        dedicated_hosts=None,
+    ):
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.keepalive_seconds = keepalive_seconds
+        self.dns_cache_seconds = dns_cache_seconds
+        self.dedicated_hosts = dedicated_hosts or {}
+        self.sessions = {}
+
+    def make_session(self, limit_per_host):
+        """Creates a new session backed by a keep-alive connector.
+
+        parameters:
+            limit_per_host (int): the max number of open connections to a single host
+        """
+        connector = aiohttp.TCPConnector(
+            limit=self.limit,
+            limit_per_host=limit_per_host,
+            keepalive_timeout=self.keepalive_seconds,
+            use_dns_cache=True,
+            ttl_dns_cache=self.dns_cache_seconds,
+        )
+        return aiohttp.ClientSession(connector=connector)
+
+    def get_session(self, host=None):
+        """Gets the session to use for a host, creating it if needed.
+
+        This has to be called from within the running event loop.
+
+        parameters:
+            host (str): the host (netloc) the request is made to
+        """
+        if host in self.dedicated_hosts:
+            key = host
+            limit_per_host = self.dedicated_hosts[host]
+        else:
+            key = self.SHARED_SESSION_KEY
+            limit_per_host = self.limit_per_host
+
+        session = self.sessions.get(key)
+        if not session or session.closed:
+            session = self.make_session(limit_per_host)
+            self.sessions[key] = session
+
+        return session
+
+    async def close(self):
+        """Closes every open session in the pool."""
+        sessions = list(self.sessions.values())
+        self.sessions = {}
+        for session in sessions:
+            if not session.closed:
+                await session.close()
+
+
+class HTTPResponse:
+    """A fully read HTTP response.
+
+    This mirrors the parts of aiohttp.ClientResponse that the bot uses,
+    but holds the body in memory so it can be cached and read again after
+    the underlying connection has been released.
+
+    parameters:
+        status (int): the HTTP status code
+        headers (multidict.CIMultiDict): the response headers
+        body (bytes): the raw response body
+        url (str): the URL that was called
+        encoding (str): the encoding used to decode the body as text
+        request_info (aiohttp.RequestInfo): the request info of the original response
+    """
+
+    # The same check aiohttp does, which also accepts types like application/vnd.api+json
+    JSON_CONTENT_TYPE_REGEX = re.compile(r"^application/(?:[\w.+-]+?\+)?json")
+
+    def __init__(
+        self, status, headers, body, url=None, encoding="utf-8", request_info=None
+    ):
+        self.status = status
+        self.headers = headers
+        self.body = body
+        self.url = url
+        self.encoding = encoding
+        self.request_info = request_info
+        self._json = None
+
+    @classmethod
+    async def from_client_response(cls, response):
+        """Reads an aiohttp response into memory, releasing its connection.
+
+        parameters:
+            response (aiohttp.ClientResponse): the response to read
+        """
+        body = await response.read()
+        try:
+            encoding = response.get_encoding()
+        except RuntimeError:
+            encoding = "utf-8"
+        return cls(
+            status=response.status,
+            headers=CIMultiDict(response.headers),
+            body=body,
+            url=str(response.url),
+            encoding=encoding,
+            request_info=response.request_info,
+        )
+
+    @property
+    def content_type(self):
+        """Gets the mimetype of the response body."""
+        header = self.headers.get("Content-Type", "application/octet-stream")
+        return header.split(";")[0].strip().lower()
+
+    @property
+    def size(self):
+        """Gets the approximate memory footprint of the response in bytes."""
+        header_size = sum(len(k) + len(str(v)) for k, v in self.headers.items())
+        return len(self.body) + header_size
+
+    async def read(self):
+        """Gets the raw response body."""
+        return self.body
+
+    async def text(self):
+        """Gets the response body decoded as text."""
+        return self.body.decode(self.encoding, errors="replace")
+
+    def is_content_type(self, content_type):
+        """Checks if the response has the expected mimetype.
+
+        parameters:
+            content_type (str): the expected mimetype
+        """
+        if content_type == "application/json":
+            return bool(self.JSON_CONTENT_TYPE_REGEX.match(self.content_type))
+        return content_type in self.content_type
+
+    async def json(self, content_type="application/json"):
+        """Gets the response body decoded as JSON.
+
+        parameters:
+            content_type (str): the expected mimetype, or None to skip the check
+        """
+        if content_type and not self.is_content_type(content_type):
+            raise aiohttp.ContentTypeError(
+                self.request_info,
+                (),
+                status=self.status,
+                message=(
+                    "Attempt to decode JSON with unexpected mimetype:"
+                    f" {self.content_type}"
+                ),
+                headers=self.headers,
+            )
+        if not self.body.strip():
+            return None
+        if self._json is None:
+            self._json = json.loads(self.body.decode(self.encoding))
+        return self._json
+
+
+class HTTPCacheEntry:
+    """An entry in the HTTP response cache.
+
+    parameters:
+        response (HTTPResponse): the cached response
+        host (str): the host the response came from
+        ttl (float): the number of seconds the entry is fresh for
+    """
+
+    def __init__(self, response, host, ttl):
+        self.response = response
+        self.host = host
+        self.ttl = ttl
+        self.stored_at = time.monotonic()
+
+    @property
+    def etag(self):
+        """Gets the ETag validator of the cached response."""
+        return self.response.headers.get("ETag")
+
+    @property
+    def last_modified(self):
+        """Gets the Last-Modified validator of the cached response."""
+        return self.response.headers.get("Last-Modified")
+
+    def is_fresh(self):
+        """Checks if the entry can be served without revalidation."""
+        return time.monotonic() - self.stored_at < self.ttl
+
+    def can_revalidate(self):
+        """Checks if the entry has a validator for a conditional request."""
+        return bool(self.etag or self.last_modified)
+
+    def revalidation_headers(self):
+        """Gets the conditional request headers for this entry."""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class HTTPResponseCache:
+    """Byte-size bounded LRU cache of decoded HTTP responses.
+
+    parameters:
+        max_bytes (int): the max total size of the cached responses
+        max_entries (int): the max number of cached responses
+        default_ttl (float): the number of seconds a response is fresh for
+        host_ttls (dict): host to TTL overrides, these take precedence over
+            the max-age of the response
+    """
+
+    MAX_AGE_REGEX = re.compile(r"max-age=(\d+)")
+
+    def __init__(self, max_bytes, max_entries, default_ttl, host_ttls=None):
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self.host_ttls = host_ttls or {}
+        self.entries = OrderedDict()
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+
+    def __contains__(self, key):
+        return key in self.entries
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get(self, key):
+        """Gets a cache entry, which may be stale but revalidatable.
+
+        parameters:
+            key (str): the cache key
+        """
+        entry = self.entries.get(key)
+        if not entry:
+            self.misses += 1
+            return None
+
+        if not entry.is_fresh() and not entry.can_revalidate():
+            self.pop(key)
+            self.misses += 1
+            return None
+
+        self.entries.move_to_end(key)
+        if entry.is_fresh():
+            self.hits += 1
+        return entry
+
+    def get_ttl(self, host, headers):
+        """Gets the TTL to store a response with, or None if it can't be stored.
+
+        parameters:
+            host (str): the host the response came from
+            headers (dict): the response headers
+        """
+        cache_control = headers.get("Cache-Control", "").lower()
+        if "no-store" in cache_control:
+            return None
+
+        if host in self.host_ttls:
+            return self.host_ttls[host]
+
+        if "no-cache" in cache_control:
+            return 0
+
+        ttl = self.default_ttl
+        max_age = self.MAX_AGE_REGEX.search(cache_control)
+        if max_age:
+            ttl = min(ttl, int(max_age.group(1)))
+        return ttl
+
+    def store(self, key, host, response):
+        """Stores a response if its headers allow it.
+
+        parameters:
+            key (str): the cache key
+            host (str): the host the response came from
+            response (HTTPResponse): the response to store
+        """
+        if response.status != 200:
+            return
+
+        ttl = self.get_ttl(host, response.headers)
+        if ttl is None:
+            return
+
+        entry = HTTPCacheEntry(response, host, ttl)
+        if not entry.is_fresh() and not entry.can_revalidate():
+            return
+        if response.size > self.max_bytes:
+            return
+
+        self.pop(key)
+        self.entries[key] = entry
+        self.current_bytes += response.size
+        self.evict()
+
+    def revalidated(self, key, headers):
+        """Marks a stale entry as fresh again after a 304 response.
+
+        parameters:
+            key (str): the cache key
+            headers (dict): the headers of the 304 response
+        """
+        entry = self.pop(key)
+        if not entry:
+            return None
+
+        for header in ("ETag", "Last-Modified", "Cache-Control", "Expires"):
+            if header in headers:
+                entry.response.headers[header] = headers[header]
+
+        self.revalidations += 1
+        self.hits += 1
+
+        ttl = self.get_ttl(entry.host, entry.response.headers)
+        if ttl is None:
+            return entry
+
+        entry.ttl = ttl
+        entry.stored_at = time.monotonic()
+        self.entries[key] = entry
+        self.current_bytes += entry.response.size
+        self.evict()
+        return entry
+
+    def pop(self, key):
+        """Removes an entry from the cache.
+
+        parameters:
+            key (str): the cache key
+        """
+        entry = self.entries.pop(key, None)
+        if entry:
+            self.current_bytes -= entry.response.size
+        return entry
+
+    def evict(self):
+        """Evicts the least recently used entries until the cache is within bounds."""
+        while self.entries and (
+            self.current_bytes > self.max_bytes or len(self.entries) > self.max_entries
+        ):
+            _, entry = self.entries.popitem(last=False)
+            self.current_bytes -= entry.response.size
+
+    def clear(self):
+        """Removes every entry from the cache."""
+        self.entries.clear()
+        self.current_bytes = 0
+
+    def stats(self):
+        """Gets the hit/miss counters and size of the cache."""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "revalidations": self.revalidations,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+            "entries": len(self.entries),
+            "bytes": self.current_bytes,
+        }
@@ -0,0 +1,291 @@
+"""Module for rate limiting outgoing API calls."""
+
+import asyncio
+import bisect
+import hashlib
+import time
+from collections import deque
+from email.utils import parsedate_to_datetime
+
+from error import HTTPRateLimit
+
+
+class TokenBucket:
+    """A bucket of call tokens for a rate limit of `capacity` calls per `period`.
+
+    A spent token comes back `period` seconds after it was taken, instead of
+    trickling back at a constant rate, so no window of `period` seconds
+    ever has more than `capacity` calls in it.
+
+    parameters:
+        capacity (int): the number of calls allowed per period, None for unlimited
+        period (float): the length of the rate limit window in seconds
+    """
+
+    def __init__(self, capacity=None, period=0):
+        self.capacity = capacity
+        self.period = period
+        self.spent = deque()
+        self.blocked_until = 0.0
+
+    def refill(self, now):
+        """Returns every token that was spent longer than a period ago.
+
+        parameters:
+            now (float): the current monotonic time
+        """
+        while self.spent and now - self.spent[0] >= self.period:
+            self.spent.popleft()
+
+    def tokens(self, now=None):
+        """Gets the number of tokens that can be taken right now.
+
+        parameters:
+            now (float): the current monotonic time
+        """
+        now = time.monotonic() if now is None else now
+        if now < self.blocked_until:
+            return 0
+        if self.capacity is None:
+            return float("inf")
+        self.refill(now)
+        return max(self.capacity - len(self.spent), 0)
+
+    def wait_time(self, now=None):
+        """Gets the number of seconds until a token can be taken.
+
+        parameters:
+            now (float): the current monotonic time
+        """
+        now = time.monotonic() if now is None else now
+        wait = self.blocked_until - now
+        if self.capacity is not None:
+            self.refill(now)
+            if len(self.spent) >= self.capacity:
+                wait = max(wait, self.spent[0] + self.period - now)
+        return max(wait, 0)
+
+    def take(self, now=None):
+        """Spends a token, this doesn't check if one is available.
+
+        parameters:
+            now (float): the current monotonic time
+        """
+        if self.capacity is None:
+            return
+        now = time.monotonic() if now is None else now
+        self.spent.append(now)
+
+    def block(self, seconds, now=None):
+        """Stops handing out tokens for a number of seconds.
+
+        parameters:
+            seconds (float): the number of seconds to block for
+            now (float): the current monotonic time
+        """
+        now = time.monotonic() if now is None else now
+        self.blocked_until = max(self.blocked_until, now + seconds)
+
+    def drain_to(self, remaining, reset_after, now=None):
+        """Lowers the available tokens to what the API reports is remaining.
+
+        The drained tokens come back once the API window resets.
+        This never adds tokens, so it can't exceed the configured limit.
+
+        parameters:
+            remaining (int): the number of calls the API says are left
+            reset_after (float): the number of seconds until the API window resets
+            now (float): the current monotonic time
+        """
+        now = time.monotonic() if now is None else now
+        if remaining <= 0:
+            self.block(reset_after, now)
+            return
+        if self.capacity is None:
+            return
+
+        # Backdate the drained tokens so they come back when the API resets
+        spent_at = now + reset_after - self.period
+        for _ in range(int(self.tokens(now) - remaining)):
+            bisect.insort(self.spent, spent_at)
+
+
+class RateLimiter:
+    """Per-host and per-API-key rate limiter with an optional wait queue.
+
+    Calls that would go over the limit wait for a token instead of failing
+    right away, as long as the token is available before the deadline
+    and the wait queue for the host isn't full.
+
+    parameters:
+        limits (dict): root URL to (calls, seconds) mapping
+        max_wait (float): the max number of seconds a call can wait for a token
+        queue_size (int): the max number of calls that can wait on a single host
+    """
+
+    API_KEY_PARAMS = ("key", "api_key", "apikey", "appid", "app_id", "token")
+
+    def __init__(self, limits, max_wait=0, queue_size=0):
+        self.limits = limits
+        self.max_wait = max_wait
+        self.queue_size = queue_size
+        self.buckets = {}
+        self.waiters = {}
+        self.waited = 0
+        self.rejected = 0
+
+    @classmethod
+    def get_api_key(cls, params=None, headers=None):
+        """Gets an identifier for the API key used by a call, if there is one.
+
+        The key is hashed so it can be logged and kept around safely.
+
+        parameters:
+            params (dict): the query parameters of the call
+            headers (dict): the headers of the call
+        """
+        secret = (headers or {}).get("Authorization")
+        if not secret and isinstance(params, dict):
+            for name in cls.API_KEY_PARAMS:
+                if params.get(name):
+                    secret = params[name]
+                    break
+        if not secret:
+            return None
+        return hashlib.sha256(str(secret).encode()).hexdigest()[:12]
+
+    def get_buckets(self, host, api_key=None):
+        """Gets the buckets that a call has to take a token from.
+
+        parameters:
+            host (str): the root URL (netloc) being called
+            api_key (str): the API key identifier of the call
+        """
+        if (host, None) not in self.buckets:
+            calls, seconds = self.limits.get(host, (None, 0))
+            self.buckets[(host, None)] = TokenBucket(calls, seconds)
+        buckets = [self.buckets[(host, None)]]
+
+        # API key buckets only hold what the API itself tells us about the key
+        if api_key:
+            if (host, api_key) not in self.buckets:
+                self.buckets[(host, api_key)] = TokenBucket()
+            buckets.append(self.buckets[(host, api_key)])
+
+        return buckets
+
+    async def acquire(self, host, api_key=None):
+        """Takes a token for a call, waiting for one if allowed.
+
+        parameters:
+            host (str): the root URL (netloc) being called
+            api_key (str): the API key identifier of the call
+
+        raises:
+            HTTPRateLimit: if a token can't be taken before the deadline
+        """
+        buckets = self.get_buckets(host, api_key)
+        deadline = time.monotonic() + self.max_wait
+        waiting = False
+
+        try:
+            while True:
+                now = time.monotonic()
+                wait = max(bucket.wait_time(now) for bucket in buckets)
+                if not wait:
+                    for bucket in buckets:
+                        bucket.take(now)
+                    return
+
+                if not waiting:
+                    if self.waiters.get(host, 0) >= self.queue_size:
+                        self.rejected += 1
+                        raise HTTPRateLimit(wait)
+                    self.waiters[host] = self.waiters.get(host, 0) + 1
+                    self.waited += 1
+                    waiting = True
+
+                if now + wait > deadline:
+                    self.rejected += 1
+                    raise HTTPRateLimit(wait)
+
+                await asyncio.sleep(wait)
+        finally:
+            if waiting:
+                self.waiters[host] -= 1
+
+    def update_from_headers(self, host, api_key, status, headers):
+        """Adapts the buckets of a call to the rate limit headers of its response.
+
+        parameters:
+            host (str): the root URL (netloc) that was called
+            api_key (str): the API key identifier of the call
+            status (int): the status code of the response
+            headers (dict): the headers of the response
+        """
+        bucket = self.get_buckets(host, api_key)[-1]
+
+        retry_after = self.parse_retry_after(headers.get("Retry-After"))
+        if retry_after is not None and (status == 429 or status >= 500):
+            bucket.block(retry_after)
+            return
+        if status == 429:
+            # No Retry-After, so the best we can do is sit out a window
+            bucket.block(bucket.period or 1)
+            return
+
+        remaining = self.parse_number(headers.get("X-RateLimit-Remaining"))
+        reset_after = self.parse_reset(headers.get("X-RateLimit-Reset"))
+        if remaining is not None and reset_after is not None:
+            bucket.drain_to(int(remaining), reset_after)
+
+    @staticmethod
+    def parse_number(value):
+        """Parses a numeric header value.
+
+        parameters:
+            value (str): the header value
+        """
+        try:
+            return float(value)
+        except (TypeError, ValueError):
+            return None
+
+    @classmethod
+    def parse_retry_after(cls, value):
+        """Parses a Retry-After header into seconds.
+
+        parameters:
+            value (str): the header value, either seconds or an HTTP date
+        """
+        seconds = cls.parse_number(value)
+        if seconds is not None:
+            return max(seconds, 0)
+        try:
+            retry_at = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        return max(retry_at.timestamp() - time.time(), 0)
+
+    @classmethod
+    def parse_reset(cls, value):
+        """Parses an X-RateLimit-Reset header into seconds from now.
+
+        parameters:
+            value (str): the header value, either seconds or a UNIX timestamp
+        """
+        reset = cls.parse_number(value)
+        if reset is None:
+            return None
+        # Some APIs send the number of seconds left, some the epoch time of the reset
+        if reset > 1_000_000_000:
+            reset -= time.time()
+        return max(reset, 0)
+
+    def stats(self):
+        """Gets the waiting/rejected counters."""
+        return {
+            "waited": self.waited,
+            "rejected": self.rejected,
+            "waiting": sum(self.waiters.values()),
+        }
@@ -0,0 +1,234 @@
+"""Module for running cron jobs from a single task."""
+
+import asyncio
+import heapq
+import itertools
+import time
+
+from croniter import croniter
+
+
+class ScheduledJob:
+    """A cron job registered with the scheduler.
+
+    The cron expression is compiled once, when the job is added.
+
+    parameters:
+        key (Hashable): the key identifying the job
+        cron (str): the cron expression of the job
+        callback (Callable): the coroutine function to call with due payloads
+        payload (object): the value passed to the callback when the job fires
+    """
+
+    def __init__(self, key, cron, callback, payload):
+        self.key = key
+        self.cron = cron
+        self.callback = callback
+        self.payload = payload
+        self.schedule = croniter(cron, time.time())
+        self.next_time = self.schedule.get_next(float)
+        self.paused = False
+        self.generation = 0
+
+    def advance(self, now):
+        """Moves the job to its first fire time after now, skipping missed ones.
+
+        parameters:
+            now (float): the current timestamp
+        """
+        while self.next_time <= now:
+            self.next_time = self.schedule.get_next(float)
+
+
+class CronScheduler:
+    """Fires every registered cron job from one task.
+
+    Jobs are kept in a heap ordered by their next fire time. Jobs due at the
+    same time that share a callback are batched into a single call, which gets
+    the list of their payloads. Removing or pausing a job only invalidates
+    its heap entry, so nothing has to be cancelled.
+
+    parameters:
+        bot (bot.TechSupportBot): the bot object
+    """
+
+    def __init__(self, bot):
+        self.bot = bot
+        self.jobs = {}
+        self.heap = []
+        self.counter = itertools.count()
+        self.wakeup = asyncio.Event()
+        self.running = set()
+        self.fired = 0
+        self.task = None
+
+    def __contains__(self, key):
+        return key in self.jobs
+
+    def __len__(self):
+        return len(self.jobs)
+
+    def add(self, key, cron, callback, payload=None):
+        """Adds a job, replacing any job with the same key.
+
+        This raises the croniter errors if the cron expression is invalid.
+
+        parameters:
+            key (Hashable): the key identifying the job
+            cron (str): the cron expression of the job
+            callback (Callable): the coroutine function to call with due payloads
+            payload (object): the value passed to the callback when the job fires
+        """
+        job = ScheduledJob(key, cron, callback, payload)
+        self.remove(key)
+        self.jobs[key] = job
+        self.push(job)
+        self.start()
+        return job
+
+    def remove(self, key):
+        """Removes a job if it exists.
+
+        parameters:
+            key (Hashable): the key identifying the job
+        """
+        job = self.jobs.pop(key, None)
+        if job:
+            job.generation += 1
+        return job
+
+    def pause(self, key):
+        """Stops a job from firing until it is resumed.
+
+        parameters:
+            key (Hashable): the key identifying the job
+        """
+        job = self.jobs.get(key)
+        if job and not job.paused:
+            job.paused = True
+            job.generation += 1
+
+    def resume(self, key):
+        """Lets a paused job fire again, from its next fire time after now.
+
+        parameters:
+            key (Hashable): the key identifying the job
+        """
+        job = self.jobs.get(key)
+        if job and job.paused:
+            job.paused = False
+            job.advance(time.time())
+            self.push(job)
+
+    def push(self, job):
+        """Adds the next fire time of a job to the heap.
+
+        parameters:
+            job (ScheduledJob): the job to schedule
+        """
+        heapq.heappush(
+            self.heap, (job.next_time, next(self.counter), job.generation, job)
+        )
+        # the sleeping task might have to wake up earlier now
+        self.wakeup.set()
+
+    def is_current(self, entry):
+        """Checks if a heap entry still belongs to a scheduled job.
+
+        parameters:
+            entry (tuple): the heap entry
+        """
+        _, _, generation, job = entry
+        return (
+            self.jobs.get(job.key) is job
+            and not job.paused
+            and generation == job.generation
+        )
+
+    def get_timeout(self):
+        """Gets the number of seconds until the next job is due."""
+        while self.heap and not self.is_current(self.heap[0]):
+            heapq.heappop(self.heap)
+        if not self.heap:
+            return None
+        return max(self.heap[0][0] - time.time(), 0)
+
+    def pop_due(self, now):
+        """Takes the jobs that are due and schedules their next run.
+
+        parameters:
+            now (float): the current timestamp
+        """
+        due = []
+        while self.heap and self.heap[0][0] <= now:
+            entry = heapq.heappop(self.heap)
+            if not self.is_current(entry):
+                continue
+            job = entry[3]
+            due.append(job)
+            job.advance(now)
+            heapq.heappush(
+                self.heap, (job.next_time, next(self.counter), job.generation, job)
+            )
+        return due
+
+    def start(self):
+        """Starts the scheduler in the background."""
+        if not self.task or self.task.done():
+            self.task = asyncio.create_task(self.run())
+
+    async def stop(self):
+        """Stops the scheduler, the jobs are kept."""
+        if self.task:
+            self.task.cancel()
+            try:
+                await self.task
+            except asyncio.CancelledError:
+                pass
+            self.task = None
+
+    async def run(self):
+        """A forever loop that sleeps until the next job is due and fires it."""
+        while True:
+            self.wakeup.clear()
+            timeout = self.get_timeout()
+            if timeout != 0:
+                try:
+                    await asyncio.wait_for(self.wakeup.wait(), timeout)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            batches = {}
+            for job in self.pop_due(time.time()):
+                batches.setdefault(job.callback, []).append(job.payload)
+
+            for callback, payloads in batches.items():
+                # a slow callback shouldn't hold back the jobs due after it
+                task = asyncio.create_task(self.fire(callback, payloads))
+                self.running.add(task)
+                task.add_done_callback(self.running.discard)
+
+    async def fire(self, callback, payloads):
+        """Calls a job callback with the payloads of its due jobs.
+
+        parameters:
+            callback (Callable): the coroutine function to call
+            payloads (list): the payloads of the due jobs
+        """
+        self.fired += len(payloads)
+        try:
+            await callback(payloads)
+        except Exception as exception:
+            await self.bot.logger.error(
+                f"Scheduled job callback error: {getattr(callback, '__name__', '')}",
+                exception=exception,
+            )
+
+    def stats(self):
+        """Gets the scheduler counters."""
+        return {
+            "jobs": len(self.jobs),
+            "paused": sum(1 for job in self.jobs.values() if job.paused),
+            "fired": self.fired,
+        }
@@ -0,0 +1,65 @@
+"""Module for coalescing concurrent identical calls."""
+
+import asyncio
+
+
+class SingleFlight:
+    """Coalesces concurrent calls that share a key into one execution.
+
+    The first caller for a key starts the work, every caller that arrives while
+    it is still running awaits the same future and gets the same result
+    (or exception). The key is forgotten as soon as the work finishes,
+    so this never serves stale results, that is left to the caches.
+    """
+
+    def __init__(self):
+        self.inflight = {}
+        self.calls = 0
+        self.coalesced = 0
+
+    def __contains__(self, key):
+        return key in self.inflight
+
+    def __len__(self):
+        return len(self.inflight)
+
+    async def run(self, key, coro_fn, *args, **kwargs):
+        """Runs a coroutine function, or joins the in-flight run for the key.
+
+        parameters:
+            key (Hashable): the key identifying identical calls
+            coro_fn (Callable): the coroutine function to run
+        """
+        self.calls += 1
+
+        task = self.inflight.get(key)
+        if task:
+            self.coalesced += 1
+        else:
+            task = asyncio.ensure_future(coro_fn(*args, **kwargs))
+            self.inflight[key] = task
+            task.add_done_callback(lambda done: self._forget(key, done))
+
+        # Shielded so one caller being cancelled doesn't cancel it for the rest
+        return await asyncio.shield(task)
+
+    def _forget(self, key, task):
+        """Removes a finished task from the in-flight map.
+
+        parameters:
+            key (Hashable): the key the task was registered under
+            task (asyncio.Task): the finished task
+        """
+        if self.inflight.get(key) is task:
+            del self.inflight[key]
+        # Mark the exception as retrieved in case every caller was cancelled
+        if not task.cancelled():
+            task.exception()
+
+    def stats(self):
+        """Gets the call counters."""
+        return {
+            "calls": self.calls,
+            "coalesced": self.coalesced,
+            "inflight": len(self.inflight),
+        }
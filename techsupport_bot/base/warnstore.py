@@ -0,0 +1,159 @@
+"""Module for the shared store of user warnings."""
+
+import datetime
+from collections import OrderedDict
+
+
+class WarningStore:
+    """Store of the warnings given to users, shared by every extension using them.
+
+    The Warning model is defined once here, instead of in each extension.
+    Warning counts are cached per user and recounted after every write, so
+    checking a user against the max warnings doesn't read their warnings.
+
+    parameters:
+        bot (bot.TechSupportBot): the bot object
+        max_counts (int): the max number of user warning counts to cache
+    """
+
+    INDEX_NAME = "ix_warnings_guild_id_user_id"
+
+    def __init__(self, bot, max_counts=10000):
+        self.bot = bot
+        self.max_counts = max_counts
+        self.model = None
+        self.counts = OrderedDict()
+        # bumped on every write, so a count read during a write isn't cached
+        self.writes = 0
+
+    def get_model(self):
+        """Gets the Warning model, defining it the first time.
+
+        This has to be called after the database is set up.
+        """
+        if self.model:
+            return self.model
+
+        db = self.bot.db
+
+        class Warning(db.Model):
+            """Class to set up warnings for the config file."""
+
+            __tablename__ = "warnings"
+            pk = db.Column(db.Integer, primary_key=True)
+            user_id = db.Column(db.String)
+            guild_id = db.Column(db.String)
+            reason = db.Column(db.String)
+            time = db.Column(db.DateTime, default=datetime.datetime.utcnow)
+
+        # every lookup is by guild and user
+        db.Index(self.INDEX_NAME, Warning.guild_id, Warning.user_id)
+
+        self.model = Warning
+        return self.model
+
+    async def ensure_index(self):
+        """Creates the guild and user index on tables made before it existed."""
+        await self.bot.db.status(
+            f"CREATE INDEX IF NOT EXISTS {self.INDEX_NAME}"
+            " ON warnings (guild_id, user_id)"
+        )
+
+    def get_query(self, guild_id, user_id):
+        """Gets the query for the warnings of a user.
+
+        parameters:
+            guild_id (str): the ID of the guild
+            user_id (str): the ID of the user
+        """
+        return self.model.query.where(self.model.guild_id == guild_id).where(
+            self.model.user_id == user_id
+        )
+
+    def set_count(self, guild_id, user_id, count):
+        """Caches the warning count of a user.
+
+        parameters:
+            guild_id (str): the ID of the guild
+            user_id (str): the ID of the user
+            count (int): the number of warnings the user has
+        """
+        lookup = (guild_id, user_id)
+        self.counts[lookup] = count
+        self.counts.move_to_end(lookup)
+        while len(self.counts) > self.max_counts:
+            self.counts.popitem(last=False)
+
+    async def count_warnings(self, guild_id, user_id):
+        """Counts the warnings of a user in the database.
+
+        parameters:
+            guild_id (str): the ID of the guild
+            user_id (str): the ID of the user
+        """
+        db = self.bot.db
+        return await (
+            db.select([db.func.count(self.model.pk)])
+            .where(self.model.guild_id == guild_id)
+            .where(self.model.user_id == user_id)
+            .gino.scalar()
+        )
+
+    async def get_count(self, guild_id, user_id):
+        """Gets the number of warnings a user has.
+
+        parameters:
+            guild_id (str): the ID of the guild
+            user_id (str): the ID of the user
+        """
+        lookup = (guild_id, user_id)
+        count = self.counts.get(lookup)
+        if count is None:
+            writes = self.writes
+            count = await self.count_warnings(guild_id, user_id)
+            if writes == self.writes:
+                self.set_count(guild_id, user_id, count)
+        else:
+            self.counts.move_to_end(lookup)
+        return count
+
+    async def get_warnings(self, guild_id, user_id):
+        """Gets the warnings of a user, and refreshes their cached count.
+
+        parameters:
+            guild_id (str): the ID of the guild
+            user_id (str): the ID of the user
+        """
+        writes = self.writes
+        warnings = await self.get_query(guild_id, user_id).gino.all()
+        if writes == self.writes:
+            self.set_count(guild_id, user_id, len(warnings))
+        return warnings
+
+    async def add_warning(self, guild_id, user_id, reason):
+        """Adds a warning to a user and returns their new warning count.
+
+        parameters:
+            guild_id (str): the ID of the guild
+            user_id (str): the ID of the user
+            reason (str): the reason for the warning
+        """
+        await self.model(user_id=user_id, guild_id=guild_id, reason=reason).create()
+        # recounted instead of adding to the cached count, since another warn
+        # for the same user could have been written at the same time
+        self.writes += 1
+        self.counts.pop((guild_id, user_id), None)
+        return await self.get_count(guild_id, user_id)
+
+    async def clear_warnings(self, guild_id, user_id):
+        """Deletes every warning of a user in one statement.
+
+        parameters:
+            guild_id (str): the ID of the guild
+            user_id (str): the ID of the user
+        """
+        await self.model.delete.where(self.model.guild_id == guild_id).where(
+            self.model.user_id == user_id
+        ).gino.status()
+        self.writes += 1
+        self.set_count(guild_id, user_id, 0)
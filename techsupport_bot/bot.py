@@ -25,6 +25,10 @@ class TechSupportBot(base.AdvancedBot):
             self.logger.register_queue()
             asyncio.create_task(self.logger.run())
 
+        if self.logger.fire_and_forget:
+            self.logger.register_record_queue()
+            asyncio.create_task(self.logger.run_records())
+
         # Start the IRC bot in an asynchronous task
         irc_config = getattr(self.file_config.api, "irc")
         if irc_config.enable_irc:
@@ -43,6 +47,21 @@ class TechSupportBot(base.AdvancedBot):
 
         self.guild_config_collection = self.mongo[self.GUILD_CONFIG_COLLECTION]
 
+        if self.file_config.cache.get("guild_config_watch"):
+            await self.logger.debug("Starting guild config watcher...")
+            self.guild_config_watcher = base.GuildConfigWatcher(
+                bot=self,
+                collection=self.guild_config_collection,
+                cache=self.guild_config_cache,
+                watched_ttl=self.file_config.cache.get(
+                    "guild_config_watched_seconds", 3600
+                ),
+                poll_seconds=self.file_config.cache.get(
+                    "guild_config_poll_seconds", 30
+                ),
+            )
+            self.guild_config_watcher.start()
+
         await self.logger.debug("Connecting to Postgres...")
         try:
             self.db = await self.get_postgres_ref()
@@ -116,6 +135,10 @@ class TechSupportBot(base.AdvancedBot):
     async def cleanup(self):
         """Cleans up after the event loop is interupted."""
         await self.logger.debug("Cleaning up...", send=True)
+        await self.http_pool.close()
+        if self.guild_config_watcher:
+            await self.guild_config_watcher.stop()
+        await self.scheduler.stop()
         await super().close()
 
     async def on_guild_join(self, guild):
@@ -2,69 +2,267 @@
 """
 
 import asyncio
+import collections
+import json
+import time
 
+import botlogging.embed as embed_lib
+import discord
 from botlogging import logger
 
 
+class QueuedLog:
+    """A log waiting to be sent to Discord.
+
+    parameters:
+        target (discord.abc.Messageable): the channel or user to send to
+        embed (discord.Embed): the log embed
+        content (str): the message content to send with the embed
+        followups (list): messages to send right after the embed
+    """
+
+    def __init__(self, target, embed=None, content=None, followups=None):
+        self.target = target
+        self.embed = embed
+        self.content = content
+        self.followups = followups or []
+        self.count = 1
+        # worked out once, since every queued log is compared by it
+        self.key = self.get_key()
+
+    def get_key(self):
+        """Gets the key identical logs share, so they can be merged."""
+        embed_data = None
+        if self.embed is not None:
+            embed_data = self.embed.to_dict()
+            # repeats of a log only differ by when they happened
+            embed_data.pop("timestamp", None)
+            embed_data = json.dumps(embed_data, sort_keys=True, default=str)
+        return (self.content, embed_data, tuple(self.followups))
+
+    @property
+    def packable(self):
+        """Checks if the log is a lone embed that can share a message."""
+        return self.embed is not None and not self.content and not self.followups
+
+    def get_embed(self):
+        """Gets the embed to send, with a counter if the log was repeated."""
+        if self.count == 1 or self.embed is None:
+            return self.embed
+        embed = self.embed.copy()
+        embed.title = f"{embed.title} (x{self.count})"
+        return embed
+
+
 class DelayedLogger(logger.BotLogger):
     """Logging interface that queues log events to be sent over time.
 
+    Queued logs are grouped by target, repeated logs are merged into a counter
+    and up to 10 embeds are sent in a single message.
+
     parameters:
         bot (bot.TechSupportBot): the bot object
         name (str): the name of the logging channel
-        wait_time (float): the time to wait between log sends
+        wait_time (float): the min time to wait between sends to the same target
         queue_size (int): the max number of queue events
     """
 
+    MAX_EMBEDS_PER_SEND = 10
+    MAX_EMBED_CHARS_PER_SEND = 6000
+    MAX_WAIT_TIME = 60
+    SLOW_SEND_SECONDS = 1
+
     def __init__(self, *args, **kwargs):
         self.wait_time = kwargs.pop("wait_time", 1)
         self.queue_size = kwargs.pop("queue_size", 1000)
         self.__send_queue = None
+        # Target ID to the logs waiting to be sent to it, in order
+        self.pending = {}
+        # Target ID to the same logs by their key, to find repeats
+        self.pending_keys = {}
+        self.wait_times = {}
+        self.next_send_times = {}
+        self.dropped = 0
         super().__init__(*args, **kwargs)
 
-    async def info(self, message, *args, **kwargs):
-        """Adds an info log level to the DelayedLogger queue
+    async def deliver(self, target, embed=None, content=None, followups=None):
+        """Adds a log to the queue instead of sending it right away.
 
-        Args:
-            message (str): The message to log
+        parameters:
+            target (discord.abc.Messageable): the channel or user to send to
+            embed (discord.Embed): the log embed
+            content (str): the message content to send with the embed
+            followups (list): messages to send right after the embed
         """
-        await self.__send_queue.put(super().info(message, *args, **kwargs))
+        if not self.__send_queue:
+            await super().deliver(
+                target, embed=embed, content=content, followups=followups
+            )
+            return
+
+        try:
+            self.__send_queue.put_nowait(QueuedLog(target, embed, content, followups))
+        except asyncio.QueueFull:
+            # never block the caller, the drop is reported by the sender
+            self.dropped += 1
+
+    def register_queue(self):
+        """Registers the asyncio.Queue object to make delayed logging possible"""
+        self.__send_queue = asyncio.Queue(maxsize=self.queue_size)
 
-    async def debug(self, message, *args, **kwargs):
-        """Adds an debug log level to the DelayedLogger queue
+    def add_pending(self, log):
+        """Adds a log to the pending logs of its target, merging repeats.
 
-        Args:
-            message (str): The message to log
+        parameters:
+            log (QueuedLog): the log to add
         """
-        await self.__send_queue.put(super().debug(message, *args, **kwargs))
+        pending_keys = self.pending_keys.setdefault(log.target.id, {})
+        pending_log = pending_keys.get(log.key)
+        if pending_log:
+            pending_log.count += 1
+            return
+        pending_keys[log.key] = log
+        self.pending.setdefault(log.target.id, collections.deque()).append(log)
 
-    async def warning(self, message, *args, **kwargs):
-        """Adds an warning log level to the DelayedLogger queue
+    def pop_pending(self, target_id):
+        """Takes the oldest pending log of a target.
 
-        Args:
-            message (str): The message to log
+        parameters:
+            target_id (int): the ID of the target
         """
-        await self.__send_queue.put(super().warning(message, *args, **kwargs))
+        log = self.pending[target_id].popleft()
+        del self.pending_keys[target_id][log.key]
+        return log
 
-    async def error(self, message, *args, **kwargs):
-        """Adds an error log level to the DelayedLogger queue
+    def take_batch(self, target_id):
+        """Takes the next logs to send to a target in one message.
 
-        Args:
-            message (str): The message to log
+        parameters:
+            target_id (int): the ID of the target
         """
-        await self.__send_queue.put(super().error(message, *args, **kwargs))
+        pending = self.pending[target_id]
+        batch = [self.pop_pending(target_id)]
+        if not batch[0].packable:
+            return batch
 
-    def register_queue(self):
-        """Registers the asyncio.Queue object to make delayed logging possible"""
-        self.__send_queue = asyncio.Queue(maxsize=self.queue_size)
+        # Discord limits the total size of the embeds in one message too
+        total_chars = len(batch[0].get_embed())
+        while pending and pending[0].packable and len(batch) < self.MAX_EMBEDS_PER_SEND:
+            embed_chars = len(pending[0].get_embed())
+            if total_chars + embed_chars > self.MAX_EMBED_CHARS_PER_SEND:
+                break
+            total_chars += embed_chars
+            batch.append(self.pop_pending(target_id))
+        return batch
+
+    async def send_log(self, log):
+        """Sends a single log on its own.
+
+        parameters:
+            log (QueuedLog): the log to send
+        """
+        try:
+            await super().deliver(
+                log.target,
+                embed=log.get_embed(),
+                content=log.content,
+                followups=log.followups,
+            )
+        except discord.HTTPException as exception:
+            self.console.warning("Could not send a log to Discord: %s", exception)
+
+    async def send_batch(self, batch):
+        """Sends a batch of logs to their target and paces the next send.
+
+        parameters:
+            batch (list): the logs to send, which all have the same target
+        """
+        target = batch[0].target
+        start = time.monotonic()
+
+        if len(batch) == 1:
+            await self.send_log(batch[0])
+        else:
+            try:
+                await target.send(embeds=[log.get_embed() for log in batch])
+            except discord.HTTPException as exception:
+                self.console.warning(
+                    "Could not send %s logs to Discord, sending them one at a time: %s",
+                    len(batch),
+                    exception,
+                )
+                for log in batch:
+                    await self.send_log(log)
+
+        # discord.py holds sends back when the rate limit headers of the channel
+        # say it's exhausted, so a slow send means the target needs more room
+        elapsed = time.monotonic() - start
+        wait_time = self.wait_times.get(target.id, self.wait_time)
+        if elapsed > self.SLOW_SEND_SECONDS:
+            wait_time = min(max(wait_time * 2, elapsed), self.MAX_WAIT_TIME)
+        else:
+            wait_time = max(wait_time / 2, self.wait_time)
+        self.wait_times[target.id] = wait_time
+        self.next_send_times[target.id] = time.monotonic() + wait_time
+
+    async def report_overload(self):
+        """Reports logs that were dropped because the queue was full."""
+        if not self.dropped:
+            return
+
+        dropped, self.dropped = self.dropped, 0
+        message = f"Dropped {dropped} log events because the log queue was full"
+        self.console.warning(message)
+
+        owner = await self.bot.get_owner()
+        if owner:
+            self.add_pending(
+                QueuedLog(owner, embed=embed_lib.from_level_name(message, "warning"))
+            )
+
+    def get_send_timeout(self):
+        """Gets the number of seconds until a pending log can be sent."""
+        if not any(self.pending.values()):
+            return None
+        now = time.monotonic()
+        return max(
+            min(
+                self.next_send_times.get(target_id, 0) - now
+                for target_id, pending in self.pending.items()
+                if pending
+            ),
+            0,
+        )
+
+    async def run_once(self):
+        """Collects queued logs and sends what each target is ready for."""
+        timeout = self.get_send_timeout()
+        if timeout != 0:
+            try:
+                log = await asyncio.wait_for(self.__send_queue.get(), timeout)
+                self.add_pending(log)
+            except asyncio.TimeoutError:
+                pass
+
+        while not self.__send_queue.empty():
+            self.add_pending(self.__send_queue.get_nowait())
+
+        await self.report_overload()
+
+        now = time.monotonic()
+        for target_id in list(self.pending):
+            if not self.pending[target_id]:
+                del self.pending[target_id]
+                del self.pending_keys[target_id]
+                continue
+            if self.next_send_times.get(target_id, 0) <= now:
+                await self.send_batch(self.take_batch(target_id))
 
     async def run(self):
-        """A forever loop that pulls from the queue and then waits based on the config"""
+        """A forever loop that sends the queued logs"""
         while True:
             try:
-                coro = await self.__send_queue.get()
-                if coro:
-                    await coro
+                await self.run_once()
+            except Exception as exception:
+                self.console.error("Could not send queued logs: %s", exception)
                 await asyncio.sleep(self.wait_time)
-            except Exception:
-                pass
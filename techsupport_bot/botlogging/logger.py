@@ -1,6 +1,7 @@
 """Module for logging bot events.
 """
 
+import asyncio
 import datetime
 import logging
 import traceback
@@ -9,12 +10,49 @@ import botlogging.embed as embed_lib
 import discord
 
 
+class LoggedAwaitable:
+    """An awaitable that is already done.
+
+    Log calls that don't have to wait on Discord return this,
+    so `await bot.logger.info(...)` costs no coroutine.
+    """
+
+    def __await__(self):
+        return iter(())
+
+
+DONE = LoggedAwaitable()
+
+
+class LogRecord:
+    """A formatted log waiting to be sent to Discord.
+
+    parameters:
+        embed (discord.Embed): the log embed
+        channel_id (int): the ID of the channel to send to, None for the owner
+        critical (bool): True if the owner of the target should be tagged
+        followups (list): messages to send right after the embed
+    """
+
+    def __init__(self, embed, channel_id=None, critical=False, followups=None):
+        self.embed = embed
+        self.channel_id = channel_id
+        self.critical = critical
+        self.followups = followups or []
+
+
 class BotLogger:
     """Logging interface for Discord bots.
 
+    Logs below the level of the console logger that aren't sent to Discord
+    are skipped without doing any work.
+
     parameters:
         bot (bot.TechSupportBot): the bot object
         name (str): the name of the logging channel
+        send (bool): False if nothing should be sent to Discord
+        fire_and_forget (bool): True if Discord logs should be sent in the background
+        record_queue_size (int): the max number of logs waiting to be sent
     """
 
     # this defaults to False because most logs shouldn't send out
@@ -26,8 +64,11 @@ class BotLogger:
         self.bot = kwargs.get("bot")
         self.console = logging.getLogger(kwargs.get("name", "root"))
         self.send = kwargs.get("send")
+        self.fire_and_forget = kwargs.get("fire_and_forget", False)
+        self.record_queue_size = kwargs.get("record_queue_size", 1000)
+        self.records = None
 
-    async def info(self, message, **kwargs):
+    def info(self, message, **kwargs):
         """Logs at the INFO level.
 
         parameters:
@@ -36,9 +77,9 @@ class BotLogger:
             send (bool): The reverse of the above (overrides console_only)
             channel (int): the ID of the channel to send the log to
         """
-        await self.handle_generic_log(message, self.console.info, **kwargs)
+        return self.log(logging.INFO, message, **kwargs)
 
-    async def debug(self, message, **kwargs):
+    def debug(self, message, **kwargs):
         """Logs at the DEBUG level.
 
         parameters:
@@ -47,9 +88,9 @@ class BotLogger:
             send (bool): The reverse of the above (overrides console_only)
             channel (int): the ID of the channel to send the log to
         """
-        await self.handle_generic_log(message, self.console.debug, **kwargs)
+        return self.log(logging.DEBUG, message, **kwargs)
 
-    async def warning(self, message, **kwargs):
+    def warning(self, message, **kwargs):
         """Logs at the WARNING level.
 
         parameters:
@@ -58,89 +99,90 @@ class BotLogger:
             send (bool): The reverse of the above (overrides console_only)
             channel (int): the ID of the channel to send the log to
         """
-        await self.handle_generic_log(message, self.console.warning, **kwargs)
+        return self.log(logging.WARNING, message, **kwargs)
 
-    async def handle_generic_log(self, message, console, **kwargs):
-        """Handles most logging contexts.
+    def error(self, message, **kwargs):
+        """Logs at the ERROR level.
 
         parameters:
             message (str): the message to log
             embed (discord.Embed): the embed to send to Discord
-            level (str): the logging level
-            console (func): logging level method
+            exception (Exception): the exception object
             send (bool): The reverse of the above (overrides console_only)
             channel (int): the ID of the channel to send the log to
+            critical (bool): True if the critical error handler should be invoked
         """
-        console_only = self._is_console_only(kwargs, is_error=False)
+        return self.log(logging.ERROR, message, **kwargs)
 
-        channel_id = kwargs.get("channel", None)
+    def log(self, level, message, **kwargs):
+        """Logs to the console and formats the log for Discord if needed.
 
-        console(message)
+        This returns an awaitable that is done once the log has been handled,
+        which is right away unless it's sent to Discord inline.
 
-        if console_only:
-            return
-
-        channel = self.bot.get_channel(int(channel_id)) if channel_id else None
+        parameters:
+            level (int): the logging level
+            message (str): the message to log
+        """
+        is_error = level >= logging.ERROR
+        console_only = self._is_console_only(kwargs, is_error=is_error)
 
-        if channel:
-            target = channel
-        else:
-            target = await self.bot.get_owner()
+        if console_only and not self.console.isEnabledFor(level):
+            return DONE
 
-        if not target:
-            self.console.warning(
-                "Could not determine Discord target to send %s log", console.__name__
-            )
-            return
+        self.console.log(level, message)
 
-        base_embed = embed_lib.from_level_name(message, console.__name__)
+        if console_only:
+            return DONE
 
-        embed = kwargs.get("embed", base_embed)
-        # override embed features with base
-        embed.title = base_embed.title
-        embed.color = base_embed.color
-        embed.description = base_embed.description
+        if is_error:
+            record = self.make_error_record(message, **kwargs)
+        else:
+            record = self.make_generic_record(
+                message, logging.getLevelName(level), **kwargs
+            )
 
-        embed.timestamp = kwargs.get("time", datetime.datetime.utcnow())
+        if not self.fire_and_forget or self.records is None:
+            return self.send_record(record)
 
         try:
-            await target.send(embed=embed)
-        except discord.Forbidden:
-            pass
+            self.records.put_nowait(record)
+        except asyncio.QueueFull:
+            self.console.warning("Log queue is full - not sending log to Discord")
+        return DONE
 
-    async def error(self, message, **kwargs):
-        """Logs at the ERROR level.
+    def make_generic_record(self, message, level_name, **kwargs):
+        """Formats a non-error log for Discord.
 
         parameters:
             message (str): the message to log
+            level_name (str): the logging level name
             embed (discord.Embed): the embed to send to Discord
-            exception (Exception): the exception object
-            send (bool): The reverse of the above (overrides console_only)
             channel (int): the ID of the channel to send the log to
-            critical (bool): True if the critical error handler should be invoked
         """
-        await self.handle_error_log(message, **kwargs)
+        base_embed = embed_lib.from_level_name(message, level_name)
 
-    async def handle_error_log(self, message, **kwargs):
-        """Handles error logging.
+        embed = kwargs.get("embed", base_embed)
+        # override embed features with base
+        embed.title = base_embed.title
+        embed.color = base_embed.color
+        embed.description = base_embed.description
+
+        embed.timestamp = kwargs.get("time", datetime.datetime.utcnow())
+
+        return LogRecord(embed, channel_id=kwargs.get("channel", None))
+
+    def make_error_record(self, message, **kwargs):
+        """Formats an error log for Discord.
 
         parameters:
             message (str): the message to log with the error
             embed (discord.Embed): the embed to send to Discord
             exception (Exception): the exception object
-            send (bool): The reverse of the above (overrides console_only)
             channel (int): the ID of the channel to send the log to
             critical (bool): True if the critical error handler should be invoked
         """
         exception = kwargs.get("exception", None)
-        critical = kwargs.get("critical")
-        channel_id = kwargs.get("channel", None)
-        console_only = self._is_console_only(kwargs, is_error=True)
-
-        self.console.error(message)
-
-        if console_only:
-            return
 
         exception_string = "".join(
             traceback.format_exception(
@@ -152,34 +194,78 @@ class BotLogger:
         embed = kwargs.get("embed", embed_lib.ErrorEmbed(message))
         embed.timestamp = kwargs.get("time", datetime.datetime.utcnow())
 
-        if channel_id:
-            channel = self.bot.get_channel(int(channel_id))
-        else:
-            channel = None
+        send_errors = [
+            exception_string[i : i + 1990]
+            for i in range(0, len(exception_string), 1990)
+        ]
+
+        return LogRecord(
+            embed,
+            channel_id=kwargs.get("channel", None),
+            critical=kwargs.get("critical"),
+            followups=[
+                f"```py\n{partial_exception}```" for partial_exception in send_errors
+            ],
+        )
+
+    async def send_record(self, record):
+        """Finds the Discord target of a log and sends it.
+
+        parameters:
+            record (LogRecord): the formatted log
+        """
+        channel = (
+            self.bot.get_channel(int(record.channel_id)) if record.channel_id else None
+        )
 
         # tag user if critical
         if channel:
-            content = channel.guild.owner.mention if critical else None
             target = channel
+            content = channel.guild.owner.mention if record.critical else None
         else:
             target = await self.bot.get_owner()
-            content = target.mention if critical else None
+            content = target.mention if target and record.critical else None
 
         if not target:
-            self.console.warning("Could not determine Discord target to send ERROR log")
+            self.console.warning(
+                "Could not determine Discord target to send %s log",
+                record.embed.title,
+            )
             return
 
-        send_errors = [
-            exception_string[i : i + 1990]
-            for i in range(0, len(exception_string), 1990)
-        ]
+        await self.deliver(
+            target, embed=record.embed, content=content, followups=record.followups
+        )
+
+    async def deliver(self, target, embed=None, content=None, followups=None):
+        """Sends a log to its Discord target.
+
+        parameters:
+            target (discord.abc.Messageable): the channel or user to send to
+            embed (discord.Embed): the log embed
+            content (str): the message content to send with the embed
+            followups (list): messages to send right after the embed
+        """
         try:
             await target.send(content=content, embed=embed)
-            for partial_exception in send_errors:
-                await target.send(f"```py\n{partial_exception}```")
+            for followup in followups or []:
+                await target.send(followup)
         except discord.Forbidden:
             pass
 
+    def register_record_queue(self):
+        """Registers the queue that fire-and-forget logs are sent from"""
+        self.records = asyncio.Queue(maxsize=self.record_queue_size)
+
+    async def run_records(self):
+        """A forever loop that sends the fire-and-forget logs"""
+        while True:
+            record = await self.records.get()
+            try:
+                await self.send_record(record)
+            except Exception as exception:
+                self.console.error("Could not send log to Discord: %s", exception)
+
     def _is_console_only(self, kwargs, is_error):
         """Determines from a kwargs dict if console_only is absolutely True.
 
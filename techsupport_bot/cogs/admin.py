@@ -658,9 +658,29 @@ class AdminControl(base.BaseCog):
                 name="IRC",
                 value=f"IRC Status: `{irc_status['status']}`\n"
                 + f"IRC Bot Name: `{irc_status['name']}`\n"
-                + f"Channels: `{irc_status['channels']}`",
+                + f"Channels: `{irc_status['channels']}`\n"
+                + f"Queue: `{irc_status['queue']}`",
                 inline=True,
             )
+        http_cache_stats = self.bot.http_cache.stats()
+        embed.add_field(
+            name="HTTP cache",
+            value=f"Hits: `{http_cache_stats['hits']}`\n"
+            + f"Misses: `{http_cache_stats['misses']}`\n"
+            + f"Revalidations: `{http_cache_stats['revalidations']}`\n"
+            + f"Coalesced: `{self.bot.http_inflight.coalesced}`\n"
+            + f"Size: `{http_cache_stats['entries']} entries"
+            + f" ({http_cache_stats['bytes']} bytes)`",
+            inline=True,
+        )
+        ban_cache_stats = self.bot.ban_store.stats()
+        embed.add_field(
+            name="Ban cache",
+            value=f"Hits: `{ban_cache_stats['hits']}`\n"
+            + f"Misses: `{ban_cache_stats['misses']}`\n"
+            + f"Size: `{ban_cache_stats['entries']} entries`",
+            inline=True,
+        )
         try:
             repo = git.Repo(search_parent_directories=True)
             commit = repo.head.commit
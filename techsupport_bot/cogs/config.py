@@ -124,13 +124,11 @@ class ConfigControl(base.BaseCog):
                 if view.value is not ui.ConfirmResponse.CONFIRMED:
                     return
 
-            await self.bot.guild_config_collection.replace_one(
-                {"guild_id": config.get("guild_id")}, uploaded_data
-            )
+            uploaded_data["config_version"] = config.get("config_version")
+            await self.bot.write_context_config(uploaded_data)
 
             # Delete config from cache
-            if str(ctx.guild.id) in self.bot.guild_config_cache:
-                del self.bot.guild_config_cache[str(ctx.guild.id)]
+            self.bot.guild_config_cache.pop(str(ctx.guild.id))
 
             await auxiliary.send_confirm_embed(
                 message="I've updated that config", channel=ctx.channel
@@ -185,9 +183,7 @@ class ConfigControl(base.BaseCog):
         config.enabled_extensions.append(extension_name)
         config.enabled_extensions.sort()
 
-        await self.bot.guild_config_collection.replace_one(
-            {"guild_id": config.get("guild_id")}, config
-        )
+        await self.bot.write_context_config(config)
 
         await auxiliary.send_confirm_embed(
             message="I've enabled that extension for this guild", channel=ctx.channel
@@ -233,9 +229,7 @@ class ConfigControl(base.BaseCog):
             if extension != extension_name
         ]
 
-        await self.bot.guild_config_collection.replace_one(
-            {"guild_id": config.get("guild_id")}, config
-        )
+        await self.bot.write_context_config(config)
 
         await auxiliary.send_confirm_embed(
             message="I've disabled that extension for this guild", channel=ctx.channel
@@ -6,11 +6,14 @@ from .burn import *
 from .conch import *
 from .correct import *
 from .emoji import *
+from .factoids import *
 from .hello import *
 from .htd import *
 from .hug import *
 from .lenny import *
 from .linter import *
 from .mock import *
+from .protect import *
+from .relay import *
 from .roll import *
 from .wyr import *
@@ -115,6 +115,7 @@ class ApplicationManager(base.MatchCog, base.LoopCog):
     COLLECTION_NAME = "applications_extension"
     STALE_APPLICATION_DAYS = 30
     MAX_REMINDER_FIELDS = 10
+    GUILD_ONLY = True
 
     async def preconfig(self):
         """Method to run on first time, used to create mongo collections"""
@@ -1,23 +1,25 @@
 """
 Name: Factoids
 Info: Makes callable slices of text
-Unit tests: No
+Unit tests: Yes
 Config: manage_roles, prefix
 API: Linx
 Databases: Postgres
-Models: Factoid, FactoidJob
+Models: Factoid, FactoidJob, FactoidUsage
 Subcommands: remember, forget, info, json, all, search, loop, deloop, job, jobs, hide, unhide,
-             alias, dealias
+             alias, dealias, import, top
 Defines: has_manage_factoids_role
 """
-import asyncio
+import bisect
+import collections
 import datetime
+import difflib
 import io
+import itertools
 import json
 import re
 from socket import gaierror
 
-import aiocron
 import base
 import discord
 import expiringdict
@@ -26,9 +28,10 @@ import util
 import yaml
 from aiohttp.client_exceptions import InvalidURL
 from base import auxiliary
-from croniter import CroniterBadCronError
+from croniter import CroniterBadCronError, croniter
 from discord.ext import commands
 from error import FactoidNotFoundError, TooLongFactoidMessageError
+from sqlalchemy.dialects import postgresql
 
 
 async def setup(bot):
@@ -62,6 +65,17 @@ async def setup(bot):
         channel = bot.db.Column(bot.db.String)
         cron = bot.db.Column(bot.db.String)
 
+    class FactoidUsage(bot.db.Model):
+        """Defines the factoid usage model"""
+
+        __tablename__ = "factoid_usage"
+
+        factoid_id = bot.db.Column(
+            bot.db.Integer, primary_key=True, autoincrement=False
+        )
+        uses = bot.db.Column(bot.db.Integer, default=0)
+        last_used = bot.db.Column(bot.db.DateTime)
+
     # Sets up the config
     config = bot.ExtensionConfig()
     config.add(
@@ -82,7 +96,7 @@ async def setup(bot):
     await bot.add_cog(
         FactoidManager(
             bot=bot,
-            models=[Factoid, FactoidJob],
+            models=[Factoid, FactoidJob, FactoidUsage],
             extension_name="factoids",
         )
     )
@@ -126,11 +140,503 @@ async def has_manage_factoids_role(ctx: commands.Context):
     return True
 
 
+class FactoidSearch:
+    """Inverted index used to search the factoids of each guild
+
+    Names are indexed by trigram so substring matches only check names that
+    share every trigram of the query. Content is indexed by word, and query
+    words match any indexed word they are a prefix of.
+    """
+
+    TOKEN_REGEX = re.compile(r"[a-z0-9]+")
+    EXACT_WEIGHT = 2
+    NAME_WEIGHT = 10
+    SUGGESTION_CUTOFF = 0.75
+
+    def __init__(self):
+        self.documents = {}
+        self.postings = {}
+        self.trigrams = {}
+        self.vocabularies = {}
+
+    def clear(self):
+        """Empties the search index"""
+        self.documents = {}
+        self.postings = {}
+        self.trigrams = {}
+        self.vocabularies = {}
+
+    def get_trigrams(self, text: str) -> set:
+        """Gets the trigrams of some text
+
+        Args:
+            text (str): The text to split, at least 3 characters long
+
+        Returns:
+            set: The trigrams of the text
+        """
+        return {text[i : i + 3] for i in range(len(text) - 2)}
+
+    def get_tokens(self, factoid) -> collections.Counter:
+        """Gets the words of the message and embed of a factoid
+
+        Only the values of the embed are used, so the JSON keys can't be searched for.
+
+        Args:
+            factoid (Factoid): The factoid to split
+
+        Returns:
+            collections.Counter: How many times each word appears
+        """
+        texts = [factoid.message or ""]
+        if factoid.embed_config:
+            try:
+                values = [json.loads(factoid.embed_config)]
+            except json.JSONDecodeError:
+                values = [factoid.embed_config]
+            while values:
+                value = values.pop()
+                if isinstance(value, dict):
+                    values.extend(value.values())
+                elif isinstance(value, list):
+                    values.extend(value)
+                elif isinstance(value, str):
+                    texts.append(value)
+
+        return collections.Counter(self.TOKEN_REGEX.findall(" ".join(texts).lower()))
+
+    def add(self, factoid):
+        """Adds a factoid to the search index
+
+        Args:
+            factoid (Factoid): The factoid to add
+        """
+        self.remove(factoid.guild, factoid.name)
+
+        is_alias = factoid.alias not in ["", None]
+        tokens = collections.Counter() if is_alias else self.get_tokens(factoid)
+        self.documents.setdefault(factoid.guild, {})[factoid.name] = {
+            "tokens": tokens,
+            "hidden": bool(factoid.hidden),
+            "alias": is_alias,
+        }
+
+        trigrams = self.trigrams.setdefault(factoid.guild, {})
+        for trigram in self.get_trigrams(factoid.name):
+            trigrams.setdefault(trigram, set()).add(factoid.name)
+
+        postings = self.postings.setdefault(factoid.guild, {})
+        for token in tokens:
+            if token not in postings:
+                postings[token] = set()
+                self.vocabularies.pop(factoid.guild, None)
+            postings[token].add(factoid.name)
+
+    def remove(self, guild: str, factoid_name: str):
+        """Removes a factoid from the search index
+
+        Args:
+            guild (str): The id of the guild for the factoid
+            factoid_name (str): The name of the factoid
+        """
+        document = self.documents.get(guild, {}).pop(factoid_name, None)
+        if not document:
+            return
+
+        trigrams = self.trigrams[guild]
+        for trigram in self.get_trigrams(factoid_name):
+            trigrams[trigram].discard(factoid_name)
+            if not trigrams[trigram]:
+                del trigrams[trigram]
+
+        postings = self.postings[guild]
+        for token in document["tokens"]:
+            postings[token].discard(factoid_name)
+            if not postings[token]:
+                del postings[token]
+                self.vocabularies.pop(guild, None)
+
+    def get_vocabulary(self, guild: str) -> list:
+        """Gets the sorted words of a guild, sorted again only after words were added
+
+        Args:
+            guild (str): The id of the guild
+
+        Returns:
+            list: The sorted words
+        """
+        if guild not in self.vocabularies:
+            self.vocabularies[guild] = sorted(self.postings.get(guild, {}))
+        return self.vocabularies[guild]
+
+    def is_listed(self, guild: str, factoid_name: str) -> bool:
+        """Checks if a factoid can show up in search results
+
+        Args:
+            guild (str): The id of the guild for the factoid
+            factoid_name (str): The name of the factoid
+
+        Returns:
+            bool: Whether the factoid isn't an alias or hidden
+        """
+        document = self.documents[guild][factoid_name]
+        return not document["alias"] and not document["hidden"]
+
+    def search_names(self, guild: str, query: str) -> list:
+        """Finds the factoids with the query in their name
+
+        Args:
+            guild (str): The id of the guild to search in
+            query (str): The lowercase query, at least 3 characters long
+
+        Returns:
+            list: The matching names, best match first
+        """
+        trigrams = self.trigrams.get(guild, {})
+        candidates = None
+        for trigram in self.get_trigrams(query):
+            names = trigrams.get(trigram, set())
+            candidates = names if candidates is None else candidates & names
+            if not candidates:
+                return []
+
+        matches = [
+            name for name in candidates if query in name and self.is_listed(guild, name)
+        ]
+        # Exact matches first, then names starting with the query, then shortest
+        return sorted(
+            matches,
+            key=lambda name: (
+                name != query,
+                not name.startswith(query),
+                len(name),
+                name,
+            ),
+        )
+
+    def search_content(self, guild: str, query: str) -> list:
+        """Finds the factoids with the query words in their message or embed
+
+        Args:
+            guild (str): The id of the guild to search in
+            query (str): The lowercase query
+
+        Returns:
+            list: The matching names, most relevant first
+        """
+        documents = self.documents.get(guild, {})
+        postings = self.postings.get(guild, {})
+        vocabulary = self.get_vocabulary(guild)
+        scores = collections.Counter()
+
+        for word in set(self.TOKEN_REGEX.findall(query)):
+            position = bisect.bisect_left(vocabulary, word)
+            while position < len(vocabulary) and vocabulary[position].startswith(word):
+                token = vocabulary[position]
+                weight = self.EXACT_WEIGHT if token == word else 1
+                for name in postings[token]:
+                    scores[name] += weight * documents[name]["tokens"][token]
+                position += 1
+
+        for name in scores:
+            if query in name:
+                scores[name] += self.NAME_WEIGHT
+
+        return [
+            name
+            for name, _ in sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+            if self.is_listed(guild, name)
+        ]
+
+    def suggest(self, guild: str, factoid_name: str) -> str:
+        """Finds the factoid name that is closest to an unknown one, hidden ones excluded
+
+        Args:
+            guild (str): The id of the guild to search in
+            factoid_name (str): The lowercase unknown name
+
+        Returns:
+            str: The closest name, None if nothing is close enough
+        """
+        trigrams = self.trigrams.get(guild, {})
+        overlaps = collections.Counter()
+        for trigram in self.get_trigrams(factoid_name):
+            overlaps.update(trigrams.get(trigram, ()))
+
+        documents = self.documents.get(guild, {})
+        candidates = [
+            name
+            for name, _ in overlaps.most_common(10)
+            if not documents[name]["hidden"]
+        ]
+        matches = difflib.get_close_matches(
+            factoid_name, candidates, n=1, cutoff=self.SUGGESTION_CUTOFF
+        )
+        return matches[0] if matches else None
+
+
+class FactoidIndex:
+    """In-memory index of factoids, grouped by guild and keyed by name
+
+    Once the whole factoid table has been loaded the index is complete, so any
+    name it doesn't have is known not to exist. Until then, names that were
+    looked up and not found are remembered per guild as negative lookups.
+
+    Every write gives the guild a new version, so anything rendered from the
+    factoids of a guild can be cached until the version changes.
+
+    Aliases are kept as a graph of alias name to parent name, and parent name
+    to alias names, so alias questions never need the DB.
+    """
+
+    def __init__(self):
+        self.guilds = {}
+        self.missing = {}
+        self.complete = False
+        self.search = FactoidSearch()
+        self.ids = {}
+        self.embeds = {}
+        self.parents = {}
+        self.aliases = {}
+        self.versions = {}
+        self.version_counter = itertools.count(1)
+
+    def __len__(self):
+        return sum(len(factoids) for factoids in self.guilds.values())
+
+    def load(self, factoids: list):
+        """Replaces the index with every factoid in the DB
+
+        Args:
+            factoids (list): Every factoid, from all guilds
+        """
+        self.clear()
+        for factoid in factoids:
+            self.add(factoid)
+        self.complete = True
+
+    def clear(self):
+        """Empties the index, lookups go to the DB until it is loaded again"""
+        self.guilds = {}
+        self.missing = {}
+        self.complete = False
+        self.search.clear()
+        self.ids = {}
+        self.embeds = {}
+        self.parents = {}
+        self.aliases = {}
+        self.versions = {}
+
+    def get_version(self, guild: str) -> int:
+        """Gets the version of the factoids of a guild
+
+        Args:
+            guild (str): The id of the guild
+
+        Returns:
+            int: The version, which changes on every write
+        """
+        return self.versions.get(guild, 0)
+
+    def get_guild_factoids(self, guild: str) -> list:
+        """Gets every indexed factoid of a guild
+
+        Args:
+            guild (str): The id of the guild
+
+        Returns:
+            list: The factoids, sorted by name
+        """
+        return sorted(
+            self.guilds.get(guild, {}).values(), key=lambda factoid: factoid.name
+        )
+
+    def get(self, guild: str, factoid_name: str):
+        """Gets a factoid from the index, does NOT follow aliases
+
+        Args:
+            guild (str): The id of the guild for the factoid
+            factoid_name (str): The name of the factoid
+
+        Returns:
+            Factoid: The factoid, None if it isn't indexed
+        """
+        return self.guilds.get(guild, {}).get(factoid_name.lower())
+
+    def get_embed(self, factoid) -> discord.Embed:
+        """Gets a copy of the embed of a factoid, only parsing its JSON once
+
+        Args:
+            factoid (Factoid): The factoid to get the embed of
+
+        Returns:
+            discord.Embed: The embed, None if the factoid doesn't have a valid one
+        """
+        if not factoid.embed_config:
+            return None
+
+        key = (factoid.guild, factoid.name)
+        cached = self.embeds.get(key)
+        if not cached or cached[0] != factoid.embed_config:
+            try:
+                embed = discord.Embed.from_dict(json.loads(factoid.embed_config))
+            except (json.JSONDecodeError, TypeError, AttributeError):
+                embed = None
+            cached = self.embeds[key] = (factoid.embed_config, embed)
+
+        return cached[1].copy() if cached[1] else None
+
+    def get_by_id(self, factoid_id: int):
+        """Gets a factoid from the index by its ID
+
+        Args:
+            factoid_id (int): The ID of the factoid
+
+        Returns:
+            Factoid: The factoid, None if it isn't indexed
+        """
+        return self.ids.get(factoid_id)
+
+    def is_missing(self, guild: str, factoid_name: str) -> bool:
+        """Checks if a factoid is known not to exist
+
+        Args:
+            guild (str): The id of the guild for the factoid
+            factoid_name (str): The name of the factoid
+
+        Returns:
+            bool: Whether the factoid doesn't exist
+        """
+        factoid_name = factoid_name.lower()
+        if factoid_name in self.guilds.get(guild, {}):
+            return False
+        return self.complete or factoid_name in self.missing.get(guild, set())
+
+    def add(self, factoid):
+        """Adds or replaces a factoid in the index
+
+        Args:
+            factoid (Factoid): The factoid to add
+        """
+        self.guilds.setdefault(factoid.guild, {})[factoid.name] = factoid
+        self.missing.get(factoid.guild, set()).discard(factoid.name)
+        self.search.add(factoid)
+        self.ids[getattr(factoid, "factoid_id", None)] = factoid
+        self.embeds.pop((factoid.guild, factoid.name), None)
+        self.unlink_alias(factoid.guild, factoid.name)
+        if factoid.alias not in ["", None]:
+            self.parents.setdefault(factoid.guild, {})[factoid.name] = factoid.alias
+            self.aliases.setdefault(factoid.guild, {}).setdefault(
+                factoid.alias, set()
+            ).add(factoid.name)
+        self.versions[factoid.guild] = next(self.version_counter)
+
+    def remove(self, guild: str, factoid_name: str):
+        """Removes a factoid from the index
+
+        Args:
+            guild (str): The id of the guild for the factoid
+            factoid_name (str): The name of the factoid
+        """
+        factoids = self.guilds.get(guild, {})
+        factoid = factoids.pop(factoid_name.lower(), None)
+        if factoid:
+            self.ids.pop(getattr(factoid, "factoid_id", None), None)
+        self.embeds.pop((guild, factoid_name.lower()), None)
+        self.unlink_alias(guild, factoid_name.lower())
+        if not factoids:
+            self.guilds.pop(guild, None)
+        self.search.remove(guild, factoid_name.lower())
+        self.add_missing(guild, factoid_name)
+        self.versions[guild] = next(self.version_counter)
+
+    def unlink_alias(self, guild: str, factoid_name: str):
+        """Removes a factoid from the alias graph as an alias
+
+        Args:
+            guild (str): The id of the guild for the factoid
+            factoid_name (str): The lowercase name of the factoid
+        """
+        parent = self.parents.get(guild, {}).pop(factoid_name, None)
+        if parent is None:
+            return
+        aliases = self.aliases[guild][parent]
+        aliases.discard(factoid_name)
+        if not aliases:
+            del self.aliases[guild][parent]
+
+    def get_aliases(self, guild: str, factoid_name: str) -> list:
+        """Gets the aliases that point to a factoid
+
+        Args:
+            guild (str): The id of the guild for the factoid
+            factoid_name (str): The name of the parent factoid
+
+        Returns:
+            list: The alias factoids, sorted by name
+        """
+        factoids = self.guilds.get(guild, {})
+        return [
+            factoids[name]
+            for name in sorted(
+                self.aliases.get(guild, {}).get(factoid_name.lower(), ())
+            )
+            if name in factoids
+        ]
+
+    def get_canonical_name(self, guild: str, factoid_name: str) -> str:
+        """Follows aliases from a factoid name to the factoid they end at
+
+        Args:
+            guild (str): The id of the guild for the factoid
+            factoid_name (str): The name to start from
+
+        Returns:
+            str: The name of the last factoid, None if the aliases loop
+        """
+        parents = self.parents.get(guild, {})
+        name = factoid_name.lower()
+        seen = {name}
+        while name in parents:
+            name = parents[name]
+            if name in seen:
+                return None
+            seen.add(name)
+        return name
+
+    def would_create_cycle(self, guild: str, alias_name: str, parent_name: str):
+        """Checks if pointing an alias at a parent would make the aliases loop
+
+        Args:
+            guild (str): The id of the guild for the factoids
+            alias_name (str): The name of the alias
+            parent_name (str): The name of the parent
+
+        Returns:
+            bool: Whether the alias would end up pointing at itself
+        """
+        canonical_name = self.get_canonical_name(guild, parent_name)
+        return canonical_name is None or canonical_name == alias_name.lower()
+
+    def add_missing(self, guild: str, factoid_name: str):
+        """Remembers that a factoid doesn't exist
+
+        Args:
+            guild (str): The id of the guild for the factoid
+            factoid_name (str): The name of the factoid
+        """
+        if not self.complete:
+            self.missing.setdefault(guild, set()).add(factoid_name.lower())
+
+
 class FactoidManager(base.MatchCog):
     """
     Manages all facttoid features
     """
 
+    IMPORT_CHUNK_SIZE = 1000
+    USAGE_FLUSH_CRON = "* * * * *"
+    WARM_EMBED_COUNT = 100
     CRON_REGEX = (
         r"^((\*|([0-5]?\d|\*\/\d+)(-([0-5]?\d))?)(,\s*(\*|([0-5]?\d|\*\/\d+)(-([0-5]"
         + r"?\d))?)){0,59}\s+){4}(\*|([0-7]?\d|\*(\/[1-9]|[1-5]\d)|mon|tue|wed|thu|fri|sat|sun"
@@ -138,18 +644,37 @@ class FactoidManager(base.MatchCog):
     )
 
     async def preconfig(self):
-        """Preconfig for factoid jobs"""
-        self.factoid_cache = expiringdict.ExpiringDict(
-            max_len=100, max_age_seconds=1200
-        )
-        # set a hard time limit on repeated cronjob DB calls
-        self.running_jobs = {}
+        """Preconfig for the factoid index and factoid jobs"""
+        self.factoid_index = FactoidIndex()
         self.factoid_all_cache = expiringdict.ExpiringDict(
-            max_len=1,
+            max_len=100,
             max_age_seconds=86400,  # 24 hours, matches deletion on linx server
         )
+        # Rendered `factoid all` exports, rebuilt when the guild version changes
+        self.factoid_export_cache = expiringdict.ExpiringDict(
+            max_len=20, max_age_seconds=86400
+        )
+        # Factoid ID to the uses that haven't been written to the DB yet
+        self.factoid_usage = {}
+        await self.load_factoid_index()
+        await self.warm_factoid_embeds()
         await self.bot.logger.debug("Loading factoid jobs")
         await self.kickoff_jobs()
+        self.bot.scheduler.add(
+            ("factoid", "usage"), self.USAGE_FLUSH_CRON, self.flush_usage
+        )
+
+    async def load_factoid_index(self):
+        """Loads every factoid into the factoid index"""
+        factoids = await self.models.Factoid.query.gino.all()
+        self.factoid_index.load(factoids)
+        await self.bot.logger.debug(f"Loaded {len(self.factoid_index)} factoids")
+
+    async def ensure_factoid_index(self):
+        """Loads the factoid index if it isn't complete yet, for anything that
+        has to see every factoid of a guild"""
+        if not self.factoid_index.complete:
+            await self.load_factoid_index()
 
     # -- DB calls --
     async def delete_factoid_call(self, factoid, guild: str):
@@ -159,28 +684,26 @@ class FactoidManager(base.MatchCog):
             factoid (Factoid): The factoid to delete
             guild (str): The guild ID for cache handling
         """
-        # Removes the `factoid all` cache since it has become outdated
-        if guild in self.factoid_all_cache:
-            del self.factoid_all_cache[guild]
-
         # Deloops the factoid first (if it's looped)
         jobs = await self.models.FactoidJob.query.where(
             self.models.FactoidJob.factoid == factoid.factoid_id
         ).gino.all()
         if jobs:
             for job in jobs:
-                job_id = job.job_id
-                # Cancels the job
-                self.running_jobs[job_id]["task"].cancel()
-
-                # Removes it from the cache
-                del self.running_jobs[job_id]
+                # Unschedules the job
+                self.bot.scheduler.remove(self.get_job_key(job))
 
                 # Removes the DB entry
                 await job.delete()
 
-        await self.handle_cache(guild, factoid.name)
+        # Removes its usage, including the uses that haven't been written yet
+        self.factoid_usage.pop(factoid.factoid_id, None)
+        await self.models.FactoidUsage.delete.where(
+            self.models.FactoidUsage.factoid_id == factoid.factoid_id
+        ).gino.status()
+
         await factoid.delete()
+        self.factoid_index.remove(guild, factoid.name)
 
     async def create_factoid_call(
         self,
@@ -205,10 +728,6 @@ class FactoidManager(base.MatchCog):
         if len(message) > 2000:
             raise TooLongFactoidMessageError
 
-        # Removes the `factoid all` cache since it has become outdated
-        if guild in self.factoid_all_cache:
-            del self.factoid_all_cache[guild]
-
         factoid = self.models.Factoid(
             name=factoid_name.lower(),
             guild=guild,
@@ -218,6 +737,7 @@ class FactoidManager(base.MatchCog):
         )
 
         await factoid.create()
+        self.factoid_index.add(factoid)
 
     async def modify_factoid_call(
         self,
@@ -244,10 +764,7 @@ class FactoidManager(base.MatchCog):
         if message and len(message) > 2000:
             raise TooLongFactoidMessageError
 
-        # Removes the `factoid all` cache since it has become outdated
-        if hidden not in [None, False] and factoid.guild in self.factoid_all_cache:
-            del self.factoid_all_cache[factoid.guild]
-
+        old_name = factoid.name
         await factoid.update(
             name=factoid_name.lower() if factoid_name is not None else factoid.name,
             message=message if message is not None else factoid.message,
@@ -258,7 +775,10 @@ class FactoidManager(base.MatchCog):
             alias=alias if alias is not None else None,
         ).apply()
 
-        await self.handle_cache(factoid.guild, factoid.name)
+        # The update is applied to the indexed object, only a rename needs handling
+        if old_name != factoid.name:
+            self.factoid_index.remove(factoid.guild, old_name)
+        self.factoid_index.add(factoid)
 
     # -- Utility --
     async def confirm_factoid_deletion(
@@ -339,7 +859,7 @@ class FactoidManager(base.MatchCog):
         Args:
             aliases (list): A list of aliases to change
             new_name (str): The name of the new parent
-            ctx (commands.Context): Used for cache handling
+            ctx (commands.Context): Context of the invocation, unused
         """
 
         for alias in aliases:
@@ -348,7 +868,6 @@ class FactoidManager(base.MatchCog):
                 continue
             # Updates the existing aliases to point to the new parent
             await self.modify_factoid_call(factoid=alias, alias=new_name)
-            await self.handle_cache(str(ctx.guild.id), alias.name)
 
     async def check_alias_recursion(
         self,
@@ -370,16 +889,13 @@ class FactoidManager(base.MatchCog):
         """
 
         # Get list of aliases of the target factoid
-        factoid_aliases = (
-            await self.models.Factoid.query.where(
-                self.models.Factoid.alias == alias_name
-            )
-            .where(self.models.Factoid.guild == guild)
-            .gino.all()
-        )
+        factoid_aliases = self.factoid_index.get_aliases(guild, alias_name)
 
         # Returns arue if the factoid and alias name is the same (.factoid alias a a)
-        if factoid_name == alias_name:
+        # or if the factoid already leads back to the alias
+        if factoid_name == alias_name or self.factoid_index.would_create_cycle(
+            guild, alias_name, factoid_name
+        ):
             await auxiliary.send_deny_embed(
                 message="Can't set an alias for itself!", channel=channel
             )
@@ -406,81 +922,51 @@ class FactoidManager(base.MatchCog):
         Returns:
             discord.Embed: The embed of the factoid
         """
-        if not factoid.embed_config:
-            return None
-
-        embed_config = json.loads(factoid.embed_config)
-
-        return discord.Embed.from_dict(embed_config)
-
-    # -- Cache functions --
-    async def handle_cache(self, guild: str, factoid_name: str):
-        """Deletes factoid from the factoid cache
+        return self.factoid_index.get_embed(factoid)
 
-        Args:
-            guild (str): The guild to get the cache key
-            factoid_name (str): The name of the factoid to remove from the cache
-        """
-        key = self.get_cache_key(guild, factoid_name)
-
-        if key in self.factoid_cache:
-            del self.factoid_cache[key]
-
-    def get_cache_key(self, guild: str, factoid_name: str) -> str:
-        """Gets the cache key for a guild
+    def check_valid_embed_config(self, embed_config: str) -> str:
+        """Makes sure an embed config can be sent, so calls never fail on it
 
         Args:
-            guild (str): The ID of the guild
-            factoid_name (str): The name of the factoid
+            embed_config (str): The embed config JSON
 
         Returns:
-            str: The cache key
+            str: The error message
         """
-        return f"{guild}_{factoid_name}"
-
-    # -- Getting factoids --
-    async def get_all_factoids(
-        self, guild: str = None, list_hidden: bool = False
-    ) -> list:
-        """Gets all factoids from a guild
-
-        Args:
-            guild (str, optional): The guild to get the factoids from.
-                                   Defaults to None, where all guilds are returned instead.
-            list_hidden (bool, optional): Whether to list hidden factoids as well.
-                                          Defaults to False.
-
-        Returns:
-            list: List of factoids
-        """
-        # Gets factoids for a guild, including those that are hidden
-        if guild and list_hidden:
-            factoids = await self.models.Factoid.query.where(
-                self.models.Factoid.guild == guild
-            ).gino.all()
-
-        # Gets factoids for a guild excluding the hidden ones
-        elif guild and not list_hidden:
-            factoids = (
-                await self.models.Factoid.query.where(
-                    self.models.Factoid.guild == guild
-                )
-                # hiding hidden factoids
-                .where(self.models.Factoid.hidden is False).gino.all()
-            )
+        try:
+            embed_dict = json.loads(embed_config)
+        except json.JSONDecodeError:
+            return "The embed config is not valid JSON!"
 
-        # Gets ALL factoids for ALL guilds
-        else:
-            factoids = await self.bot.db.all(self.models.Factoid.query)
+        if not isinstance(embed_dict, dict) or not embed_dict:
+            return "The embed config must be a single, non-empty JSON object!"
 
-        # Sorts them alphabetically
-        if factoids:
-            factoids.sort(key=lambda factoid: factoid.name)
+        try:
+            embed = discord.Embed.from_dict(embed_dict)
+        except (TypeError, ValueError, AttributeError):
+            return "The embed config is not a valid embed!"
+
+        limits = [
+            (len(embed.title or ""), 256, "title"),
+            (len(embed.description or ""), 4096, "description"),
+            (len(embed.fields), 25, "number of fields"),
+            (len(embed.footer.text or ""), 2048, "footer"),
+            (len(embed.author.name or ""), 256, "author name"),
+        ]
+        for field in embed.fields:
+            limits.append((len(field.name or ""), 256, "field name"))
+            limits.append((len(field.value or ""), 1024, "field value"))
+        limits.append((len(embed), 6000, "total length"))
+
+        for length, limit, name in limits:
+            if length > limit:
+                return f"The embed {name} is over the discord limit ({limit})!"
 
-        return factoids
+        return None
 
+    # -- Getting factoids --
     async def get_raw_factoid_entry(self, factoid_name: str, guild: str):
-        """Searches the db for a factoid by its name, does NOT follow aliases
+        """Gets a factoid by its name from the index, does NOT follow aliases
 
         Args:
             factoid_name (str): The name of the factoid to get
@@ -489,29 +975,32 @@ class FactoidManager(base.MatchCog):
         Returns:
             Factoid: The factoid
         """
-        cache_key = self.get_cache_key(guild, factoid_name)
-        factoid = self.factoid_cache.get(cache_key)
-        # If the factoid isn't cached
-        if not factoid:
-            factoid = (
-                await self.models.Factoid.query.where(
-                    self.models.Factoid.name == factoid_name.lower()
-                )
-                .where(self.models.Factoid.guild == guild)
-                .gino.first()
-            )
+        factoid = self.factoid_index.get(guild, factoid_name)
+        if factoid:
+            return factoid
 
-            # If the factoid doesn't exist
-            if not factoid:
-                raise FactoidNotFoundError(factoid=factoid_name)
+        if self.factoid_index.is_missing(guild, factoid_name):
+            raise FactoidNotFoundError(factoid=factoid_name)
 
-            # Caches it
-            self.factoid_cache[cache_key] = factoid
+        # Only reached while the index isn't loaded
+        factoid = (
+            await self.models.Factoid.query.where(
+                self.models.Factoid.name == factoid_name.lower()
+            )
+            .where(self.models.Factoid.guild == guild)
+            .gino.first()
+        )
+
+        # If the factoid doesn't exist
+        if not factoid:
+            self.factoid_index.add_missing(guild, factoid_name)
+            raise FactoidNotFoundError(factoid=factoid_name)
 
+        self.factoid_index.add(factoid)
         return factoid
 
     async def get_factoid(self, factoid_name: str, guild: str):
-        """Gets the factoid from the DB, follows aliases
+        """Gets a factoid by its name from the index, follows aliases
 
         Args:
             factoid_name (str): The name of the factoid to get
@@ -598,9 +1087,6 @@ class FactoidManager(base.MatchCog):
                 alias=alias,
             )
 
-        # Removes the factoid from the cache
-        await self.handle_cache(guild, name)
-
         await auxiliary.send_confirm_embed(
             message=f"Successfully {fmt} the factoid `{name.lower()}`",
             channel=ctx.channel,
@@ -647,6 +1133,17 @@ class FactoidManager(base.MatchCog):
         return True
 
     # -- Getting and responding with a factoid --
+    def match_prefix(self, config) -> str:
+        """Gets the factoid prefix, every factoid call starts with it
+
+        Args:
+            config (Config): The config to get the prefix from
+
+        Returns:
+            str: The factoid prefix
+        """
+        return config.extensions.factoids.prefix.value
+
     async def match(self, config, _: commands.Context, message_contents: str) -> bool:
         """Checks if a message started with the prefix from the config
 
@@ -686,6 +1183,13 @@ class FactoidManager(base.MatchCog):
             await self.bot.logger.debug(
                 f"Invalid factoid call {query} from {ctx.guild.id}"
             )
+            suggestion = self.factoid_index.search.suggest(str(ctx.guild.id), query)
+            if suggestion:
+                await auxiliary.send_deny_embed(
+                    message=f"Couldn't find the factoid `{query}`,"
+                    + f" did you mean `{suggestion}`?",
+                    channel=ctx.channel,
+                )
             return
 
         embed = self.get_embed_from_factoid(factoid)
@@ -730,8 +1234,97 @@ class FactoidManager(base.MatchCog):
             # Sends the raw factoid instead of the embed as fallback
             await ctx.reply(f"{mentions+' ' if mentions else ''}{factoid.message}")
 
+        self.record_usage(factoid)
         await self.send_to_irc(ctx, factoid.message)
 
+    # -- Factoid usage --
+    def record_usage(self, factoid):
+        """Counts a factoid call in memory, it is written to the DB in batches
+
+        Args:
+            factoid (Factoid): The factoid that was sent
+        """
+        usage = self.factoid_usage.setdefault(
+            factoid.factoid_id, {"uses": 0, "last_used": None}
+        )
+        usage["uses"] += 1
+        usage["last_used"] = datetime.datetime.utcnow()
+
+    async def flush_usage(self, _: list = None):
+        """Writes the counted factoid calls to the DB with a single upsert
+
+        Args:
+            _ (list): Scheduler payloads, not used
+        """
+        if not self.factoid_usage:
+            return
+
+        pending, self.factoid_usage = self.factoid_usage, {}
+        table = self.models.FactoidUsage.__table__
+        statement = postgresql.insert(table).values(
+            [
+                {"factoid_id": factoid_id, **usage}
+                for factoid_id, usage in pending.items()
+            ]
+        )
+        statement = statement.on_conflict_do_update(
+            index_elements=[table.c.factoid_id],
+            set_={
+                "uses": table.c.uses + statement.excluded.uses,
+                "last_used": statement.excluded.last_used,
+            },
+        )
+
+        try:
+            await self.bot.db.status(statement)
+        except Exception as e:
+            # Keeps the counts so the next flush can write them
+            for factoid_id, usage in pending.items():
+                merged = self.factoid_usage.setdefault(
+                    factoid_id, {"uses": 0, "last_used": usage["last_used"]}
+                )
+                merged["uses"] += usage["uses"]
+            await self.bot.logger.error("Could not write factoid usage", exception=e)
+
+    async def get_usage(self, factoid) -> tuple:
+        """Gets how often a factoid was called, including uses not written yet
+
+        Args:
+            factoid (Factoid): The factoid to get the usage of
+
+        Returns:
+            tuple: The number of uses (int) and when it was last used (datetime)
+        """
+        row = await self.models.FactoidUsage.get(factoid.factoid_id)
+        uses = row.uses if row else 0
+        last_used = row.last_used if row else None
+
+        pending = self.factoid_usage.get(factoid.factoid_id)
+        if pending:
+            uses += pending["uses"]
+            last_used = pending["last_used"]
+
+        return uses, last_used
+
+    async def warm_factoid_embeds(self):
+        """Parses the embeds of the most used factoids ahead of their calls"""
+        try:
+            usage_rows = (
+                await self.models.FactoidUsage.query.order_by(
+                    self.models.FactoidUsage.uses.desc()
+                )
+                .limit(self.WARM_EMBED_COUNT)
+                .gino.all()
+            )
+        except Exception as e:
+            await self.bot.logger.warning(f"Could not load factoid usage: {e}")
+            return
+
+        for usage in usage_rows:
+            factoid = self.factoid_index.get_by_id(usage.factoid_id)
+            if factoid:
+                self.factoid_index.get_embed(factoid)
+
     async def send_to_irc(
         self, ctx: commands.Context, factoid_message: discord.Message
     ) -> None:
@@ -749,104 +1342,109 @@ class FactoidManager(base.MatchCog):
 
     # -- Factoid job related functions --
     async def kickoff_jobs(self):
-        """Gets a list of cron jobs and starts them"""
+        """Gets a list of cron jobs and schedules them"""
         jobs = await self.models.FactoidJob.query.gino.all()
         for job in jobs:
-            job_id = job.job_id
-            self.running_jobs[job_id] = {}
-
-            # This allows the task to be manually cancelled, preventing one more execution
-            task = asyncio.create_task(self.cronjob(job))
-            task = self.running_jobs[job_id]["task"] = task
-
-    async def cronjob(self, job, ctx: commands.Context = None):
-        """Run a cron job for a factoid
-
-        Args:
-            job (FactoidJob): The job to start
-            ctx (commands.Context): The context, used for logging
-        """
-        job_id = job.job_id
-        self.running_jobs[job_id]["job"] = job
-
-        while True:
-            job = self.running_jobs.get(job_id)["job"]
-            if not job:
-                from_db = await self.models.FactoidJob.query.where(
-                    self.models.FactoidJob.job_id == job_id
-                ).gino.first()
-                if not from_db:
-                    # This factoid job has been deleted from the DB
-                    await self.bot.logger.warning(
-                        f"Cron job {job} has failed - factoid has been deleted from"
-                        " the DB"
-                    )
-                    if ctx:
-                        await self.bot.guild_log(
-                            ctx.guild,
-                            "logging_channel",
-                            "error",
-                            f"Cron job {job} has failed - factoid has been deleted from"
-                            " the DB",
-                        )
-                    return
-                job = from_db
-                self.running_jobs[job_id]["job"] = job
+            await self.schedule_job(job)
 
-            try:
-                await aiocron.crontab(job.cron).next()
+    def get_job_key(self, job) -> tuple:
+        """Gets the key of a factoid job in the bot scheduler
+
+        Args:
+            job (FactoidJob): The job to get the key of
+
+        Returns:
+            tuple: The scheduler key
+        """
+        return ("factoid", job.job_id)
+
+    async def schedule_job(self, job):
+        """Adds a factoid job to the bot scheduler
+
+        Args:
+            job (FactoidJob): The job to schedule
+        """
+        try:
+            self.bot.scheduler.add(
+                self.get_job_key(job), job.cron, self.run_jobs, payload=job
+            )
+        except (CroniterBadCronError, ValueError) as e:
+            await self.bot.logger.error(
+                f"Could not schedule factoid job {job.job_id}", exception=e
+            )
+
+    async def cog_unload(self):
+        """Unschedules the factoid jobs along with the cog"""
+        await super().cog_unload()
+        for key in list(self.bot.scheduler.jobs):
+            if key[0] == "factoid":
+                self.bot.scheduler.remove(key)
+        await self.flush_usage()
+
+    async def run_jobs(self, jobs: list):
+        """Sends the factoids of the jobs that are due
+
+        Args:
+            jobs (list): The due jobs, whose factoids are loaded together
+        """
+        # The factoids come from the index, any that aren't there yet are loaded
+        # in a single query
+        factoid_ids = {
+            job.factoid for job in jobs if not self.factoid_index.get_by_id(job.factoid)
+        }
+        if factoid_ids:
+            for factoid in await self.models.Factoid.query.where(
+                self.models.Factoid.factoid_id.in_(factoid_ids)
+            ).gino.all():
+                self.factoid_index.add(factoid)
 
-            except CroniterBadCronError as e:
+        for job in jobs:
+            try:
+                await self.run_job(job)
+            except Exception as e:
                 await self.bot.logger.error(
-                    "Could not await cron completion", exception=e
+                    f"Could not run factoid job {job.job_id}", exception=e
                 )
-                if ctx:
-                    await self.bot.guild_log(
-                        ctx.guild,
-                        "logging_channel",
-                        "error",
-                        "Could not await cron job completion",
-                        exception=e,
-                    )
-                await asyncio.sleep(300)
 
-            factoid = await self.models.Factoid.query.where(
-                self.models.Factoid.factoid_id == job.factoid
-            ).gino.first()
-            if not factoid:
-                await self.bot.logger.warning(
-                    "Could not find factoid referenced by job - will retry after"
-                    " waiting"
-                )
-                continue
+    async def run_job(self, job):
+        """Sends the factoid of a job to its channel
 
-            # Get_embed accepts job as a factoid object
-            embed = self.get_embed_from_factoid(factoid)
-            content = factoid.message if not embed else None
+        Args:
+            job (FactoidJob): The due job
+        """
+        factoid = self.factoid_index.get_by_id(job.factoid)
+        if not factoid:
+            await self.bot.logger.warning(
+                "Could not find factoid referenced by job - will retry next time"
+            )
+            return
+
+        channel = self.bot.get_channel(int(job.channel))
+        if not channel:
+            await self.bot.logger.warning(
+                "Could not find channel to send factoid cronjob - will retry next time"
+            )
+            return
+
+        # Get_embed accepts job as a factoid object
+        embed = self.get_embed_from_factoid(factoid)
+        content = factoid.message if not embed else None
 
-            channel = self.bot.get_channel(int(job.channel))
-            if not channel:
-                await self.bot.logger.warning(
-                    "Could not find channel to send factoid cronjob - will retry after"
-                    " waiting"
-                )
-                continue
+        try:
+            await channel.send(content=content, embed=embed)
 
-            try:
-                await channel.send(content=content, embed=embed)
-
-            except discord.errors.HTTPException as e:
-                await self.bot.guild_log(
-                    ctx.guild,
-                    "logging_channel",
-                    "error",
-                    "Could not send looped factoid",
-                    exception=e,
-                )
-                # Sends the raw factoid instead of the embed as fallback
-                await channel.send(content=factoid.message)
+        except discord.errors.HTTPException as e:
+            await self.bot.guild_log(
+                channel.guild,
+                "logging_channel",
+                "error",
+                "Could not send looped factoid",
+                exception=e,
+            )
+            # Sends the raw factoid instead of the embed as fallback
+            await channel.send(content=factoid.message)
 
-            await self.send_to_irc(channel, factoid.message)
+        await self.send_to_irc(channel, factoid.message)
 
     @commands.group(
         brief="Executes a factoid command",
@@ -885,7 +1483,24 @@ class FactoidManager(base.MatchCog):
             await auxiliary.send_deny_embed(message=error_message, channel=ctx.channel)
             return
 
-        embed_config = await util.get_json_from_attachments(ctx.message, as_string=True)
+        try:
+            embed_config = await util.get_json_from_attachments(
+                ctx.message, as_string=True
+            )
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            await auxiliary.send_deny_embed(
+                message="The embed config is not valid JSON!", channel=ctx.channel
+            )
+            return
+
+        # Validated here so calling the factoid never runs into a bad embed
+        if embed_config:
+            error_message = self.check_valid_embed_config(embed_config)
+            if error_message is not None:
+                await auxiliary.send_deny_embed(
+                    message=error_message, channel=ctx.channel
+                )
+                return
 
         if not embed_config and not message:
             await auxiliary.send_deny_embed(
@@ -922,19 +1537,15 @@ class FactoidManager(base.MatchCog):
             factoid_name (str): Name of the factoid to remove
         """
 
+        # Aliases are looked up in the index, so it has to be complete
+        await self.ensure_factoid_index()
         factoid = await self.get_factoid(factoid_name, str(ctx.guild.id))
 
         if not await self.delete_factoid(ctx, factoid.name):
             return
 
         # Removes associated aliases as well
-        aliases = (
-            await self.models.Factoid.query.where(
-                self.models.Factoid.alias == factoid.name
-            )
-            .where(self.models.Factoid.guild == str(ctx.guild.id))
-            .gino.all()
-        )
+        aliases = self.factoid_index.get_aliases(str(ctx.guild.id), factoid.name)
         for alias in aliases:
             await self.delete_factoid_call(alias, str(ctx.guild.id))
 
@@ -985,7 +1596,7 @@ class FactoidManager(base.MatchCog):
         if not re.match(
             self.CRON_REGEX,
             cron_config,
-        ):
+        ) or not croniter.is_valid(cron_config):
             await auxiliary.send_deny_embed(
                 message=f"`{cron_config}` is not a valid cron configuration!",
                 channel=ctx.channel,
@@ -996,13 +1607,7 @@ class FactoidManager(base.MatchCog):
             factoid=factoid.factoid_id, channel=str(channel.id), cron=cron_config
         )
         await job.create()
-
-        job_id = job.job_id
-        self.running_jobs[job_id] = {}
-
-        # This allows the task to be manually cancelled, preventing one more execution
-        task = asyncio.create_task(self.cronjob(job, ctx))
-        self.running_jobs[job_id]["task"] = task
+        await self.schedule_job(job)
 
         await auxiliary.send_confirm_embed(
             message="Factoid loop created", channel=ctx.channel
@@ -1042,9 +1647,8 @@ class FactoidManager(base.MatchCog):
             )
             return
 
-        job_id = job.job_id
         # Stops the job
-        self.running_jobs[job_id]["task"].cancel()
+        self.bot.scheduler.remove(self.get_job_key(job))
         # Deletes it
         await job.delete()
 
@@ -1209,13 +1813,7 @@ class FactoidManager(base.MatchCog):
         embed = discord.Embed(title=f"Info about `{factoid.name.lower()}`")
 
         # Parses list of aliases into a neat string
-        aliases = (
-            await self.models.Factoid.query.where(
-                self.models.Factoid.alias == factoid.name
-            )
-            .where(self.models.Factoid.guild == str(ctx.guild.id))
-            .gino.all()
-        )
+        aliases = self.factoid_index.get_aliases(str(ctx.guild.id), factoid.name)
         # Awkward formatting of `, ` to save an if statement
         alias_list = "" if aliases else "None, "
         for alias in aliases:
@@ -1231,6 +1829,9 @@ class FactoidManager(base.MatchCog):
         embed.add_field(name="Embed", value=bool(factoid.embed_config))
         embed.add_field(name="Contents", value=factoid.message)
         embed.add_field(name="Date of creation", value=factoid.time)
+        uses, last_used = await self.get_usage(factoid)
+        embed.add_field(name="Uses", value=uses)
+        embed.add_field(name="Last used", value=last_used or "Never")
 
         if jobs:
             for job in jobs[:10]:
@@ -1252,7 +1853,9 @@ class FactoidManager(base.MatchCog):
         name="all",
         aliases=["lsf"],
         brief="List all factoids",
-        description="Sends a list of all factoids, can take a file and hidden flag.",
+        description=(
+            "Sends a list of all factoids, can take a file, json and hidden flag."
+        ),
         usage="[optional-flag]",
     )
     async def all_(self, ctx: commands.Context, *, flag: str = ""):
@@ -1261,6 +1864,7 @@ class FactoidManager(base.MatchCog):
         Args:
             ctx (commands.Context): Context of the invocation
             flag (str, optional): Can be "file", which will return a .yaml instead of a paste.
+                                  Can be "json", which will return a .json instead.
                                   Can also be "hidden", which will return only hidden factoids.
                                   Defaults to an empty string.
 
@@ -1271,51 +1875,50 @@ class FactoidManager(base.MatchCog):
         flags = flag.lower().split()
         guild = str(ctx.guild.id)
 
+        list_only_hidden = False
+        if "hidden" in flags:
+            if not ctx.author.guild_permissions.administrator:
+                raise commands.MissingPermissions(["administrator"])
+
+            list_only_hidden = True
+
+        # The export would be missing factoids until the index is loaded
+        await self.ensure_factoid_index()
+        version = self.factoid_index.get_version(guild)
+
         # Gets the url from the cache if the invokation doesn't contain flags
+        cached_url = self.factoid_all_cache.get(guild)
         if (
             "file" not in flags
-            and "hidden" not in flags
-            and guild in self.factoid_all_cache
+            and "json" not in flags
+            and not list_only_hidden
+            and cached_url
+            and cached_url["version"] == version
         ):
-            url = self.factoid_all_cache[guild]["url"]
-            await auxiliary.send_confirm_embed(message=url, channel=ctx.channel)
+            await auxiliary.send_confirm_embed(
+                message=cached_url["url"], channel=ctx.channel
+            )
             return
 
-        factoids = await self.get_all_factoids(guild, list_hidden=True)
-        if not factoids:
+        if not self.factoid_index.get_guild_factoids(guild):
             await auxiliary.send_deny_embed(
                 message="No factoids found!", channel=ctx.channel
             )
             return
 
-        # Gets a dict of aliases where
-        # Aliased_factoid = ["list_of_aliases"]
-        aliases = {}
-        for factoid in factoids:
-            if factoid.alias not in [None, ""]:
-                # Append to aliases
-                if factoid.alias in aliases:
-                    aliases[factoid.alias].append(factoid.name)
-                    continue
-
-                aliases[factoid.alias] = [factoid.name]
-
-        list_only_hidden = False
-        if "hidden" in flags:
-            if not ctx.author.guild_permissions.administrator:
-                raise commands.MissingPermissions(["administrator"])
-
-            list_only_hidden = True
-
-        if "file" in flags or not self.bot.file_config.main.api_url.linx:
+        if (
+            "file" in flags
+            or "json" in flags
+            or not self.bot.file_config.main.api_url.linx
+        ):
             await self.send_factoids_as_file(
-                ctx, factoids, aliases, list_only_hidden, flag
+                ctx, list_only_hidden, "json" if "json" in flags else "yaml"
             )
             return
 
         try:
             # -Tries calling the api-
-            html = await self.generate_html(ctx, factoids, aliases, list_only_hidden)
+            html = self.get_factoid_export(ctx, "html", list_only_hidden)
             # If there are no applicable factoids
             if html is None:
                 await auxiliary.send_deny_embed(
@@ -1342,8 +1945,7 @@ class FactoidManager(base.MatchCog):
 
             # Creates cache if hidden factoids weren't called
             if not list_only_hidden:
-                self.factoid_all_cache[str(ctx.guild.id)] = {}
-                self.factoid_all_cache[str(ctx.guild.id)]["url"] = url
+                self.factoid_all_cache[guild] = {"url": url, "version": version}
 
         # If an error happened while calling the api
         except (gaierror, InvalidURL) as e:
@@ -1355,72 +1957,93 @@ class FactoidManager(base.MatchCog):
                 exception=e,
             )
 
-            await self.send_factoids_as_file(
-                ctx, factoids, aliases, list_only_hidden, flag
-            )
+            await self.send_factoids_as_file(ctx, list_only_hidden, "yaml")
 
-    async def generate_html(
-        self,
-        ctx: commands.Context,
-        factoids: list,
-        aliases: dict,
-        list_only_hidden: bool,
+    def get_export_entries(self, guild: str, list_only_hidden: bool):
+        """Gets the factoids to export with their aliases, skipping the aliases themselves
+
+        Args:
+            guild (str): The id of the guild to export
+            list_only_hidden (bool): Whether to list only hidden factoids
+
+        Yields:
+            tuple: The factoid and a list of its alias names
+        """
+        for factoid in self.factoid_index.get_guild_factoids(guild):
+            if bool(factoid.hidden) != list_only_hidden:
+                continue
+            if factoid.alias not in [None, ""]:
+                continue
+            aliases = self.factoid_index.get_aliases(guild, factoid.name)
+            yield factoid, [alias.name for alias in aliases]
+
+    def get_factoid_export(
+        self, ctx: commands.Context, fmt: str, list_only_hidden: bool
     ) -> str:
-        """Method to generate the html file contents
+        """Gets the rendered factoid list, only rendering it again after a write
 
         Args:
-            ctx (commands.Context): The context, used for the guild name
-            factoids (list): List of all factoids
-            aliases (dict): A dictionary containing factoids and their aliases
+            ctx (commands.Context): The context, used for the guild
+            fmt (str): The format to render, one of html, yaml or json
             list_only_hidden (bool): Whether to list only hidden factoids
 
         Returns:
-            str - The result html file
+            str: The rendered factoid list, None if there are no factoids to list
         """
+        guild = str(ctx.guild.id)
+        version = self.factoid_index.get_version(guild)
+        # The guild name is part of the html, so a rename renders it again
+        key = (guild, ctx.guild.name, fmt, list_only_hidden)
+
+        cached = self.factoid_export_cache.get(key)
+        if cached and cached["version"] == version:
+            return cached["content"]
+
+        renderers = {
+            "html": self.generate_html,
+            "yaml": self.generate_yaml,
+            "json": self.generate_json,
+        }
+        content = renderers[fmt](ctx, self.get_export_entries(guild, list_only_hidden))
+        self.factoid_export_cache[key] = {"version": version, "content": content}
+        return content
 
-        body_contents = ""
-        for factoid in factoids:
-            if (
-                list_only_hidden
-                and not factoid.hidden
-                or not list_only_hidden
-                and factoid.hidden
-            ):
-                continue
+    def generate_html(self, ctx: commands.Context, entries) -> str:
+        """Method to generate the html file contents
+
+        Args:
+            ctx (commands.Context): The context, used for the guild name
+            entries (iterable): The factoids to list with their aliases
 
+        Returns:
+            str - The result html file
+        """
+        body = io.StringIO()
+        for factoid, aliases in entries:
             # Formatting
             embed_text = " (embed)" if factoid.embed_config else ""
+            alias_text = f" [{', '.join(aliases)}]" if aliases else ""
+            body.write(
+                f"<li><code>{factoid.name}{alias_text}{embed_text}"
+                + f" - {factoid.message}</code></li>"
+            )
 
-            # Skips aliases
-            if factoid.alias not in [None, ""]:
-                continue
-
-            # If aliased
-            if factoid.name in aliases:
-                body_contents += (
-                    f"<li><code>{factoid.name} [{', '.join(aliases[factoid.name])}]{embed_text}"
-                    + f" - {factoid.message}</code></li>"
-                )
-
-            # If not aliased
-            else:
-                body_contents += (
-                    f"<li><code>{factoid.name}{embed_text}"
-                    + f" - {factoid.message}</code></li>"
-                )
-        if body_contents == "":
+        if not body.tell():
             return None
 
-        body_contents = f"<ul>{body_contents}</ul>"
-        output = (
+        output = io.StringIO()
+        output.write(
             f"""
         <!DOCTYPE html>
         <html>
         <body>
         <h3>Factoids for {ctx.guild.name}</h3>
-        {body_contents}
-        <style>"""
-            + """
+        <ul>"""
+        )
+        output.write(body.getvalue())
+        output.write(
+            """</ul>
+        <style>
         ul {
             display: table;
             width: auto;
@@ -1438,70 +2061,229 @@ class FactoidManager(base.MatchCog):
         </html>
         """
         )
-        return output
+        return output.getvalue()
 
-    async def send_factoids_as_file(
-        self,
-        ctx: commands.Context,
-        factoids: list,
-        aliases: dict,
-        list_only_hidden: bool,
-        flag: str,
-    ):
-        """Method to send the factoid list as a file instead of a paste
+    def get_export_data(self, factoid, aliases: list) -> dict:
+        """Gets the data of a factoid in the file export
 
         Args:
-            ctx (commands.Context): The context, used for the guild id
-            factoids (list): List of all factoids
-            aliases (dict): A dictionary containing factoids and their aliases
-            list_only_hidden (bool): Whether to list only hidden factoids
-            flag (str): The flags passed to the command itself, passed for caching
+            factoid (Factoid): The factoid to export
+            aliases (list): The names of its aliases
+
+        Returns:
+            dict: The factoid name mapped to its data
         """
+        data = {"message": factoid.message, "embed": bool(factoid.embed_config)}
+        if aliases:
+            data["aliases"] = ", ".join(aliases)
+        # Lets the file be imported again without losing anything
+        if factoid.embed_config:
+            data["embed_config"] = factoid.embed_config
+        if factoid.hidden:
+            data["hidden"] = True
+        return {factoid.name: data}
 
-        output_data = []
-        for factoid in factoids:
-            # Handles hidden factoids
-            if (
-                list_only_hidden
-                and not factoid.hidden
-                or not list_only_hidden
-                and factoid.hidden
-            ):
-                continue
+    def generate_yaml(self, _: commands.Context, entries) -> str:
+        """Method to generate the yaml file contents, one list item at a time
 
-            # Skips aliases
-            if factoid.alias not in [None, ""]:
-                continue
+        Args:
+            _ (commands.Context): Context, not used
+            entries (iterable): The factoids to list with their aliases
 
-            # If not aliased
-            if factoid.name in aliases:
-                data = {
-                    "message": factoid.message,
-                    "embed": bool(factoid.embed_config),
-                    "aliases": ", ".join(aliases[factoid.name]),
-                }
+        Returns:
+            str: The yaml list of factoids, None if there are none
+        """
+        output = io.StringIO()
+        for factoid, aliases in entries:
+            yaml.dump([self.get_export_data(factoid, aliases)], output)
+        return output.getvalue() or None
+
+    def generate_json(self, _: commands.Context, entries) -> str:
+        """Method to generate the json file contents, one list item at a time
+
+        Args:
+            _ (commands.Context): Context, not used
+            entries (iterable): The factoids to list with their aliases
 
-            # If aliased
-            else:
-                data = {"message": factoid.message, "embed": bool(factoid.embed_config)}
+        Returns:
+            str: The json list of factoids, None if there are none
+        """
+        output = io.StringIO()
+        for factoid, aliases in entries:
+            output.write("[\n" if not output.tell() else ",\n")
+            output.write(json.dumps(self.get_export_data(factoid, aliases)))
+        if not output.tell():
+            return None
+        output.write("\n]\n")
+        return output.getvalue()
 
-            output_data.append({factoid.name: data})
+    async def send_factoids_as_file(
+        self, ctx: commands.Context, list_only_hidden: bool, fmt: str
+    ):
+        """Method to send the factoid list as a file instead of a paste
 
-        if not output_data:
+        Args:
+            ctx (commands.Context): The context, used for the guild id
+            list_only_hidden (bool): Whether to list only hidden factoids
+            fmt (str): The file format, yaml or json
+        """
+        content = self.get_factoid_export(ctx, fmt, list_only_hidden)
+        if not content:
             await auxiliary.send_deny_embed(
                 message="No factoids found!", channel=ctx.channel
             )
             return
 
-        yaml_file = discord.File(
-            io.StringIO(yaml.dump(output_data)),
+        export_file = discord.File(
+            io.StringIO(content),
             filename=(
-                f"factoids-for-server-{ctx.guild.id}-{datetime.datetime.utcnow()}.yaml"
+                f"factoids-for-server-{ctx.guild.id}-{datetime.datetime.utcnow()}.{fmt}"
             ),
         )
 
         # Sends the file
-        await ctx.send(file=yaml_file)
+        await ctx.send(file=export_file)
+
+    def get_import_rows(self, guild: str, data) -> tuple:
+        """Validates a factoid file export and turns it into rows to insert
+
+        Every check, including alias recursion, is done in memory against the whole
+        file and the factoid index, so one bad entry doesn't stop the rest.
+
+        Args:
+            guild (str): The id of the guild to import to
+            data (list | dict): The parsed file, a list of {name: data} items
+                                like the file export, or a {name: data} mapping
+
+        Returns:
+            tuple: The rows to insert (list), the reasons entries were skipped (list)
+        """
+        if isinstance(data, dict):
+            data = [{name: value} for name, value in data.items()]
+        if not isinstance(data, list):
+            return [], ["The file must contain a list of factoids"]
+
+        entries = {}
+        errors = []
+        for item in data:
+            if not isinstance(item, dict):
+                errors.append(f"Skipped an entry that isn't a factoid: `{item}`")
+                continue
+            for name, value in item.items():
+                name = str(name).lower()
+                if name in entries:
+                    errors.append(f"`{name}`: listed more than once")
+                    continue
+                entries[name] = value if isinstance(value, dict) else {}
+
+        rows = []
+        parents = set()
+        for name, value in entries.items():
+            message = str(value.get("message") or "")
+            embed_config = value.get("embed_config") or ""
+            if isinstance(embed_config, (dict, list)):
+                embed_config = json.dumps(embed_config)
+
+            error_message = self.check_import_entry(guild, name, message, embed_config)
+            if error_message:
+                errors.append(f"`{name}`: {error_message}")
+                continue
+
+            parents.add(name)
+            rows.append(
+                {
+                    "name": name,
+                    "guild": guild,
+                    "message": message or None,
+                    "embed_config": embed_config,
+                    "hidden": bool(value.get("hidden", False)),
+                    "alias": None,
+                }
+            )
+
+        aliased = set()
+        for parent in [row["name"] for row in rows]:
+            aliases = entries[parent].get("aliases") or []
+            if isinstance(aliases, str):
+                aliases = aliases.split(",")
+            for alias in aliases:
+                alias = str(alias).strip().lower()
+                if not alias:
+                    continue
+                # An alias can't be a factoid itself or point at two parents,
+                # which is what keeps aliases from ever forming a chain
+                if alias in parents or alias in aliased:
+                    errors.append(f"`{alias}`: alias of `{parent}` is already used")
+                elif self.factoid_index.get(guild, alias):
+                    errors.append(f"`{alias}`: alias of `{parent}` already exists")
+                elif " " in alias or re.search(r"<[^>]+>", alias):
+                    errors.append(f"`{alias}`: alias of `{parent}` is not a valid name")
+                else:
+                    aliased.add(alias)
+                    rows.append(
+                        {
+                            "name": alias,
+                            "guild": guild,
+                            "message": "",
+                            "embed_config": "",
+                            "hidden": False,
+                            "alias": parent,
+                        }
+                    )
+
+        return rows, errors
+
+    def check_import_entry(
+        self, guild: str, name: str, message: str, embed_config: str
+    ) -> str:
+        """Makes sure an imported factoid is valid and doesn't exist yet
+
+        Args:
+            guild (str): The id of the guild to import to
+            name (str): The lowercase factoid name
+            message (str): The factoid message
+            embed_config (str): The embed config JSON
+
+        Returns:
+            str: The error message
+        """
+        if " " in name or re.search(r"<[^>]+>", name + message):
+            return "name has spaces or contents have HTML tags"
+        if self.factoid_index.get(guild, name):
+            return "already exists"
+        if not message and not embed_config:
+            return "no message or embed config"
+        if len(message) > 2000:
+            return "message is over 2000 characters"
+        if embed_config:
+            return self.check_valid_embed_config(embed_config)
+        return None
+
+    async def import_factoids(self, rows: list) -> list:
+        """Inserts factoids with multi-row inserts in a single transaction
+
+        Args:
+            rows (list): The validated factoid rows
+
+        Returns:
+            list: The created factoids
+        """
+        factoids = []
+        async with self.bot.db.transaction():
+            for i in range(0, len(rows), self.IMPORT_CHUNK_SIZE):
+                factoids.extend(
+                    await self.models.Factoid.insert()
+                    .values(rows[i : i + self.IMPORT_CHUNK_SIZE])
+                    .returning(*self.models.Factoid.__table__.columns)
+                    .gino.load(self.models.Factoid)
+                    .all()
+                )
+
+        # Only added once everything is committed
+        for factoid in factoids:
+            self.factoid_index.add(factoid)
+
+        return factoids
 
     @util.with_typing
     @commands.guild_only()
@@ -1527,56 +2309,46 @@ class FactoidManager(base.MatchCog):
             )
             return
 
-        factoids = await self.get_all_factoids(str(ctx.guild.id))
-        # Makes query lowercase, makes sure you can't search for JSON elements
-        embed = discord.Embed(color=discord.Color.green())
-        num_of_matches = 0
-
-        # - Name matches -
-        name_matches = "`"
-        for factoid in factoids:
-            # Hard limit of 10
-            if num_of_matches > 10:
-                name_matches = name_matches[:-2] + " more...---"
-                break
-
-            if not factoid.alias and query in factoid.name.lower():
-                name_matches += f"{factoid.name}`, `"
-                num_of_matches += 1
+        # Search results would be missing factoids until the index is loaded
+        await self.ensure_factoid_index()
 
-        if name_matches == "`":
-            name_matches = "No matches found!, `"
-
-        # Adds name matches to the embed
-        embed.add_field(name="Name matches", value=name_matches[:-3], inline=False)
-
-        # - Content matches -
-        num_of_matches = 0
-        content_matches = "`"
-        for factoid in factoids:
-            # Hard limit of 10
-            if num_of_matches > 10:
-                content_matches = content_matches[:-2] + " more...---"
-                break
-
-            if factoid.embed_config is not None and (
-                any(word in factoid.embed_config.lower() for word in query.split())
-                or any(word in factoid.message.lower() for word in query.split())
-            ):
-                content_matches += f"{factoid.name}`, `"
-                num_of_matches += 1
-
-        if content_matches == "`":
-            content_matches = "No matches found!   "
-
-        # Adds content matches to the embed
+        guild = str(ctx.guild.id)
+        embed = discord.Embed(color=discord.Color.green())
+        embed.add_field(
+            name="Name matches",
+            value=self.format_search_matches(
+                self.factoid_index.search.search_names(guild, query)
+            ),
+            inline=False,
+        )
         embed.add_field(
-            name="Content matches", value=content_matches[:-3], inline=False
+            name="Content matches",
+            value=self.format_search_matches(
+                self.factoid_index.search.search_content(guild, query)
+            ),
+            inline=False,
         )
 
         # Finally, send the embed
         await ctx.send(embed=embed)
 
+    def format_search_matches(self, names: list) -> str:
+        """Formats search results for an embed field, with a hard limit of 10
+
+        Args:
+            names (list): The matching names, best match first
+
+        Returns:
+            str: The formatted matches
+        """
+        if not names:
+            return "No matches found!"
+
+        matches = ", ".join(f"`{name}`" for name in names[:10])
+        if len(names) > 10:
+            matches += " more..."
+        return matches
+
     @util.with_typing
     @commands.check(has_manage_factoids_role)
     @commands.guild_only()
@@ -1670,6 +2442,8 @@ class FactoidManager(base.MatchCog):
         # Makes factoids caps insensitive
 
         # Gets the parent factoid
+        # Aliases are looked up in the index, so it has to be complete
+        await self.ensure_factoid_index()
         factoid = await self.get_factoid(factoid_name, str(ctx.guild.id))
 
         # Stops execution if the target is in the alias list already
@@ -1718,12 +2492,8 @@ class FactoidManager(base.MatchCog):
                 # be more dangerous.
 
                 # Gets list of all aliases
-                aliases = (
-                    await self.models.Factoid.query.where(
-                        self.models.Factoid.alias == target_entry.name
-                    )
-                    .where(self.models.Factoid.guild == str(ctx.guild.id))
-                    .gino.all()
+                aliases = self.factoid_index.get_aliases(
+                    str(ctx.guild.id), target_entry.name
                 )
 
                 # Don't make new parent if there isn't an alias for it
@@ -1780,6 +2550,8 @@ class FactoidManager(base.MatchCog):
             replacement_name (str, optional): Name of new parent. Defaults to None.
         """
 
+        # Aliases are looked up in the index, so it has to be complete
+        await self.ensure_factoid_index()
         factoid = await self.get_factoid(factoid_name, str(ctx.guild.id))
 
         # -- Handling for aliases  --
@@ -1799,13 +2571,7 @@ class FactoidManager(base.MatchCog):
         # -- Handling for parents --
 
         # Gets list of aliases
-        aliases = (
-            await self.models.Factoid.query.where(
-                self.models.Factoid.alias == factoid_name
-            )
-            .where(self.models.Factoid.guild == str(ctx.guild.id))
-            .gino.all()
-        )
+        aliases = self.factoid_index.get_aliases(str(ctx.guild.id), factoid_name)
         # Stop execution if there is no other parent to be assigned
         if len(aliases) == 0:
             await auxiliary.send_deny_embed(
@@ -1874,13 +2640,129 @@ class FactoidManager(base.MatchCog):
                 )
                 await new_job.create()
 
-                job_id = new_job.job_id
-                self.running_jobs[job_id] = {}
-                self.running_jobs[job_id]["job"] = new_job
-
                 # Starts the new job
-                task = asyncio.create_task(self.cronjob(new_job, ctx))
-                self.running_jobs[job_id]["task"] = task
+                await self.schedule_job(new_job)
+
+    @util.with_typing
+    @commands.guild_only()
+    @factoid.command(
+        brief="Lists the most used factoids",
+        description="Lists the factoids that were called the most in this server",
+        usage="[optional-count]",
+    )
+    async def top(self, ctx: commands.Context, count: int = 10):
+        """Command to list the most used factoids
+
+        Args:
+            ctx (commands.Context): Context of the invokation
+            count (int, optional): How many factoids to list, up to 25. Defaults to 10.
+        """
+        count = min(max(count, 1), 25)
+        # Includes the latest calls
+        await self.flush_usage()
+
+        usage_table = self.models.FactoidUsage
+        factoid_table = self.models.Factoid
+        usage_rows = await self.bot.db.all(
+            self.bot.db.select(
+                [usage_table.factoid_id, usage_table.uses, usage_table.last_used]
+            )
+            .select_from(
+                usage_table.join(
+                    factoid_table,
+                    usage_table.factoid_id == factoid_table.factoid_id,
+                )
+            )
+            .where(factoid_table.guild == str(ctx.guild.id))
+            .where(factoid_table.hidden.isnot(True))
+            .order_by(usage_table.uses.desc())
+            .limit(count)
+        )
+
+        lines = []
+        for factoid_id, uses, last_used in usage_rows:
+            factoid = self.factoid_index.get_by_id(factoid_id)
+            if not factoid:
+                continue
+            lines.append(
+                f"{len(lines) + 1}. `{factoid.name}` - {uses} uses"
+                + f" (last used {last_used:%Y-%m-%d})"
+            )
+
+        if not lines:
+            await auxiliary.send_deny_embed(
+                message="No factoids have been used yet!", channel=ctx.channel
+            )
+            return
+
+        embed = auxiliary.generate_basic_embed(
+            title="Most used factoids",
+            description="\n".join(lines),
+            color=discord.Color.green(),
+        )
+        await ctx.send(embed=embed)
+
+    @util.with_typing
+    @commands.has_permissions(administrator=True)
+    @commands.check(has_manage_factoids_role)
+    @commands.guild_only()
+    @factoid.command(
+        name="import",
+        brief="Imports factoids from a file",
+        description=(
+            "Imports the factoids of a yaml or json file from factoid all,"
+            " existing factoids are never overwritten"
+        ),
+    )
+    async def import_(self, ctx: commands.Context):
+        """Command to add every factoid from an attached file at once
+
+        Args:
+            ctx (commands.Context): Context of the invokation
+        """
+        if not ctx.message.attachments:
+            await auxiliary.send_deny_embed(
+                message="Please attach the yaml or json file to import!",
+                channel=ctx.channel,
+            )
+            return
+
+        try:
+            # Json is valid yaml, so this reads both
+            data = yaml.safe_load(await ctx.message.attachments[0].read())
+        except (yaml.YAMLError, UnicodeDecodeError):
+            await auxiliary.send_deny_embed(
+                message="I couldn't read that file as yaml or json!",
+                channel=ctx.channel,
+            )
+            return
+
+        # Existing factoids have to be known to not overwrite them
+        await self.ensure_factoid_index()
+
+        rows, errors = self.get_import_rows(str(ctx.guild.id), data)
+        if rows:
+            await self.import_factoids(rows)
+
+        embed = auxiliary.generate_basic_embed(
+            title="Factoid import",
+            description=f"Imported {len(rows)} factoids and aliases",
+            color=discord.Color.green() if rows else discord.Color.red(),
+        )
+        if errors:
+            skipped = "\n".join(errors[:10])
+            if len(errors) > 10:
+                skipped += f"\n{len(errors) - 10} more..."
+            embed.add_field(name=f"Skipped ({len(errors)})", value=skipped[:1024])
+        await ctx.send(embed=embed)
+
+        await self.bot.guild_log(
+            ctx.guild,
+            "logging_channel",
+            "info",
+            f"Imported {len(rows)} factoids (triggered by {ctx.author})",
+            send=True,
+        )
 
     @util.with_typing
     @commands.has_permissions(administrator=True)
@@ -1896,8 +2778,10 @@ class FactoidManager(base.MatchCog):
         Args:
             ctx (commands.Context): Context of the invokation
         """
-        self.factoid_cache.clear()  # Factoid execution cache
         self.factoid_all_cache.clear()  # Factoid all URL cache
+        self.factoid_export_cache.clear()  # Factoid all export cache
+        self.factoid_index.clear()  # Factoid execution index
+        await self.load_factoid_index()
 
         await auxiliary.send_confirm_embed(
             message=f"Factoid caches for `{str(ctx.guild.id)}` succesfully flushed!",
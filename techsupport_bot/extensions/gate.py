@@ -80,6 +80,14 @@ class WelcomeEmbed(discord.Embed):
 class ServerGate(base.MatchCog):
     """Class to get the server gate from config."""
 
+    GUILD_ONLY = True
+
+    def match_channels(self, config):
+        """Method to only match in the gate channel."""
+        if not config.extensions.gate.channel.value:
+            return []
+        return [config.extensions.gate.channel.value]
+
     async def match(self, config, ctx, _):
         """Method to match the gate channel."""
         if not config.extensions.gate.channel.value:
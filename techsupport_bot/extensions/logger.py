@@ -65,6 +65,10 @@ class LogEmbed(discord.Embed):
 class Logger(base.MatchCog):
     """Class for the logger to make it to discord."""
 
+    def match_channels(self, config):
+        """Method to only match in the mapped channels."""
+        return config.extensions.logger.channel_map.value.keys()
+
     async def match(self, config, ctx, _):
         """Method to match the logging channel to the map."""
         if isinstance(ctx.channel, discord.Thread):
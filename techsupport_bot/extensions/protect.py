@@ -1,7 +1,12 @@
 """Module for the protect extension of the discord bot."""
+import asyncio
+import collections
 import datetime
+import functools
 import io
+import multiprocessing
 import re
+import time
 from datetime import timedelta
 
 import base
@@ -16,15 +21,7 @@ from discord.ext import commands
 async def setup(bot):
     """Class to set up the protect options in the config file."""
 
-    class Warning(bot.db.Model):
-        """Class to set up warnings for the config file."""
-
-        __tablename__ = "warnings"
-        pk = bot.db.Column(bot.db.Integer, primary_key=True)
-        user_id = bot.db.Column(bot.db.String)
-        guild_id = bot.db.Column(bot.db.String)
-        reason = bot.db.Column(bot.db.String)
-        time = bot.db.Column(bot.db.DateTime, default=datetime.datetime.utcnow)
+    Warning = bot.warning_store.get_model()
 
     config = bot.ExtensionConfig()
     config.add(
@@ -153,6 +150,423 @@ class ProtectEmbed(discord.Embed):
         self.color = discord.Color.gold()
 
 
+class KeywordAutomaton:
+    """Class to find every keyword in a message in one pass (Aho-Corasick)."""
+
+    def __init__(self, keywords):
+        # each node is a dict of transitions, with its fail link and outputs
+        self.transitions = [{}]
+        self.fail = [0]
+        self.outputs = [set()]
+        for index, keyword in keywords:
+            self.add(index, keyword)
+        self.build()
+
+    def __bool__(self):
+        return len(self.transitions) > 1
+
+    def add(self, index, keyword):
+        """Method to add a keyword to the trie, with the rule index it belongs to."""
+        node = 0
+        for char in keyword:
+            next_node = self.transitions[node].get(char)
+            if next_node is None:
+                next_node = len(self.transitions)
+                self.transitions[node][char] = next_node
+                self.transitions.append({})
+                self.fail.append(0)
+                self.outputs.append(set())
+            node = next_node
+        self.outputs[node].add(index)
+
+    def build(self):
+        """Method to link every node to the longest suffix that is also in the trie."""
+        queue = collections.deque(self.transitions[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, next_node in self.transitions[node].items():
+                queue.append(next_node)
+                fail = self.fail[node]
+                while fail and char not in self.transitions[fail]:
+                    fail = self.fail[fail]
+                self.fail[next_node] = self.transitions[fail].get(char, 0)
+                self.outputs[next_node] |= self.outputs[self.fail[next_node]]
+
+    def search(self, content):
+        """Method to get the rule indexes of every keyword in the content."""
+        found = set()
+        node = 0
+        transitions = self.transitions
+        for char in content:
+            while node and char not in transitions[node]:
+                node = self.fail[node]
+            node = transitions[node].get(char, 0)
+            if self.outputs[node]:
+                found |= self.outputs[node]
+        return found
+
+
+class ProtectRuleSet:
+    """Class for the compiled string map of a guild.
+
+    Literal keywords are combined into one automaton for case sensitive
+    and one for case insensitive rules. Regexes are compiled once and put
+    behind a combined alternation, so a message matching none of them is
+    searched once. Bad patterns are kept in errors instead of being retried.
+    """
+
+    def __init__(self, config):
+        self.config = config
+        self.version = config.get("config_version")
+        self.string_map = config.extensions.protect.string_map.value
+        self.rules = []
+        self.regexes = []
+        self.errors = []
+
+        keywords = []
+        insensitive_keywords = []
+        for index, (keyword, filter_config) in enumerate(self.string_map.items()):
+            filter_config = munch.munchify(filter_config)
+            filter_config["trigger"] = keyword
+            self.rules.append(filter_config)
+
+            regex = filter_config.get("regex")
+            if regex:
+                try:
+                    self.regexes.append((index, re.compile(regex)))
+                except re.error as exception:
+                    self.errors.append(f"{keyword}: {exception}")
+            # the "sensitive" option makes the keyword case insensitive
+            elif filter_config.get("sensitive"):
+                insensitive_keywords.append((index, keyword.lower()))
+            else:
+                keywords.append((index, keyword))
+
+        self.automaton = KeywordAutomaton(keywords)
+        self.insensitive_automaton = KeywordAutomaton(insensitive_keywords)
+        self.combined_regex = self.combine_regexes()
+
+    def combine_regexes(self):
+        """Method to join the regexes that can be searched for as one alternation."""
+        # group references would point at the wrong group once combined
+        patterns = [
+            f"(?:{pattern.pattern})"
+            for _, pattern in self.regexes
+            if not pattern.groups
+        ]
+        if len(patterns) != len(self.regexes) or not patterns:
+            return None
+        try:
+            return re.compile("|".join(patterns))
+        except re.error:
+            return None
+
+    def is_current(self, config):
+        """Method to check if the rules were compiled from this version of the config."""
+        return (
+            config.get("config_version") == self.version
+            and config.extensions.protect.string_map.value is self.string_map
+        )
+
+    def search_keywords(self, content):
+        """Method to get the indexes of the keyword rules the content triggers."""
+        matched = self.automaton.search(content) if self.automaton else set()
+        if self.insensitive_automaton:
+            matched |= self.insensitive_automaton.search(content.lower())
+        return matched
+
+    def search(self, content):
+        """Method to get the rule the content triggers, running the regexes inline."""
+        matched = self.search_keywords(content)
+        matched.update(
+            run_protect_regexes(self.regexes, self.combined_regex, content)[0]
+        )
+        return self.get_triggered_config(matched)
+
+    def get_triggered_config(self, matched):
+        """Method to get the first deleting rule out of the matched rule indexes,
+        otherwise the last rule matched."""
+        triggered_config = None
+        for index in sorted(matched):
+            triggered_config = self.rules[index]
+            if triggered_config.get("delete"):
+                return triggered_config
+        return triggered_config
+
+
+def run_protect_regexes(regexes, combined_regex, content):
+    """Function to run regex rules against the content, timing each of them.
+    This runs in the sandbox processes, so it has to stay at the module level."""
+    if not regexes or combined_regex and not combined_regex.search(content):
+        return [], {}
+    matched = []
+    durations = {}
+    for index, pattern in regexes:
+        start = time.perf_counter()
+        if pattern.search(content):
+            matched.append(index)
+        durations[index] = time.perf_counter() - start
+    return matched, durations
+
+
+class RuleProfile:
+    """Class for the match times of a single protect regex."""
+
+    SAMPLE_SIZE = 1000
+
+    def __init__(self):
+        self.samples = collections.deque(maxlen=self.SAMPLE_SIZE)
+        self.timeouts = 0
+
+    @property
+    def average(self):
+        """Method to get the average match time in seconds."""
+        return sum(self.samples) / len(self.samples) if self.samples else 0.0
+
+    @property
+    def p99(self):
+        """Method to get the 99th percentile match time in seconds."""
+        if not self.samples:
+            return 0.0
+        samples = sorted(self.samples)
+        return samples[min(len(samples) - 1, int(len(samples) * 0.99))]
+
+
+class SandboxPoolReplaced(Exception):
+    """Class for when the sandbox pool a regex run was queued in is replaced."""
+
+
+class RegexSandbox:
+    """Class to run protect regexes in a process pool with a time budget.
+
+    The re module holds the GIL while matching, so a thread can't protect the
+    event loop from a pattern that backtracks forever. Messages share one pool.
+    The first message to blow the budget owns the timeout: it replaces the pool
+    and runs each of its regexes alone in a single isolation process, so only
+    a regex that is slow by itself gets a strike. The other messages that were
+    in the replaced pool are retried in the new one. A rule with enough recent
+    strikes is quarantined.
+    """
+
+    # the processes are started from a clean server instead of forking the bot
+    START_METHOD = "forkserver"
+    MAX_ATTEMPTS = 3
+
+    def __init__(self, workers, budget, strikes, offence_seconds=86400):
+        self.workers = workers
+        self.budget = budget
+        self.strikes = strikes
+        self.offence_seconds = offence_seconds
+        self.pool = None
+        # bumped every time the shared pool is replaced
+        self.generation = 0
+        # the runs waiting on the shared pool, told when it is replaced
+        self.pending = set()
+        self.pool_lock = asyncio.Lock()
+        self.isolation_pool = None
+        self.isolation_lock = asyncio.Lock()
+        self.profiles = {}
+        self.offences = {}
+        self.quarantined = set()
+
+    @staticmethod
+    def get_rule_key(rule_set, index):
+        """Method to get the key of a regex rule, which changes with its pattern."""
+        rule = rule_set.rules[index]
+        return (rule_set.config.guild_id, rule.trigger, rule.regex)
+
+    @classmethod
+    def create_pool(cls, processes):
+        """Method to create a process pool, waiting until its workers have
+        imported this module so that doesn't count against the budget."""
+        if cls.START_METHOD in multiprocessing.get_all_start_methods():
+            context = multiprocessing.get_context(cls.START_METHOD)
+            # the server imports this module once, so new workers start quickly
+            context.set_forkserver_preload([__name__])
+        else:
+            context = multiprocessing.get_context("spawn")
+        pool = context.Pool(processes=processes)
+        pool.starmap(run_protect_regexes, [([], None, "")] * processes, chunksize=1)
+        return pool
+
+    @classmethod
+    async def start_pool(cls, processes):
+        """Method to start a process pool without blocking the event loop."""
+        return await asyncio.get_running_loop().run_in_executor(
+            None, functools.partial(cls.create_pool, processes)
+        )
+
+    @staticmethod
+    async def terminate_pool(pool):
+        """Method to kill a process pool without blocking the event loop,
+        since terminating joins the workers."""
+        await asyncio.get_running_loop().run_in_executor(None, pool.terminate)
+
+    async def get_pool(self):
+        """Method to get the shared pool, its generation and its pending runs,
+        starting it if needed."""
+        async with self.pool_lock:
+            if not self.pool:
+                self.pool = await self.start_pool(self.workers)
+            return self.pool, self.generation, self.pending
+
+    async def replace_pool(self, generation):
+        """Method to kill the shared pool if it's still the given generation,
+        returning True if it was. The runs pending in it are told to retry."""
+        if not self.pool or generation != self.generation:
+            return False
+        pool, self.pool = self.pool, None
+        pending, self.pending = self.pending, set()
+        self.generation += 1
+        for future in pending:
+            if not future.done():
+                future.set_exception(SandboxPoolReplaced())
+        await self.terminate_pool(pool)
+        return True
+
+    async def close(self):
+        """Method to kill the sandbox processes, along with anything stuck in them."""
+        await self.replace_pool(self.generation)
+        if self.isolation_pool:
+            pool, self.isolation_pool = self.isolation_pool, None
+            await self.terminate_pool(pool)
+
+    async def apply(self, pool, regexes, combined_regex, content, pending=None):
+        """Method to run regexes in a pool, returning None if they ran out of time.
+        If pending is given, the run is added to it while it waits."""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+
+        def set_result(result):
+            if not future.done():
+                future.set_result(result)
+
+        def set_exception(exception):
+            if not future.done():
+                future.set_exception(exception)
+
+        try:
+            pool.apply_async(
+                run_protect_regexes,
+                (regexes, combined_regex, content),
+                callback=lambda result: loop.call_soon_threadsafe(set_result, result),
+                error_callback=lambda error: loop.call_soon_threadsafe(
+                    set_exception, error
+                ),
+            )
+        except ValueError as exception:
+            # the pool isn't running anymore
+            raise SandboxPoolReplaced() from exception
+
+        if pending is not None:
+            pending.add(future)
+        try:
+            return await asyncio.wait_for(future, self.budget)
+        except asyncio.TimeoutError:
+            return None
+        finally:
+            if pending is not None:
+                pending.discard(future)
+
+    async def run(self, regexes, combined_regex, content):
+        """Method to run regexes in the shared pool, returning the result, or None
+        if they ran out of time, and True if this run owned the timeout.
+        A run that loses its pool to another message's timeout is retried."""
+        for _ in range(self.MAX_ATTEMPTS):
+            pool, generation, pending = await self.get_pool()
+            try:
+                result = await self.apply(
+                    pool, regexes, combined_regex, content, pending
+                )
+            except SandboxPoolReplaced:
+                continue
+            if result is not None:
+                return result, False
+            if await self.replace_pool(generation):
+                return None, True
+            # another message timed out first and replaced the pool
+        return None, False
+
+    async def run_alone(self, index, pattern, content):
+        """Method to run a single regex in the isolation process, so a timeout
+        can only be caused by that regex. Isolation runs take turns, and the
+        process is only replaced when a regex times out in it."""
+        async with self.isolation_lock:
+            if not self.isolation_pool:
+                self.isolation_pool = await self.start_pool(1)
+            result = await self.apply(
+                self.isolation_pool, [(index, pattern)], None, content
+            )
+            if result is None:
+                pool, self.isolation_pool = self.isolation_pool, None
+                await self.terminate_pool(pool)
+            return result
+
+    def add_offence(self, key):
+        """Method to give a rule a strike, returning True if it has enough
+        strikes from the last offence_seconds to be quarantined."""
+        now = time.monotonic()
+        offences = self.offences.setdefault(key, collections.deque())
+        offences.append(now)
+        while now - offences[0] > self.offence_seconds:
+            offences.popleft()
+        return len(offences) >= self.strikes
+
+    async def search(self, rule_set, content):
+        """Method to get the indexes of the regex rules the content triggers,
+        and the keys of any rules quarantined while doing so."""
+        regexes = [
+            (index, pattern)
+            for index, pattern in rule_set.regexes
+            if self.get_rule_key(rule_set, index) not in self.quarantined
+        ]
+        if not regexes:
+            return set(), []
+        # the combined regex would still run quarantined patterns
+        combined_regex = (
+            rule_set.combined_regex if len(regexes) == len(rule_set.regexes) else None
+        )
+
+        result, owned = await self.run(regexes, combined_regex, content)
+        if result:
+            matched, durations = result
+            self.record(rule_set, durations)
+            return set(matched), []
+        if not owned:
+            # the pool kept being replaced by the timeouts of other messages
+            return set(), []
+
+        matched = set()
+        quarantined = []
+        for index, pattern in regexes:
+            key = self.get_rule_key(rule_set, index)
+            result = await self.run_alone(index, pattern, content)
+            if result:
+                matched.update(result[0])
+                self.record(rule_set, result[1])
+                continue
+            self.profiles.setdefault(key, RuleProfile()).timeouts += 1
+            if self.add_offence(key):
+                self.quarantined.add(key)
+                quarantined.append(key)
+        return matched, quarantined
+
+    def record(self, rule_set, durations):
+        """Method to add match times to the rule profiles."""
+        for index, duration in durations.items():
+            key = self.get_rule_key(rule_set, index)
+            self.profiles.setdefault(key, RuleProfile()).samples.append(duration)
+
+    def get_guild_profiles(self, guild_id):
+        """Method to get the profiles of the rules of a guild, slowest first."""
+        profiles = [
+            (key, profile)
+            for key, profile in self.profiles.items()
+            if key[0] == guild_id
+        ]
+        return sorted(profiles, key=lambda item: item[1].p99, reverse=True)
+
+
 class Protector(base.MatchCog):
     """Class for the protector command."""
 
@@ -164,12 +578,41 @@ class Protector(base.MatchCog):
         "https://icon-icons.com/icons2/203/PNG/128/diagram-30_24487.png"
     )
     CHARS_PER_NEWLINE = 80
+    REGEX_WORKERS = 2
+    REGEX_BUDGET_SECONDS = 0.5
+    REGEX_QUARANTINE_STRIKES = 3
 
     async def preconfig(self):
         """Method to preconfig the protect."""
         self.string_alert_cache = expiringdict.ExpiringDict(
             max_len=100, max_age_seconds=3600
         )
+        self.rule_sets = {}
+        self.protected_channels = {}
+        self.scanned_contents = expiringdict.ExpiringDict(
+            max_len=1000, max_age_seconds=3600
+        )
+        self.regex_sandbox = RegexSandbox(
+            workers=self.REGEX_WORKERS,
+            budget=self.REGEX_BUDGET_SECONDS,
+            strikes=self.REGEX_QUARANTINE_STRIKES,
+        )
+        await self.bot.warning_store.ensure_index()
+
+    async def cog_unload(self):
+        """Method to stop the regex sandbox processes when the cog is unloaded."""
+        await self.regex_sandbox.close()
+        await super().cog_unload()
+
+    def match_channels(self, config):
+        """Method to only match in the protected channels."""
+        channels = config.extensions.protect.channels.value
+        # kept so edits in other channels can be skipped before getting the config
+        self.protected_channels[config.guild_id] = (
+            config.get("config_version"),
+            {str(channel_id) for channel_id in channels},
+        )
+        return channels
 
     async def match(self, config, ctx, content):
         """Method to match roles for the protect command."""
@@ -193,9 +636,39 @@ class Protector(base.MatchCog):
 
         return True
 
+    def is_unprotected_channel(self, guild_id, channel_id):
+        """Method to check if a channel is known not to be protected, without I/O.
+        The known channels are only trusted while they match the version of the
+        fresh cached guild config."""
+        protected_channels = self.protected_channels.get(guild_id)
+        if not protected_channels:
+            return False
+        config = self.bot.guild_config_cache.peek(guild_id)
+        if not config or config.get("config_version") != protected_channels[0]:
+            return False
+        return channel_id not in protected_channels[1]
+
     @commands.Cog.listener()
     async def on_raw_message_edit(self, payload):
-        """Method to edit the raw message."""
+        """Method to scan edited messages, skipping edits that can't need it
+        before doing any I/O."""
+        if not payload.guild_id:
+            return
+
+        # edits without content are embeds being added, like link previews
+        content = payload.data.get("content")
+        if content is None:
+            return
+        if payload.cached_message and payload.cached_message.content == content:
+            return
+        if self.scanned_contents.get(payload.message_id) == content:
+            return
+
+        guild_id = str(payload.guild_id)
+        channel_id = str(payload.channel_id)
+        if self.is_unprotected_channel(guild_id, channel_id):
+            return
+
         guild = self.bot.get_guild(payload.guild_id)
         if not guild:
             return
@@ -203,65 +676,74 @@ class Protector(base.MatchCog):
         config = await self.bot.get_context_config(guild=guild)
         if not self.extension_enabled(config):
             return
+        self.match_channels(config)
+        if channel_id not in self.protected_channels[config.guild_id][1]:
+            return
 
         channel = self.bot.get_channel(payload.channel_id)
         if not channel:
             return
 
-        message = await channel.fetch_message(payload.message_id)
+        # the cached message has already been updated with the edit
+        message = discord.utils.get(self.bot.cached_messages, id=payload.message_id)
         if not message:
-            return
+            try:
+                message = await channel.fetch_message(payload.message_id)
+            except discord.NotFound:
+                return
 
         ctx = await self.bot.get_context(message)
-        matched = await self.match(config, ctx, message.content)
+        matched = await self.match(config, ctx, content)
         if not matched:
             return
 
-        await self.response(config, ctx, message.content, None)
+        await self.response(config, ctx, content, None)
+
+    async def get_rule_set(self, config):
+        """Method to get the compiled string map of a guild,
+        compiling it again only when the config changes."""
+        rule_set = self.rule_sets.get(config.guild_id)
+        if rule_set and rule_set.is_current(config):
+            return rule_set
+
+        rule_set = ProtectRuleSet(config)
+        self.rule_sets[config.guild_id] = rule_set
+        if rule_set.errors:
+            await self.bot.logger.warning(
+                f"Invalid protect regexes in guild {config.guild_id}: "
+                + ", ".join(rule_set.errors),
+                send=True,
+            )
+        return rule_set
 
-    def search_by_text_regex(self, config, content):
+    async def search_by_text_regex(self, rule_set, content):
         """Function to search given input by all
         text and regex rules from the config"""
-        triggered_config = None
-        for (
-            keyword,
-            filter_config,
-        ) in config.extensions.protect.string_map.value.items():
-            filter_config = munch.munchify(filter_config)
-            search_keyword = keyword
-            search_content = content
-
-            regex = filter_config.get("regex")
-            if regex:
-                try:
-                    match = re.search(regex, search_content)
-                except re.error:
-                    match = None
-                if match:
-                    filter_config["trigger"] = keyword
-                    triggered_config = filter_config
-                    if triggered_config.get("delete"):
-                        return triggered_config
-            else:
-                if filter_config.get("sensitive"):
-                    search_keyword = search_keyword.lower()
-                    search_content = search_content.lower()
-                if search_keyword in search_content:
-                    filter_config["trigger"] = keyword
-                    triggered_config = filter_config
-                    if triggered_config.get("delete"):
-                        return triggered_config
-        return triggered_config
+        matched = rule_set.search_keywords(content)
+        regex_matched, quarantined = await self.regex_sandbox.search(rule_set, content)
+        matched |= regex_matched
+        for _, trigger, regex in quarantined:
+            await self.bot.logger.warning(
+                f"Quarantined protect rule {trigger} in guild"
+                f" {rule_set.config.guild_id}, its regex `{regex}` kept running"
+                f" over {self.REGEX_BUDGET_SECONDS} seconds",
+                send=True,
+            )
+        return rule_set.get_triggered_config(matched)
 
     async def response(self, config, ctx, content, _):
         """Method to define the response for the protect extension."""
+        # edits that don't change this content don't have to be scanned again
+        self.scanned_contents[ctx.message.id] = content
+
         # check mass mentions first - return after handling
         if len(ctx.message.mentions) > config.extensions.protect.max_mentions.value:
             await self.handle_mass_mention_alert(config, ctx, content)
             return
 
         # search the message against keyword strings
-        triggered_config = self.search_by_text_regex(config, content)
+        rule_set = await self.get_rule_set(config)
+        triggered_config = await self.search_by_text_regex(rule_set, content)
 
         for attachment in ctx.message.attachments:
             if (
@@ -362,9 +844,9 @@ class Protector(base.MatchCog):
             if not can_execute:
                 return
 
-        warnings = await self.get_warnings(user, ctx.guild)
-
-        new_count = len(warnings) + 1
+        new_count = (
+            await self.bot.warning_store.get_count(str(ctx.guild.id), str(user.id)) + 1
+        )
 
         config = await self.bot.get_context_config(ctx)
 
@@ -426,9 +908,9 @@ class Protector(base.MatchCog):
         else:
             await ctx.send(ctx.message.author.mention, embed=embed)
 
-        await self.models.Warning(
-            user_id=str(user.id), guild_id=str(ctx.guild.id), reason=reason
-        ).create()
+        await self.bot.warning_store.add_warning(
+            str(ctx.guild.id), str(user.id), reason
+        )
 
     async def handle_unwarn(self, ctx, user, reason, bypass=False):
         """Method to handle an unwarn of a user."""
@@ -438,8 +920,7 @@ class Protector(base.MatchCog):
             if not can_execute:
                 return
 
-        warnings = await self.get_warnings(user, ctx.guild)
-        if not warnings:
+        if not await self.bot.warning_store.get_count(str(ctx.guild.id), str(user.id)):
             await auxiliary.send_deny_embed(
                 message="There are no warnings for that user", channel=ctx.channel
             )
@@ -457,12 +938,11 @@ class Protector(base.MatchCog):
             if not can_execute:
                 return
 
-        async for ban in ctx.guild.bans(limit=None):
-            if user == ban.user:
-                await auxiliary.send_deny_embed(
-                    message="User is already banned.", channel=ctx.channel
-                )
-                return
+        if await self.bot.ban_store.is_banned(ctx.guild, user):
+            await auxiliary.send_deny_embed(
+                message="User is already banned.", channel=ctx.channel
+            )
+            return
 
         config = await self.bot.get_context_config(ctx)
         await ctx.guild.ban(
@@ -470,6 +950,7 @@ class Protector(base.MatchCog):
             reason=reason,
             delete_message_days=config.extensions.protect.ban_delete_duration.value,
         )
+        self.bot.ban_store.set_banned(ctx.guild.id, user.id, True)
 
         embed = await self.generate_user_modified_embed(user, "ban", reason)
 
@@ -482,9 +963,16 @@ class Protector(base.MatchCog):
             if not can_execute:
                 return
 
-        try:
-            await ctx.guild.unban(user, reason=reason)
-        except discord.NotFound:
+        # a user known not to be banned doesn't need the unban request
+        not_banned = self.bot.ban_store.get_cached(ctx.guild.id, user.id) is False
+        if not not_banned:
+            try:
+                await ctx.guild.unban(user, reason=reason)
+            except discord.NotFound:
+                not_banned = True
+        self.bot.ban_store.set_banned(ctx.guild.id, user.id, False)
+
+        if not_banned:
             await auxiliary.send_deny_embed(
                 message="This user is not banned, or does not exist",
                 channel=ctx.channel,
@@ -510,9 +998,7 @@ class Protector(base.MatchCog):
 
     async def clear_warnings(self, user, guild):
         """Method to clear warnings of a user in discord."""
-        await self.models.Warning.delete.where(
-            self.models.Warning.user_id == str(user.id)
-        ).where(self.models.Warning.guild_id == str(guild.id)).gino.status()
+        await self.bot.warning_store.clear_warnings(str(guild.id), str(user.id))
 
     async def generate_user_modified_embed(self, user, action, reason):
         """Method to generate the user embed with the reason."""
@@ -600,14 +1086,7 @@ class Protector(base.MatchCog):
 
     async def get_warnings(self, user, guild):
         """Method to get the warnings of a user."""
-        warnings = (
-            await self.models.Warning.query.where(
-                self.models.Warning.user_id == str(user.id)
-            )
-            .where(self.models.Warning.guild_id == str(guild.id))
-            .gino.all()
-        )
-        return warnings
+        return await self.bot.warning_store.get_warnings(str(guild.id), str(user.id))
 
     async def create_linx_embed(self, config, ctx, content):
         """Method to create a link for long messages."""
@@ -903,3 +1382,54 @@ class Protector(base.MatchCog):
         )
 
         await self.send_alert(config, ctx, "Purge command")
+
+    @commands.has_permissions(administrator=True)
+    @commands.group(
+        name="protect",
+        brief="Executes a protect command",
+        description="Executes a protect command",
+    )
+    async def protect_command(self, ctx):
+        """Method for the protect command group."""
+        await base.extension_help(self, ctx, self.__module__[11:])
+
+    @protect_command.group(
+        name="rules",
+        brief="Executes a protect rules command",
+        description="Executes a protect rules command",
+    )
+    async def protect_rules(self, ctx):
+        """Method for the protect rules command group."""
+        await base.extension_help(self, ctx, self.__module__[11:])
+
+    @protect_rules.command(
+        name="profile",
+        brief="Shows how long the protect regexes take",
+        description=(
+            "Shows the average and 99th percentile match time of each protect regex"
+        ),
+    )
+    async def protect_rules_profile(self, ctx):
+        """Method to show the match times of the regex rules in the guild."""
+        profiles = self.regex_sandbox.get_guild_profiles(str(ctx.guild.id))
+        if not profiles:
+            await auxiliary.send_deny_embed(
+                message="No protect regexes have been run yet", channel=ctx.channel
+            )
+            return
+
+        embed = ProtectEmbed(description="Regex match times, slowest first")
+        # embeds can only hold 25 fields
+        for key, profile in profiles[:25]:
+            _, trigger, regex = key
+            value = (
+                f"`{regex}`\n"
+                f"avg: {profile.average * 1000:.3f}ms,"
+                f" p99: {profile.p99 * 1000:.3f}ms\n"
+                f"runs: {len(profile.samples)}, timeouts: {profile.timeouts}"
+            )
+            if key in self.regex_sandbox.quarantined:
+                value += "\n**Quarantined**"
+            embed.add_field(name=trigger, value=value, inline=False)
+
+        await ctx.send(embed=embed)
@@ -1,12 +1,14 @@
 """This is the discord side of the IRC->Discord relay"""
-from typing import Dict, List, Union
+import asyncio
+import io
+from typing import Dict, List, Tuple, Union
 
 import base
 import discord
 import munch
 import ui
 from base import auxiliary
-from bidict import bidict
+from bidict import frozenbidict
 from discord.ext import commands
 
 
@@ -32,25 +34,188 @@ async def setup(bot: commands.Bot) -> None:
         discord_channel_id = bot.db.Column(bot.db.String, default=None)
         irc_channel_id = bot.db.Column(bot.db.String, default=None)
 
+    # The maps are kept on the IRC bot, so reloading this doesn't read the table again
+    if not bot.irc.relay_mappings:
+        bot.irc.relay_mappings = RelayMappings(bot=bot)
+    bot.irc.relay_mappings.model = IRCChannelMapping
+
     irc_cog = DiscordToIRC(bot=bot, models=[IRCChannelMapping], extension_name="relay")
 
     await bot.add_cog(irc_cog)
     bot.irc.irc_cog = irc_cog
 
 
+class RelayMappings:
+    """The store for the discord:irc channel maps
+    The maps are read from an immutable bidict snapshot, which is replaced on every
+    write. This lets both the asyncio loop and the IRC thread read it without a lock.
+
+    Args:
+        bot (commands.Bot): The bot object
+    """
+
+    def __init__(self, bot: commands.Bot) -> None:
+        self.bot = bot
+        self.model = None
+        self.snapshot = frozenbidict()
+        self.guilds = {}  # discord channel ID: guild ID
+        self.loaded = False
+        self.lock = asyncio.Lock()
+
+    def __contains__(self, discord_channel_id: str) -> bool:
+        return discord_channel_id in self.snapshot
+
+    def __len__(self) -> int:
+        return len(self.snapshot)
+
+    async def load(self) -> None:
+        """Reads every map from the database into the snapshot
+        This only has to happen once, after that writes are applied as deltas
+        """
+        maps = await self.model.query.gino.all()
+        self.replace(
+            {map.discord_channel_id: map.irc_channel_id for map in maps},
+            {map.discord_channel_id: map.guild_id for map in maps},
+        )
+        self.loaded = True
+
+    def replace(self, mapping: Dict[str, str], guilds: Dict[str, str]) -> None:
+        """Swaps in a new snapshot of the maps
+
+        Args:
+            mapping (Dict[str, str]): The discord channel ID to IRC channel maps
+            guilds (Dict[str, str]): The discord channel ID to guild ID maps
+        """
+        self.guilds = guilds
+        self.snapshot = frozenbidict(mapping)
+
+    def get_irc_channel(self, discord_channel_id: str) -> Union[str, None]:
+        """Gets the IRC channel linked to a discord channel
+
+        Args:
+            discord_channel_id (str): The ID of the discord channel
+
+        Returns:
+            Union[str, None]: The IRC channel, or None if there isn't a link
+        """
+        return self.snapshot.get(discord_channel_id)
+
+    def get_discord_channel(self, irc_channel: str) -> Union[str, None]:
+        """Gets the discord channel linked to an IRC channel
+
+        Args:
+            irc_channel (str): The name of the IRC channel
+
+        Returns:
+            Union[str, None]: The discord channel ID, or None if there isn't a link
+        """
+        return self.snapshot.inverse.get(irc_channel)
+
+    def get_guild_maps(self, guild_id: str) -> List[Tuple[str, str]]:
+        """Gets the maps of the channels in one guild
+
+        Args:
+            guild_id (str): The ID of the guild
+
+        Returns:
+            List[Tuple[str, str]]: The (discord channel ID, IRC channel) pairs
+        """
+        snapshot = self.snapshot
+        return [
+            (discord_channel_id, irc_channel)
+            for discord_channel_id, irc_channel in snapshot.items()
+            if self.guilds.get(discord_channel_id) == guild_id
+        ]
+
+    async def link(
+        self, guild_id: str, discord_channel_id: str, irc_channel: str
+    ) -> bool:
+        """Adds a map to the database and the snapshot
+
+        Args:
+            guild_id (str): The ID of the guild the discord channel is in
+            discord_channel_id (str): The ID of the discord channel
+            irc_channel (str): The name of the IRC channel
+
+        Returns:
+            bool: False if either channel was already linked
+        """
+        async with self.lock:
+            if discord_channel_id in self.snapshot or self.get_discord_channel(
+                irc_channel
+            ):
+                return False
+            async with self.bot.db.transaction():
+                await self.model.create(
+                    guild_id=guild_id,
+                    discord_channel_id=discord_channel_id,
+                    irc_channel_id=irc_channel,
+                )
+            self.replace(
+                {**self.snapshot, discord_channel_id: irc_channel},
+                {**self.guilds, discord_channel_id: guild_id},
+            )
+        return True
+
+    async def unlink(self, discord_channel_id: str) -> Union[str, None]:
+        """Removes a map from the database and the snapshot
+
+        Args:
+            discord_channel_id (str): The ID of the discord channel
+
+        Returns:
+            Union[str, None]: The IRC channel that was unlinked, or None if there wasn't one
+        """
+        async with self.lock:
+            irc_channel = self.snapshot.get(discord_channel_id)
+            if not irc_channel:
+                return None
+            async with self.bot.db.transaction():
+                await self.model.delete.where(
+                    self.model.discord_channel_id == discord_channel_id
+                ).gino.status()
+            mapping = dict(self.snapshot)
+            mapping.pop(discord_channel_id)
+            guilds = dict(self.guilds)
+            guilds.pop(discord_channel_id, None)
+            self.replace(mapping, guilds)
+        return irc_channel
+
+
 class DiscordToIRC(base.MatchCog):
     """The discord side of the relay"""
 
-    mapping = None  # bidict - discord:irc
+    @property
+    def mappings(self) -> RelayMappings:
+        """The store of the channel maps, shared with the IRC bot"""
+        return self.bot.irc.relay_mappings
+
+    @property
+    def mapping(self) -> frozenbidict:
+        """The current snapshot of the maps - discord:irc"""
+        return self.mappings.snapshot
 
     async def preconfig(self):
         """The preconfig setup for the discord side
-        This maps the database to a bidict for quick lookups, and allows lookups in threads
+        This loads the channel maps the first time the extension is loaded
+        """
+        if not self.mappings.loaded:
+            await self.mappings.load()
+        self.bot.match_dispatcher.invalidate()
+
+    def match_channels(self, config: munch.Munch) -> list:
+        """Only linked discord channels are relayed
+
+        Args:
+            config (munch.Munch): The config of the guild where the message was sent
+
+        Returns:
+            list: The IDs of the linked discord channels
         """
-        allmaps = await self.models.IRCChannelMapping.query.gino.all()
-        self.mapping = bidict({})
-        for map in allmaps:
-            self.mapping.put(map.discord_channel_id, map.irc_channel_id)
+        irc_config = getattr(self.bot.file_config.api, "irc")
+        if not irc_config.enable_irc or not self.mapping:
+            return []
+        return list(self.mapping.keys())
 
     async def match(
         self, config: munch.Munch, ctx: commands.Context, content: str
@@ -70,20 +235,8 @@ class DiscordToIRC(base.MatchCog):
         if not irc_config.enable_irc:
             return None
 
-        if not self.mapping:
-            return None
-
-        # Check if channel has an active map
-        if not str(ctx.channel.id) in self.mapping:
-            return None
-
         # If there is a map, find it and return it
-        map = self.mapping[str(ctx.channel.id)]
-        if map:
-            return map
-
-        # If no conditions are met, do nothing
-        return None
+        return self.mappings.get_irc_channel(str(ctx.channel.id))
 
     async def response(
         self, config: munch.Munch, ctx: commands.Context, content: str, result: str
@@ -149,18 +302,16 @@ class DiscordToIRC(base.MatchCog):
         Args:
             ctx (commands.Context): The context in which the command was run
         """
-        db_links = await self.models.IRCChannelMapping.query.where(
-            self.models.IRCChannelMapping.guild_id == str(ctx.guild.id)
-        ).gino.all()
+        guild_maps = self.mappings.get_guild_maps(str(ctx.guild.id))
 
         embed = discord.Embed()
         embed.title = "All IRC links:"
         embed.color = discord.Color.blurple()
 
-        for entry in db_links:
+        for discord_channel_id, irc_channel in guild_maps:
             embed.add_field(
-                name=f"<#{entry.discord_channel_id}>",
-                value=entry.irc_channel_id,
+                name=f"<#{discord_channel_id}>",
+                value=irc_channel,
                 inline=True,
             )
 
@@ -219,7 +370,8 @@ class DiscordToIRC(base.MatchCog):
         embed.description = (
             f"IRC Status: `{irc_status['status']}` \n"
             f"IRC Bot Name: `{irc_status['name']}` \n"
-            f"Channels: `{irc_status['channels']}`"
+            f"Channels: `{irc_status['channels']}` \n"
+            f"Queue: `{irc_status['queue']}`"
         )
         await ctx.send(embed=embed)
 
@@ -232,7 +384,7 @@ class DiscordToIRC(base.MatchCog):
             ctx (commands.Context): The context in which the command was run
             user (str): The hostmask of the user to ban
         """
-        map = self.mapping[str(ctx.channel.id)]
+        map = self.mappings.get_irc_channel(str(ctx.channel.id))
         if not map:
             await auxiliary.send_deny_embed(
                 message="This channel is not linked to IRC", channel=ctx.channel
@@ -259,7 +411,7 @@ class DiscordToIRC(base.MatchCog):
             ctx (commands.Context): The context in which the command was run
             user (str): The hostmask of the user to ban
         """
-        map = self.mapping[str(ctx.channel.id)]
+        map = self.mappings.get_irc_channel(str(ctx.channel.id))
         if not map:
             await auxiliary.send_deny_embed(
                 message="This channel is not linked to IRC", channel=ctx.channel
@@ -311,15 +463,19 @@ class DiscordToIRC(base.MatchCog):
             )
             return
 
-        map = self.models.IRCChannelMapping(
+        linked = await self.mappings.link(
             guild_id=str(ctx.guild.id),
             discord_channel_id=str(ctx.channel.id),
-            irc_channel_id=irc_channel,
+            irc_channel=irc_channel,
         )
+        if not linked:
+            await auxiliary.send_deny_embed(
+                message="One of these channels is already linked",
+                channel=ctx.channel,
+            )
+            return
+        self.bot.match_dispatcher.invalidate()
 
-        self.mapping.put(map.discord_channel_id, map.irc_channel_id)
-
-        await map.create()
         await auxiliary.send_confirm_embed(
             message=(
                 f"New link established between <#{ctx.channel.id}> and {irc_channel}"
@@ -360,13 +516,10 @@ class DiscordToIRC(base.MatchCog):
             )
             return
 
-        irc_channel = self.mapping.pop(str(ctx.channel.id))
-
-        db_link = await self.models.IRCChannelMapping.query.where(
-            self.models.IRCChannelMapping.discord_channel_id == str(ctx.channel.id)
-        ).gino.first()
-
-        await db_link.delete()
+        irc_channel = await self.mappings.unlink(str(ctx.channel.id))
+        if not irc_channel:
+            return
+        self.bot.match_dispatcher.invalidate()
 
         await auxiliary.send_confirm_embed(
             message=(
@@ -382,11 +535,10 @@ class DiscordToIRC(base.MatchCog):
         Args:
             split_message (Dict[str, str]): The formatted dictionary of the IRC message
         """
-        if split_message["channel"] not in self.mapping.inverse:
+        map = self.mappings.get_discord_channel(split_message["channel"])
+        if not map:
             return
 
-        map = self.mapping.inverse[split_message["channel"]]
-
         discord_channel = await self.bot.fetch_channel(map)
 
         mentions = self.get_mentions(
@@ -501,6 +653,44 @@ class DiscordToIRC(base.MatchCog):
             reaction=reaction, user=user, channel=self.mapping[str(channel.id)]
         )
 
+    async def paste_overflow(self, channel: str, text: str) -> None:
+        """Pastes the messages that overflowed an IRC channel queue, and queues the link
+        If the paste can't be made, a count of the lost messages is queued instead
+
+        Args:
+            channel (str): The IRC channel the messages were going to
+            text (str): The messages that were not sent
+        """
+        count = len(text.splitlines())
+        url = None
+        if self.bot.file_config.main.api_url.linx:
+            headers = {
+                "Linx-Expiry": "1800",
+                "Linx-Randomize": "yes",
+                "Accept": "application/json",
+            }
+            try:
+                response = await self.bot.http_call(
+                    "post",
+                    self.bot.file_config.main.api_url.linx,
+                    headers=headers,
+                    data={"file": io.StringIO(text)},
+                )
+                url = response.get("url")
+            except Exception as exception:
+                await self.bot.logger.warning(
+                    f"Could not paste IRC overflow: {exception}"
+                )
+
+        if url:
+            message = f"** {count} message(s) from discord were pasted: {url} **"
+        else:
+            message = (
+                f"** {count} message(s) from discord were not relayed"
+                " to avoid flooding **"
+            )
+        self.bot.irc.send_message_to_channel(channel=channel, message=message)
+
     async def handle_dm_from_irc(self, message: str, event) -> None:
         """Sends a DM to the owner of the bot based on a message from IRC
 
@@ -39,7 +39,9 @@ class UrbanDictionary(base.BaseCog):
     )
     async def urban(self, ctx, *, query: str):
         """Method to get a call from the urban dictionary API."""
-        response = await self.bot.http_call("get", f"{self.BASE_URL}{query}")
+        response = await self.bot.http_call(
+            "get", f"{self.BASE_URL}{query}", use_cache=True
+        )
         definitions = response.get("list")
 
         config = await self.bot.get_context_config(ctx)
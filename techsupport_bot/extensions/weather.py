@@ -42,7 +42,7 @@ class Weather(base.BaseCog):
     ):
         """Method to define the weather for the command."""
         response = await self.bot.http_call(
-            "get", self.get_url([city_name, state_code, country_code])
+            "get", self.get_url([city_name, state_code, country_code]), use_cache=True
         )
 
         embed = self.generate_embed(munch.munchify(response))
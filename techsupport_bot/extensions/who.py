@@ -26,15 +26,7 @@ async def setup(bot):
         author_id = bot.db.Column(bot.db.String)
         body = bot.db.Column(bot.db.String)
 
-    class Warning(bot.db.Model):
-        """Class to set up warnings for the config file."""
-
-        __tablename__ = "warnings"
-        pk = bot.db.Column(bot.db.Integer, primary_key=True)
-        user_id = bot.db.Column(bot.db.String)
-        guild_id = bot.db.Column(bot.db.String)
-        reason = bot.db.Column(bot.db.String)
-        time = bot.db.Column(bot.db.DateTime, default=datetime.datetime.utcnow)
+    Warning = bot.warning_store.get_model()
 
     config = bot.ExtensionConfig()
     config.add(
@@ -122,12 +114,8 @@ class Who(base.BaseCog):
 
         # Gets all warnings for an user and adds them to the embed (Mod only)
         if interaction.permissions.kick_members:
-            warnings = (
-                await self.models.Warning.query.where(
-                    self.models.Warning.user_id == str(user.id)
-                )
-                .where(self.models.Warning.guild_id == str(interaction.guild.id))
-                .gino.all()
+            warnings = await self.bot.warning_store.get_warnings(
+                str(interaction.guild.id), str(user.id)
             )
             for warning in warnings:
                 embed.add_field(
@@ -98,7 +98,7 @@ class XKCD(base.BaseCog):
     async def api_call(self, number=None):
         """Method for the API call for xkcd."""
         url = self.SPECIFIC_API_URL % (number) if number else self.MOST_RECENT_API_URL
-        response = await self.bot.http_call("get", url)
+        response = await self.bot.http_call("get", url, use_cache=True)
 
         return response
 
@@ -1,3 +1,4 @@
 """Allows python to find the irc packages"""
 from .formatting import *
 from .irc import *
+from .outbound import *
@@ -93,19 +93,30 @@ def core_sent_message_format(
         str: The string, with unlimited length, that is ready to be sent to IRC
     """
     use_content = content_override if content_override else message.clean_content
-    IRC_BOLD = ""
-    permissions_prefix = get_permissions_prefix_for_discord_user(member=message.author)
     files = get_file_links(message_attachments=message.attachments)
     message_content = f"{use_content} {files}"
     if len(message_content.strip()) == 0:
         return ""
-    message_str = f"{IRC_BOLD}[D]{IRC_BOLD} <{permissions_prefix}"
-    message_str += f"{message.author.display_name}> {message_content}"
+    message_str = f"{get_author_prefix(member=message.author)}{message_content}"
     message_str = message_str.replace("\n", " ")
     message_str = message_str.strip()
     return message_str
 
 
+def get_author_prefix(member: discord.Member) -> str:
+    """Gets the start of a relayed message, which names the discord author
+
+    Args:
+        member (discord.Member): The member object who sent the message in discord
+
+    Returns:
+        str: The prefix, like "[D] <*name> "
+    """
+    IRC_BOLD = ""
+    permissions_prefix = get_permissions_prefix_for_discord_user(member=member)
+    return f"{IRC_BOLD}[D]{IRC_BOLD} <{permissions_prefix}{member.display_name}> "
+
+
 def format_discord_edit_message(message: discord.Message) -> str:
     """This modifies a formatted message to add a message edited flag
 
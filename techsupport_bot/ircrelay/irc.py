@@ -11,19 +11,22 @@ import ib3.auth
 import irc.bot
 import irc.client
 import irc.strings
-from ircrelay import formatting
+from ircrelay import formatting, outbound
 
 
 class IRCBot(ib3.auth.SASL, irc.bot.SingleServerIRCBot):
     """The IRC bot class. This is the class that runs the entire IRC side of the bot"""
 
     irc_cog = None
+    relay_mappings = None
     loop = None
     console = logging.getLogger("root")
     IRC_BOLD = ""
     connection = None
     join_thread = None
     ready = False
+    OUTBOUND_FLUSH_SECONDS = 0.5
+    OUTBOUND_POLICY = "link"
 
     def __init__(
         self,
@@ -56,6 +59,15 @@ class IRCBot(ib3.auth.SASL, irc.bot.SingleServerIRCBot):
         self.username = username
         self.password = password
         self._on_disconnect = self.reconnect_from_disconnect
+        self.outbound = outbound.OutboundQueue(
+            send=self.connection.privmsg,
+            paste=self.paste_overflow,
+            policy=self.OUTBOUND_POLICY,
+        )
+        # This runs on the IRC thread, so the connection is only written to from there
+        self.reactor.scheduler.execute_every(
+            self.OUTBOUND_FLUSH_SECONDS, self.flush_outbound
+        )
 
     def exit_irc(self):
         """Instatly kills the IRC thread"""
@@ -177,10 +189,10 @@ class IRCBot(ib3.auth.SASL, irc.bot.SingleServerIRCBot):
 
     def get_irc_status(self) -> Dict[str, str]:
         """Gets the status of the IRC bot
-        Returns nicely formatted status, username, and channels
+        Returns nicely formatted status, username, channels, and outbound queue depth
 
         Returns:
-            Dict[str, str]: The dictionary containing the 3 status items as strings
+            Dict[str, str]: The dictionary containing the 4 status items as strings
         """
         status_text = self.generate_status_string()
         channels = ", ".join(self.channels.keys())
@@ -190,8 +202,24 @@ class IRCBot(ib3.auth.SASL, irc.bot.SingleServerIRCBot):
             "status": status_text,
             "name": self.username,
             "channels": channels,
+            "queue": self.generate_queue_string(),
         }
 
+    def generate_queue_string(self) -> str:
+        """Generates a human readable summary of the outbound queues
+
+        Returns:
+            str: The queued lines by channel, and the lines dropped in total
+        """
+        stats = self.outbound.get_stats()
+        queued = ", ".join(
+            f"{channel}: {channel_stats['queued']}"
+            for channel, channel_stats in stats.items()
+            if channel_stats["queued"]
+        )
+        dropped = sum(channel_stats["dropped"] for channel_stats in stats.values())
+        return f"{queued or 'Empty'} ({dropped} dropped)"
+
     def generate_status_string(self) -> str:
         """Generates a human readable status string
         This takes into account the login process, if the connection is active,
@@ -253,18 +281,48 @@ class IRCBot(ib3.auth.SASL, irc.bot.SingleServerIRCBot):
         formatted_message = formatting.format_discord_message(
             message=message, content_override=content_override
         )
-        self.send_message_to_channel(channel=channel, message=formatted_message)
+        # Lines from the same author can be merged while they wait to be sent
+        self.send_message_to_channel(
+            channel=channel,
+            message=formatted_message,
+            author=message.author.id,
+            prefix=formatting.get_author_prefix(member=message.author),
+        )
 
-    def send_message_to_channel(self, channel: str, message: str) -> None:
-        """Sends a message to a channel. Splits the message if needed
+    def send_message_to_channel(
+        self, channel: str, message: str, author: int = None, prefix: str = ""
+    ) -> None:
+        """Queues a message for a channel. It will be split if needed, and sent
+        when the flood control allows it
 
         Args:
             channel (str): The IRC channel to send the message to
             message (str): The fully formatted string to send to the IRC channel
+            author (int): The ID of the discord user who sent the message, if any
+            prefix (str): The part of the message that names the author
         """
-        message_list = [message[i : i + 430] for i in range(0, len(message), 430)]
-        for cut_message in message_list:
-            self.connection.privmsg(channel, cut_message)
+        self.outbound.put(channel=channel, text=message, author=author, prefix=prefix)
+
+    def flush_outbound(self) -> None:
+        """Sends the queued messages the flood control allows
+        This is called by the reactor scheduler on the IRC thread
+        """
+        if not self.ready or not self.connection.is_connected():
+            return
+        self.outbound.flush()
+
+    def paste_overflow(self, channel: str, text: str) -> None:
+        """Hands the messages that overflowed a channel queue to discord to be pasted
+
+        Args:
+            channel (str): The IRC channel the messages were going to
+            text (str): The messages that were not sent
+        """
+        if not self.irc_cog:
+            return
+        asyncio.run_coroutine_threadsafe(
+            self.irc_cog.paste_overflow(channel=channel, text=text), self.loop
+        )
 
     def on_mode(self, _: irc.client.ServerConnection, event: irc.client.Event) -> None:
         """What to do when a channel mode is changed
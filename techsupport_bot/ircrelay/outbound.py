@@ -0,0 +1,305 @@
+"""The outbound side of the IRC relay. Messages going to IRC are queued per channel
+and sent at a rate the IRC server won't see as a flood"""
+import collections
+import logging
+import threading
+import time
+from typing import Callable, Dict, List, Union
+
+OVERFLOW_POLICIES = ("drop", "summarize", "link")
+
+
+class TokenBucket:
+    """A token bucket, which allows short bursts but limits the long term rate
+
+    Args:
+        rate (float): The number of tokens added every second
+        capacity (int): The most tokens the bucket can hold
+    """
+
+    def __init__(self, rate: float, capacity: int) -> None:
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+
+    def refill(self, now: float) -> None:
+        """Adds the tokens earned since the last refill
+
+        Args:
+            now (float): The current monotonic time
+        """
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def take(self, now: float) -> bool:
+        """Takes a token if there is one
+
+        Args:
+            now (float): The current monotonic time
+
+        Returns:
+            bool: True if a token was taken
+        """
+        self.refill(now)
+        if self.tokens < 1:
+            return False
+        self.tokens -= 1
+        return True
+
+
+class OutboundLine:
+    """A single line waiting to be sent to IRC
+
+    Args:
+        text (str): The fully formatted line
+        author (int): The ID of the discord user who sent it, if any
+        prefix (str): The part of the line that names the author
+    """
+
+    def __init__(self, text: str, author: int = None, prefix: str = "") -> None:
+        self.text = text
+        self.author = author
+        self.prefix = prefix
+
+
+class ChannelQueue:
+    """The queued lines and counters for a single IRC channel"""
+
+    def __init__(self) -> None:
+        self.lines = collections.deque()
+        self.overflow = []
+        self.sent = 0
+        self.merged = 0
+        self.dropped = 0
+
+
+class OutboundQueue:
+    """Holds the lines going to every IRC channel and sends them with flood control
+
+    Every channel has its own bounded queue, but they share one token bucket,
+    since the IRC server counts the flood against the whole connection.
+    Channels are sent from in turn, so a busy channel can't starve the others.
+    Consecutive lines from the same discord author are merged when they fit.
+
+    When a channel queue is full, the overflow policy decides what happens:
+        drop: the new line is thrown away
+        summarize: a count of the lost lines is sent once the queue drains
+        link: the lost lines are pasted and the link is sent once the queue drains
+
+    Args:
+        send (Callable[[str, str], None]): Sends a line to a channel on IRC
+        paste (Callable[[str, str], None]): Pastes the overflow text for a channel
+            and queues the link. If it's None, the link policy summarizes instead
+        max_depth (int): The most lines a channel queue can hold
+        rate (float): The number of lines that can be sent every second
+        burst (int): The number of lines that can be sent at once
+        policy (str): The overflow policy, one of drop, summarize or link
+    """
+
+    # IRC lines are limited to 512 bytes, including the command and the CR LF
+    MAX_MESSAGE_BYTES = 512
+    MERGE_SEPARATOR = " | "
+    console = logging.getLogger("root")
+
+    def __init__(
+        self,
+        send: Callable[[str, str], None],
+        paste: Callable[[str, str], None] = None,
+        max_depth: int = 20,
+        rate: float = 0.5,
+        burst: int = 4,
+        policy: str = "link",
+    ) -> None:
+        if policy not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy: {policy}")
+        self.send = send
+        self.paste = paste
+        self.max_depth = max_depth
+        self.policy = policy
+        self.bucket = TokenBucket(rate=rate, capacity=burst)
+        self.channels: Dict[str, ChannelQueue] = {}
+        self.lock = threading.Lock()
+
+    def get_max_bytes(self, channel: str) -> int:
+        """Gets the most bytes of text a single line to a channel can hold
+
+        Args:
+            channel (str): The IRC channel the line is going to
+
+        Returns:
+            int: The byte limit of the text
+        """
+        return self.MAX_MESSAGE_BYTES - len(f"PRIVMSG {channel} :\r\n".encode("utf-8"))
+
+    def split(self, channel: str, text: str) -> List[str]:
+        """Cuts a line into pieces IRC will accept
+        Pieces are cut by their encoded length, and never in the middle of a character
+
+        Args:
+            channel (str): The IRC channel the line is going to
+            text (str): The line to cut
+
+        Returns:
+            List[str]: The pieces of the line
+        """
+        limit = self.get_max_bytes(channel)
+        pieces = []
+        for line in text.splitlines():
+            data = line.encode("utf-8")
+            while data:
+                cut = min(limit, len(data))
+                # Step back past continuation bytes to the start of a character
+                while cut < len(data) and data[cut] & 0xC0 == 0x80:
+                    cut -= 1
+                pieces.append(data[:cut].decode("utf-8"))
+                data = data[cut:]
+        return pieces
+
+    def put(
+        self, channel: str, text: str, author: int = None, prefix: str = ""
+    ) -> None:
+        """Queues a line for a channel. This is safe to call from any thread
+
+        Args:
+            channel (str): The IRC channel to send the line to
+            text (str): The fully formatted line
+            author (int): The ID of the discord user who sent it, if any
+            prefix (str): The part of the line that names the author
+        """
+        if not text:
+            return
+        with self.lock:
+            queue = self.channels.setdefault(channel, ChannelQueue())
+            pieces = self.split(channel, text)
+            if len(pieces) == 1 and self.merge(
+                channel, queue, pieces[0], author, prefix
+            ):
+                return
+            for piece in pieces:
+                if len(queue.lines) >= self.max_depth:
+                    self.handle_overflow(queue, piece)
+                    continue
+                queue.lines.append(OutboundLine(piece, author, prefix))
+
+    def merge(
+        self,
+        channel: str,
+        queue: ChannelQueue,
+        text: str,
+        author: Union[int, None],
+        prefix: str,
+    ) -> bool:
+        """Adds a line to the last queued line if it came from the same author
+
+        Args:
+            channel (str): The IRC channel the line is going to
+            queue (ChannelQueue): The queue of the channel
+            text (str): The fully formatted line
+            author (Union[int, None]): The ID of the discord user who sent it
+            prefix (str): The part of the line that names the author
+
+        Returns:
+            bool: True if the line was merged
+        """
+        if author is None or not queue.lines or not text.startswith(prefix):
+            return False
+        last = queue.lines[-1]
+        if last.author != author or last.prefix != prefix:
+            return False
+        merged = f"{last.text}{self.MERGE_SEPARATOR}{text[len(prefix):]}"
+        if len(merged.encode("utf-8")) > self.get_max_bytes(channel):
+            return False
+        last.text = merged
+        queue.merged += 1
+        return True
+
+    def handle_overflow(self, queue: ChannelQueue, text: str) -> None:
+        """Applies the overflow policy to a line that didn't fit in its queue
+
+        Args:
+            queue (ChannelQueue): The full queue of the channel
+            text (str): The line that didn't fit
+        """
+        queue.dropped += 1
+        if self.policy != "drop":
+            queue.overflow.append(text)
+
+    def flush(self) -> None:
+        """Sends as many queued lines as the token bucket allows
+        This is called on the IRC thread by the reactor scheduler
+        """
+        sends = []
+        pastes = []
+        with self.lock:
+            now = time.monotonic()
+            turns = collections.deque(
+                channel for channel, queue in self.channels.items() if queue.lines
+            )
+            while turns and self.bucket.take(now):
+                channel = turns.popleft()
+                queue = self.channels[channel]
+                sends.append((channel, queue.lines.popleft().text))
+                queue.sent += 1
+                # The channel that just sent goes last, next flush too
+                self.channels[channel] = self.channels.pop(channel)
+                if queue.lines:
+                    turns.append(channel)
+
+            for channel, queue in self.channels.items():
+                if queue.lines or not queue.overflow:
+                    continue
+                overflow = queue.overflow
+                queue.overflow = []
+                if self.policy == "link" and self.paste:
+                    pastes.append((channel, "\n".join(overflow)))
+                    continue
+                queue.lines.append(
+                    OutboundLine(
+                        f"** {len(overflow)} message(s) from discord were not"
+                        " relayed to avoid flooding **"
+                    )
+                )
+
+        # The connection is only written to outside of the lock
+        # A line that fails is logged and skipped, so it can't stop the IRC thread
+        for channel, text in sends:
+            try:
+                self.send(channel, text)
+            except Exception as exception:
+                self.console.error(
+                    "Could not send a line to %s: %s", channel, exception
+                )
+        for channel, text in pastes:
+            try:
+                self.paste(channel, text)
+            except Exception as exception:
+                self.console.error(
+                    "Could not paste the overflow of %s: %s", channel, exception
+                )
+
+    def get_depth(self) -> int:
+        """Gets the number of lines waiting in every queue
+
+        Returns:
+            int: The total queue depth
+        """
+        with self.lock:
+            return sum(len(queue.lines) for queue in self.channels.values())
+
+    def get_stats(self) -> Dict[str, Dict[str, int]]:
+        """Gets the counters of every channel queue
+
+        Returns:
+            Dict[str, Dict[str, int]]: The queued, sent, merged and dropped counts by channel
+        """
+        with self.lock:
+            return {
+                channel: {
+                    "queued": len(queue.lines),
+                    "sent": queue.sent,
+                    "merged": queue.merged,
+                    "dropped": queue.dropped,
+                }
+                for channel, queue in self.channels.items()
+            }
@@ -26,11 +26,13 @@ logging.basicConfig(
     datefmt="%Y-%m-%d %H:%M:%S",
 )
 
-intents = discord.Intents.all()
-intents.members = True
+# the regex sandbox processes import this module too, so they must not start the bot
+if __name__ == "__main__":
+    intents = discord.Intents.all()
+    intents.members = True
 
-bot_ = bot.TechSupportBot(
-    intents=intents,
-    allowed_mentions=discord.AllowedMentions(everyone=False, roles=False),
-)
-asyncio.run(bot_.start())
+    bot_ = bot.TechSupportBot(
+        intents=intents,
+        allowed_mentions=discord.AllowedMentions(everyone=False, roles=False),
+    )
+    asyncio.run(bot_.start())
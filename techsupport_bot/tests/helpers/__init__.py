@@ -5,7 +5,11 @@ from .asset import *
 from .attachment import *
 from .bot import *
 from .channel import *
+from .config import *
 from .context import *
+from .factoid import *
+from .guild import *
 from .member import *
 from .message import *
+from .payload import *
 from .reaction import *
@@ -8,13 +8,17 @@ class MockChannel:
     This is the MockChannel class
 
     Currently implemented variables and methods:
+    id -> An integer containing the ID of the channel
+    parent_id -> An integer containing the ID of the parent channel, if it is a thread
     message_history -> A list of MockMessage objects
     history() -> An async function to return history.
         A "limit" object may be passed, but is ignored in this implementation
     """
 
-    def __init__(self, history=None):
+    def __init__(self, history=None, id=None, parent_id=None):
         self.message_history = history
+        self.id = id
+        self.parent_id = parent_id
 
     async def history(self, limit):
         """Replication of the async history method
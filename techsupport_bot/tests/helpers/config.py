@@ -0,0 +1,23 @@
+"""
+This is a file to store the fake guild config object
+"""
+
+import munch
+
+
+class MockGuildConfig(munch.Munch):
+    """
+    This is the MockGuildConfig class
+
+    Currently implemented variables and methods:
+    guild_id -> The string containing the ID of the guild
+    config_version -> The version of the config
+    extensions -> The extension configs, as nested munches
+    """
+
+    def __init__(self, guild_id=None, config_version=None, extensions=None):
+        super().__init__(
+            guild_id=guild_id,
+            config_version=config_version,
+            extensions=munch.munchify(extensions or {}),
+        )
@@ -0,0 +1,36 @@
+"""
+This is a file to store the fake Factoid database row
+"""
+
+
+class MockFactoid:
+    """
+    This is the MockFactoid class
+
+    Currently implemented variables and methods:
+    factoid_id -> An integer containing the ID of the factoid
+    name -> The string containing the name of the factoid
+    guild -> The string containing the ID of the guild the factoid is in
+    message -> The string containing the message of the factoid
+    alias -> The name of the parent factoid, if the factoid is an alias
+    embed_config -> The JSON string of the embed of the factoid, if it has one
+    hidden -> Boolean stating if the factoid is hidden from the factoid list
+    """
+
+    def __init__(
+        self,
+        factoid_id=None,
+        name=None,
+        guild=None,
+        message=None,
+        alias=None,
+        embed_config=None,
+        hidden=False,
+    ):
+        self.factoid_id = factoid_id
+        self.name = name
+        self.guild = guild
+        self.message = message
+        self.alias = alias
+        self.embed_config = embed_config
+        self.hidden = hidden
@@ -0,0 +1,43 @@
+"""
+This is a file to store the fake discord.Guild object
+"""
+
+from types import SimpleNamespace
+
+import discord
+
+
+class MockGuild:
+    """
+    This is the MockGuild class
+
+    Currently implemented variables and methods:
+    id -> An integer containing the ID of the guild
+    bans -> A list of the IDs of the banned users
+    ban_lookups -> The number of times fetch_ban was called
+    fetch_ban() -> Returns the user if they are banned, raises discord.NotFound if not
+    """
+
+    def __init__(self, id=None, bans=None):
+        self.id = id
+        self.bans = bans or []
+        self.ban_lookups = 0
+
+    async def fetch_ban(self, user):
+        """Replication of the async fetch_ban method
+
+        Args:
+            user (MockMember): The user to look up
+
+        Raises:
+            discord.NotFound: If the user isn't banned
+
+        Returns:
+            MockMember: The banned user
+        """
+        self.ban_lookups += 1
+        if user.id not in self.bans:
+            raise discord.NotFound(
+                SimpleNamespace(status=404, reason="Not Found"), "Unknown Ban"
+            )
+        return user
@@ -12,14 +12,18 @@ class MockMessage:
     author -> The MockMember object who create the message
     clean_content -> The same as content
     attachments -> A list of MockAttacment objects
+    channel -> The MockChannel object the message was sent in
     """
 
-    def __init__(self, content=None, author=None, attachments=None, reactions=None):
+    def __init__(
+        self, content=None, author=None, attachments=None, reactions=None, channel=None
+    ):
         self.content = content
         self.author = author
         self.clean_content = content
         self.attachments = attachments
         self.reactions = reactions
+        self.channel = channel
 
     async def add_reaction(self, reaction):
         """Replication of the adding a reaction
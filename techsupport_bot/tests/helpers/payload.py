@@ -0,0 +1,30 @@
+"""
+This is a file to store the fake discord.RawMessageUpdateEvent object
+"""
+
+
+class MockRawMessageUpdateEvent:
+    """
+    This is the MockRawMessageUpdateEvent class
+
+    Currently implemented variables and methods:
+    guild_id -> An integer containing the ID of the guild
+    channel_id -> An integer containing the ID of the channel
+    message_id -> An integer containing the ID of the edited message
+    data -> The dict of the raw edit data
+    cached_message -> The MockMessage from before the edit, if it was cached
+    """
+
+    def __init__(
+        self,
+        guild_id=None,
+        channel_id=None,
+        message_id=None,
+        data=None,
+        cached_message=None,
+    ):
+        self.guild_id = guild_id
+        self.channel_id = channel_id
+        self.message_id = message_id
+        self.data = data
+        self.cached_message = cached_message
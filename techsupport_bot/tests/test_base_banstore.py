@@ -0,0 +1,77 @@
+"""
+This is a file to test the base/banstore.py file
+This contains 4 tests
+"""
+
+
+import pytest
+from base import banstore
+
+from .helpers import MockGuild, MockMember
+
+
+class Test_BanStore:
+    """Tests to ensure ban states are looked up once and kept up to date"""
+
+    @pytest.mark.asyncio
+    async def test_lookup_is_cached(self):
+        """Test to ensure a user is only looked up once"""
+        # Step 1 - Setup env
+        store = banstore.BanStore()
+        guild = MockGuild(id=1, bans=[10])
+        user = MockMember(id=10)
+
+        # Step 2 - Call the function
+        first = await store.is_banned(guild, user)
+        second = await store.is_banned(guild, user)
+
+        # Step 3 - Assert that everything works
+        assert first and second
+        assert guild.ban_lookups == 1
+        assert store.stats()["hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_not_banned(self):
+        """Test to ensure a missing ban is cached as not banned"""
+        # Step 1 - Setup env
+        store = banstore.BanStore()
+        guild = MockGuild(id=1)
+
+        # Step 2 - Call the function
+        banned = await store.is_banned(guild, MockMember(id=10))
+
+        # Step 3 - Assert that everything works
+        assert banned is False
+        assert store.get_cached(1, 10) is False
+
+    @pytest.mark.asyncio
+    async def test_events_update_cache(self):
+        """Test to ensure ban and unban events change the cached state"""
+        # Step 1 - Setup env
+        store = banstore.BanStore()
+        guild = MockGuild(id=1)
+        user = MockMember(id=10)
+
+        # Step 2 - Call the function
+        await store.on_member_ban(guild, user)
+
+        # Step 3 - Assert that everything works
+        assert await store.is_banned(guild, user)
+        await store.on_member_unban(guild, user)
+        assert not await store.is_banned(guild, user)
+        assert guild.ban_lookups == 0
+
+    @pytest.mark.asyncio
+    async def test_expired_entry(self):
+        """Test to ensure old ban states are looked up again"""
+        # Step 1 - Setup env
+        store = banstore.BanStore(ttl=0)
+        guild = MockGuild(id=1, bans=[10])
+        store.set_banned(1, 10, False)
+
+        # Step 2 - Call the function
+        banned = await store.is_banned(guild, MockMember(id=10))
+
+        # Step 3 - Assert that everything works
+        assert banned
+        assert guild.ban_lookups == 1
@@ -0,0 +1,92 @@
+"""
+This is a file to test the base/configcache.py file
+This contains 5 tests
+"""
+
+
+from unittest.mock import patch
+
+import munch
+from base import configcache
+
+
+class Test_GuildConfigCache:
+    """Tests to ensure the guild config cache serves, refreshes and evicts"""
+
+    def test_fresh_hit(self):
+        """Test to ensure a stored config is a fresh hit"""
+        # Step 1 - Setup env
+        cache = configcache.GuildConfigCache(max_bytes=1000, ttl=30, stale_ttl=300)
+        cache.store("1", munch.Munch(guild_id="1"))
+
+        # Step 2 - Call the function
+        entry = cache.get("1")
+
+        # Step 3 - Assert that everything works
+        assert entry.config.guild_id == "1"
+        assert cache.is_fresh(entry)
+        assert cache.stats()["hit_ratio"] == 1.0
+
+    def test_stale_then_expired(self):
+        """Test to ensure stale entries are served until the stale window ends"""
+        # Step 1 - Setup env
+        cache = configcache.GuildConfigCache(max_bytes=1000, ttl=30, stale_ttl=300)
+        with patch("time.monotonic", return_value=0):
+            cache.store("1", munch.Munch(guild_id="1"))
+
+        # Step 2 - Call the function
+        with patch("time.monotonic", return_value=60):
+            stale_entry = cache.get("1")
+        with patch("time.monotonic", return_value=1000):
+            expired_entry = cache.get("1")
+
+        # Step 3 - Assert that everything works
+        assert stale_entry and not cache.is_fresh(stale_entry)
+        assert expired_entry is None
+        assert cache.stale_hits == 1
+        assert cache.misses == 1
+
+    def test_negative_entry(self):
+        """Test to ensure missing configs are cached as None"""
+        # Step 1 - Setup env
+        cache = configcache.GuildConfigCache(max_bytes=1000, ttl=30)
+
+        # Step 2 - Call the function
+        cache.store("1", None)
+
+        # Step 3 - Assert that everything works
+        assert cache.get("1").config is None
+        assert cache.current_bytes == 0
+
+    def test_byte_bound_evicts_lru(self):
+        """Test to ensure the least recently used config is evicted when over size"""
+        # Step 1 - Setup env
+        config = munch.Munch(prefix="." * 40)
+        size = configcache.GuildConfigCache.get_size(config)
+        cache = configcache.GuildConfigCache(max_bytes=size * 2, ttl=30)
+        cache.store("1", config)
+        cache.store("2", config)
+        cache.get("1")
+
+        # Step 2 - Call the function
+        cache.store("3", config)
+
+        # Step 3 - Assert that everything works
+        assert "1" in cache
+        assert "2" not in cache
+        assert "3" in cache
+
+    def test_peek(self):
+        """Test to ensure peeking doesn't count a lookup and skips stale configs"""
+        # Step 1 - Setup env
+        cache = configcache.GuildConfigCache(max_bytes=1000, ttl=30)
+        cache.store("1", munch.Munch(guild_id="1"))
+
+        # Step 2 - Call the function
+        config = cache.peek("1")
+
+        # Step 3 - Assert that everything works
+        assert config.guild_id == "1"
+        assert cache.lookups == 0
+        cache.ttl = 0
+        assert cache.peek("1") is None
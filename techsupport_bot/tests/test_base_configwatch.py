@@ -0,0 +1,129 @@
+"""
+This is a file to test the base/configwatch.py file
+This contains 5 tests
+"""
+
+
+from unittest.mock import AsyncMock, MagicMock
+
+import munch
+import pytest
+from base import configcache, configwatch
+from pymongo import errors
+
+
+class FakeCursor:
+    """An async iterable standing in for a motor cursor"""
+
+    def __init__(self, documents):
+        self.documents = documents
+
+    def __aiter__(self):
+        return self.iterate()
+
+    async def iterate(self):
+        """Yields every document"""
+        for document in self.documents:
+            yield document
+
+
+def setup_local_watcher(collection=None):
+    """A simple function to setup a config watcher over a cache with one cached config
+
+    Args:
+        collection (MagicMock, optional): A fake guild config collection.
+        Defaults to None.
+
+    Returns:
+        tuple: The instance of the GuildConfigWatcher class and its GuildConfigCache
+    """
+    cache = configcache.GuildConfigCache(max_bytes=10000, ttl=30)
+    cache.store("1", munch.Munch(_id="a", guild_id="1", config_version=1))
+    bot = MagicMock()
+    bot.logger = AsyncMock()
+    watcher = configwatch.GuildConfigWatcher(
+        bot=bot,
+        collection=collection or MagicMock(),
+        cache=cache,
+        watched_ttl=3600,
+    )
+    return watcher, cache
+
+
+class Test_ApplyChange:
+    """Tests to ensure change stream events are applied to the cache"""
+
+    def test_replace_patches_cached_config(self):
+        """Test to ensure a replaced config is swapped into the cache"""
+        # Step 1 - Setup env
+        watcher, cache = setup_local_watcher()
+        document = {"_id": "a", "guild_id": "1", "command_prefix": "!"}
+
+        # Step 2 - Call the function
+        watcher.apply_change({"operationType": "replace", "fullDocument": document})
+
+        # Step 3 - Assert that everything works
+        assert cache.get("1").config.command_prefix == "!"
+        assert watcher.updates == 1
+
+    def test_uncached_config_is_ignored(self):
+        """Test to ensure configs that aren't cached aren't added"""
+        # Step 1 - Setup env
+        watcher, cache = setup_local_watcher()
+        document = {"_id": "b", "guild_id": "2"}
+
+        # Step 2 - Call the function
+        watcher.apply_change({"operationType": "insert", "fullDocument": document})
+
+        # Step 3 - Assert that everything works
+        assert "2" not in cache
+
+    def test_delete_invalidates_by_id(self):
+        """Test to ensure a deleted config is removed from the cache"""
+        # Step 1 - Setup env
+        watcher, cache = setup_local_watcher()
+
+        # Step 2 - Call the function
+        watcher.apply_change({"operationType": "delete", "documentKey": {"_id": "a"}})
+
+        # Step 3 - Assert that everything works
+        assert "1" not in cache
+        assert watcher.invalidations == 1
+
+
+class Test_Polling:
+    """Tests to ensure the polling fallback invalidates changed configs"""
+
+    @pytest.mark.asyncio
+    async def test_version_change_invalidates(self):
+        """Test to ensure a bumped config_version drops the cached config"""
+        # Step 1 - Setup env
+        collection = MagicMock()
+        collection.find.return_value = FakeCursor(
+            [{"guild_id": "1", "config_version": 2}]
+        )
+        watcher, cache = setup_local_watcher(collection)
+
+        # Step 2 - Call the function
+        await watcher.poll_once()
+
+        # Step 3 - Assert that everything works
+        assert "1" not in cache
+
+    @pytest.mark.asyncio
+    async def test_falls_back_to_polling(self):
+        """Test to ensure a server without change streams is polled instead"""
+        # Step 1 - Setup env
+        collection = MagicMock()
+        collection.watch.side_effect = errors.OperationFailure("not a replica set")
+        watcher, cache = setup_local_watcher(collection)
+        # polling never returns on its own, so stop the watcher from inside it
+        watcher.poll = AsyncMock(side_effect=RuntimeError("stop"))
+
+        # Step 2 - Call the function
+        with pytest.raises(RuntimeError):
+            await watcher.run()
+
+        # Step 3 - Assert that everything works
+        watcher.poll.assert_awaited_once()
+        assert cache.ttl == 30
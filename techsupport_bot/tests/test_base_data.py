@@ -0,0 +1,37 @@
+"""
+This is a file to test the base/data.py file
+This contains 2 tests
+"""
+
+
+from base import data
+
+
+class Test_GetInflightKey:
+    """Tests to ensure only identical GETs are coalesced"""
+
+    def test_same_request_same_key(self):
+        """Test to ensure the same request gets the same key"""
+        # Step 1 - Setup env
+        headers = {"Authorization": "Bearer one"}
+
+        # Step 2 - Call the function
+        first = data.DataBot.get_inflight_key("url", headers=dict(headers))
+        second = data.DataBot.get_inflight_key("url", headers=dict(headers))
+
+        # Step 3 - Assert that everything works
+        assert first == second
+
+    def test_different_headers_different_key(self):
+        """Test to ensure calls with other credentials don't share a response"""
+        # Step 1 - Setup env
+        headers = {"Authorization": "Bearer one"}
+        other_headers = {"Authorization": "Bearer two"}
+
+        # Step 2 - Call the function
+        first = data.DataBot.get_inflight_key("url", headers=headers)
+        second = data.DataBot.get_inflight_key("url", headers=other_headers)
+
+        # Step 3 - Assert that everything works
+        assert first != second
+        assert "Bearer" not in str(first)
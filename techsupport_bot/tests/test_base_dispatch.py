@@ -0,0 +1,108 @@
+"""
+This is a file to test the base/dispatch.py file
+This contains 4 tests
+"""
+
+
+import munch
+from base import dispatch
+
+from .helpers import MockChannel, MockMessage
+
+
+class FakeCog:
+    """A match cog stand-in with static pre-filters"""
+
+    GUILD_ONLY = False
+
+    def __init__(self, channels=None, prefix=None, enabled=True):
+        self.channels = channels
+        self.prefix = prefix
+        self.enabled = enabled
+
+    def extension_enabled(self, _config):
+        """Gets if the cog is enabled"""
+        return self.enabled
+
+    def match_channels(self, _config):
+        """Gets the channel filter"""
+        return self.channels
+
+    def match_prefix(self, _config):
+        """Gets the prefix filter"""
+        return self.prefix
+
+
+class Test_MatchIndex:
+    """Tests to ensure the index only returns cogs that could match"""
+
+    def test_channel_filter(self):
+        """Test to ensure channel filtered cogs only match in their channels"""
+        # Step 1 - Setup env
+        cog = FakeCog(channels=["1"])
+        index = dispatch.MatchIndex(munch.Munch(), [cog], True)
+
+        # Step 2 - Call the function
+        inside = index.candidates(
+            MockMessage(content="hello", channel=MockChannel(id=1))
+        )
+        outside = index.candidates(
+            MockMessage(content="hello", channel=MockChannel(id=2))
+        )
+        thread = index.candidates(
+            MockMessage(content="hello", channel=MockChannel(id=3, parent_id=1))
+        )
+
+        # Step 3 - Assert that everything works
+        assert inside == [cog]
+        assert outside == []
+        assert thread == [cog]
+
+    def test_prefix_filter(self):
+        """Test to ensure prefix filtered cogs only match prefixed messages"""
+        # Step 1 - Setup env
+        cog = FakeCog(prefix="?")
+        index = dispatch.MatchIndex(munch.Munch(), [cog], True)
+
+        # Step 2 - Call the function
+        prefixed = index.candidates(
+            MockMessage(content="?factoid", channel=MockChannel(id=1))
+        )
+        plain = index.candidates(
+            MockMessage(content="factoid", channel=MockChannel(id=1))
+        )
+
+        # Step 3 - Assert that everything works
+        assert prefixed == [cog]
+        assert plain == []
+
+    def test_disabled_and_guild_only(self):
+        """Test to ensure disabled and guild only cogs are skipped"""
+        # Step 1 - Setup env
+        disabled_cog = FakeCog(enabled=False)
+        guild_cog = FakeCog()
+        guild_cog.GUILD_ONLY = True
+
+        # Step 2 - Call the function
+        index = dispatch.MatchIndex(munch.Munch(), [disabled_cog, guild_cog], False)
+
+        # Step 3 - Assert that everything works
+        assert (
+            index.candidates(MockMessage(content="hello", channel=MockChannel(id=1)))
+            == []
+        )
+
+    def test_is_current(self):
+        """Test to ensure the index is rebuilt when the config version changes"""
+        # Step 1 - Setup env
+        config = munch.Munch(config_version=1)
+        index = dispatch.MatchIndex(config, [], True)
+
+        # Step 2 - Call the function
+        current = index.is_current(config)
+        config.config_version = 2
+
+        # Step 3 - Assert that everything works
+        assert current
+        assert not index.is_current(config)
+        assert not index.is_current(munch.Munch(config_version=2))
@@ -0,0 +1,216 @@
+"""
+This is a file to test the base/http.py file
+This contains 9 tests
+"""
+
+
+from unittest.mock import patch
+
+import pytest
+from base import http
+from multidict import CIMultiDict
+
+
+class Test_HTTPResponse:
+    """Tests to ensure the in-memory response can be read repeatedly"""
+
+    @pytest.mark.asyncio
+    async def test_json_read_twice(self):
+        """Test to ensure the body can be decoded more than once"""
+        # Step 1 - Setup env
+        response = http.HTTPResponse(
+            status=200,
+            headers=CIMultiDict({"Content-Type": "application/json"}),
+            body=b'{"num": 1}',
+        )
+
+        # Step 2 - Call the function
+        first = await response.json()
+        second = await response.json()
+
+        # Step 3 - Assert that everything works
+        assert first == second == {"num": 1}
+
+    @pytest.mark.asyncio
+    async def test_json_structured_suffix(self):
+        """Test to ensure +json mimetypes are decoded like aiohttp does"""
+        # Step 1 - Setup env
+        response = http.HTTPResponse(
+            status=200,
+            headers=CIMultiDict({"Content-Type": "application/vnd.api+json"}),
+            body=b'{"num": 1}',
+        )
+
+        # Step 2 - Call the function
+        result = await response.json()
+
+        # Step 3 - Assert that everything works
+        assert result == {"num": 1}
+
+    @pytest.mark.asyncio
+    async def test_json_wrong_mimetype(self):
+        """Test to ensure a body that isn't JSON is still rejected"""
+        # Step 1 - Setup env
+        response = http.HTTPResponse(
+            status=200,
+            headers=CIMultiDict({"Content-Type": "text/html"}),
+            body=b"<html></html>",
+        )
+
+        # Step 2 - Call the function
+        with pytest.raises(http.aiohttp.ContentTypeError):
+            await response.json()
+
+        # Step 3 - Assert that everything works
+        assert response.content_type == "text/html"
+
+    @pytest.mark.asyncio
+    async def test_text(self):
+        """Test to ensure text decoding works"""
+        # Step 1 - Setup env
+        response = http.HTTPResponse(
+            status=200,
+            headers=CIMultiDict({"Content-Type": "text/plain"}),
+            body=b"a joke",
+        )
+
+        # Step 2 - Call the function
+        text = await response.text()
+
+        # Step 3 - Assert that everything works
+        assert text == "a joke"
+
+
+class Test_HTTPResponseCache:
+    """Tests to ensure the HTTP response cache honors its bounds and headers"""
+
+    def test_hit_and_miss_counters(self):
+        """Test to ensure hits and misses are counted"""
+        # Step 1 - Setup env
+        cache = http.HTTPResponseCache(max_bytes=1000, max_entries=10, default_ttl=60)
+        cache.store(
+            "key",
+            "host",
+            http.HTTPResponse(
+                status=200,
+                headers=CIMultiDict({"Content-Type": "application/json"}),
+                body=b"{}",
+            ),
+        )
+
+        # Step 2 - Call the function
+        cache.get("key")
+        cache.get("other")
+
+        # Step 3 - Assert that everything works
+        assert cache.hits == 1
+        assert cache.misses == 1
+
+    def test_byte_bound_evicts_lru(self):
+        """Test to ensure the least recently used entry is evicted when over size"""
+        # Step 1 - Setup env
+        cache = http.HTTPResponseCache(max_bytes=300, max_entries=10, default_ttl=60)
+        cache.store(
+            "a",
+            "host",
+            http.HTTPResponse(
+                status=200,
+                headers=CIMultiDict({"Content-Type": "application/json"}),
+                body=b"a" * 100,
+            ),
+        )
+        cache.store(
+            "b",
+            "host",
+            http.HTTPResponse(
+                status=200,
+                headers=CIMultiDict({"Content-Type": "application/json"}),
+                body=b"b" * 100,
+            ),
+        )
+        cache.get("a")
+
+        # Step 2 - Call the function
+        cache.store(
+            "c",
+            "host",
+            http.HTTPResponse(
+                status=200,
+                headers=CIMultiDict({"Content-Type": "application/json"}),
+                body=b"c" * 100,
+            ),
+        )
+
+        # Step 3 - Assert that everything works
+        assert "a" in cache
+        assert "b" not in cache
+        assert "c" in cache
+        assert cache.current_bytes <= 300
+
+    def test_no_store_is_not_cached(self):
+        """Test to ensure Cache-Control no-store responses are skipped"""
+        # Step 1 - Setup env
+        cache = http.HTTPResponseCache(max_bytes=1000, max_entries=10, default_ttl=60)
+
+        # Step 2 - Call the function
+        cache.store(
+            "key",
+            "host",
+            http.HTTPResponse(
+                status=200,
+                headers=CIMultiDict(
+                    {"Content-Type": "application/json", "Cache-Control": "no-store"}
+                ),
+                body=b"{}",
+            ),
+        )
+
+        # Step 3 - Assert that everything works
+        assert "key" not in cache
+
+    def test_host_ttl_overrides_max_age(self):
+        """Test to ensure per-host TTLs win over the max-age header"""
+        # Step 1 - Setup env
+        cache = http.HTTPResponseCache(
+            max_bytes=1000, max_entries=10, default_ttl=60, host_ttls={"host": 300}
+        )
+
+        # Step 2 - Call the function
+        ttl = cache.get_ttl("host", CIMultiDict({"Cache-Control": "max-age=0"}))
+        default_ttl = cache.get_ttl(
+            "other", CIMultiDict({"Cache-Control": "max-age=5"})
+        )
+
+        # Step 3 - Assert that everything works
+        assert ttl == 300
+        assert default_ttl == 5
+
+    def test_stale_entry_with_etag_revalidates(self):
+        """Test to ensure stale entries with an ETag are kept for revalidation"""
+        # Step 1 - Setup env
+        cache = http.HTTPResponseCache(max_bytes=1000, max_entries=10, default_ttl=60)
+        cache.store(
+            "key",
+            "host",
+            http.HTTPResponse(
+                status=200,
+                headers=CIMultiDict(
+                    {"Content-Type": "application/json", "ETag": '"v1"'}
+                ),
+                body=b"{}",
+            ),
+        )
+
+        # Step 2 - Call the function
+        with patch("time.monotonic", return_value=10**9):
+            entry = cache.get("key")
+            headers = entry.revalidation_headers()
+            stale = not entry.is_fresh()
+            cache.revalidated("key", CIMultiDict({"ETag": '"v1"'}))
+            fresh = cache.get("key").is_fresh()
+
+        # Step 3 - Assert that everything works
+        assert stale
+        assert headers == {"If-None-Match": '"v1"'}
+        assert fresh
+        assert cache.revalidations == 1
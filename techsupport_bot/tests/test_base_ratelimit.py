@@ -0,0 +1,99 @@
+"""
+This is a file to test the base/ratelimit.py file
+This contains 6 tests
+"""
+
+
+import pytest
+from base import ratelimit
+from error import HTTPRateLimit
+
+
+class Test_TokenBucket:
+    """Tests to ensure the token bucket never goes over its limit"""
+
+    def test_limit_per_window(self):
+        """Test to ensure no more than capacity tokens are handed out per window"""
+        # Step 1 - Setup env
+        bucket = ratelimit.TokenBucket(capacity=2, period=60)
+        bucket.take(now=0)
+        bucket.take(now=10)
+
+        # Step 2 - Call the function
+        wait = bucket.wait_time(now=20)
+        later_tokens = bucket.tokens(now=60)
+
+        # Step 3 - Assert that everything works
+        assert wait == 40
+        assert later_tokens == 1
+
+    def test_drain_to_remaining(self):
+        """Test to ensure API reported usage removes local tokens until reset"""
+        # Step 1 - Setup env
+        bucket = ratelimit.TokenBucket(capacity=5, period=60)
+
+        # Step 2 - Call the function
+        bucket.drain_to(remaining=1, reset_after=30, now=0)
+
+        # Step 3 - Assert that everything works
+        assert bucket.tokens(now=0) == 1
+        assert bucket.tokens(now=30) == 5
+
+    def test_block(self):
+        """Test to ensure a blocked unlimited bucket waits"""
+        # Step 1 - Setup env
+        bucket = ratelimit.TokenBucket()
+
+        # Step 2 - Call the function
+        bucket.block(10, now=0)
+
+        # Step 3 - Assert that everything works
+        assert bucket.wait_time(now=5) == 5
+        assert bucket.wait_time(now=10) == 0
+
+
+class Test_RateLimiter:
+    """Tests to ensure the rate limiter waits and rejects correctly"""
+
+    @pytest.mark.asyncio
+    async def test_waits_for_token(self):
+        """Test to ensure a call waits for a token within the deadline"""
+        # Step 1 - Setup env
+        limiter = ratelimit.RateLimiter({"host": (1, 0.05)}, max_wait=1, queue_size=5)
+        await limiter.acquire("host")
+
+        # Step 2 - Call the function
+        await limiter.acquire("host")
+
+        # Step 3 - Assert that everything works
+        assert limiter.waited == 1
+        assert limiter.rejected == 0
+
+    @pytest.mark.asyncio
+    async def test_rejects_past_deadline(self):
+        """Test to ensure calls that can't get a token in time are rejected"""
+        # Step 1 - Setup env
+        limiter = ratelimit.RateLimiter({"host": (1, 60)}, max_wait=1, queue_size=5)
+        await limiter.acquire("host")
+
+        # Step 2 - Call the function
+        with pytest.raises(HTTPRateLimit):
+            await limiter.acquire("host")
+
+        # Step 3 - Assert that everything works
+        assert limiter.rejected == 1
+        assert limiter.stats()["waiting"] == 0
+
+    def test_retry_after_blocks_api_key(self):
+        """Test to ensure a 429 with Retry-After blocks the API key bucket"""
+        # Step 1 - Setup env
+        limiter = ratelimit.RateLimiter({})
+        api_key = limiter.get_api_key(params={"appid": "secret"})
+
+        # Step 2 - Call the function
+        limiter.update_from_headers("host", api_key, 429, {"Retry-After": "120"})
+
+        # Step 3 - Assert that everything works
+        host_bucket, key_bucket = limiter.get_buckets("host", api_key)
+        assert host_bucket.wait_time() == 0
+        assert key_bucket.wait_time() > 100
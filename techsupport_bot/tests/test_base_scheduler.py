@@ -0,0 +1,88 @@
+"""
+This is a file to test the base/scheduler.py file
+This contains 4 tests
+"""
+
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from base import scheduler
+
+
+class Test_CronScheduler:
+    """Tests to ensure jobs fire from one heap and can be changed in place"""
+
+    @pytest.mark.asyncio
+    async def test_due_jobs_are_rescheduled(self):
+        """Test to ensure due jobs are taken and pushed to their next fire time"""
+        # Step 1 - Setup env
+        cron_scheduler = scheduler.CronScheduler(MagicMock())
+        cron_scheduler.start = MagicMock()
+        callback = AsyncMock()
+        job = cron_scheduler.add("a", "* * * * *", callback, payload=1)
+        first_time = job.next_time
+
+        # Step 2 - Call the function
+        due = cron_scheduler.pop_due(first_time)
+
+        # Step 3 - Assert that everything works
+        assert due == [job]
+        assert job.next_time == first_time + 60
+        assert cron_scheduler.get_timeout() > 0
+
+    @pytest.mark.asyncio
+    async def test_removed_and_paused_jobs_dont_fire(self):
+        """Test to ensure removing or pausing a job drops its heap entry"""
+        # Step 1 - Setup env
+        cron_scheduler = scheduler.CronScheduler(MagicMock())
+        cron_scheduler.start = MagicMock()
+        callback = AsyncMock()
+        removed = cron_scheduler.add("a", "* * * * *", callback)
+        paused = cron_scheduler.add("b", "* * * * *", callback)
+
+        # Step 2 - Call the function
+        cron_scheduler.remove("a")
+        cron_scheduler.pause("b")
+
+        # Step 3 - Assert that everything works
+        assert not cron_scheduler.pop_due(removed.next_time)
+        assert cron_scheduler.get_timeout() is None
+        cron_scheduler.resume("b")
+        assert cron_scheduler.pop_due(paused.next_time) == [paused]
+
+    @pytest.mark.asyncio
+    async def test_bad_cron(self):
+        """Test to ensure bad cron expressions are rejected when added"""
+        # Step 1 - Setup env
+        cron_scheduler = scheduler.CronScheduler(MagicMock())
+        cron_scheduler.start = MagicMock()
+
+        # Step 2 - Call the function
+        with pytest.raises(ValueError):
+            cron_scheduler.add("a", "not a cron", AsyncMock())
+
+        # Step 3 - Assert that everything works
+        assert "a" not in cron_scheduler
+
+    @pytest.mark.asyncio
+    async def test_run_batches_payloads(self):
+        """Test to ensure jobs due together are sent to their callback at once"""
+        # Step 1 - Setup env
+        cron_scheduler = scheduler.CronScheduler(MagicMock())
+        callback = AsyncMock()
+        for key in ["a", "b"]:
+            job = cron_scheduler.add(key, "* * * * *", callback, payload=key)
+            job.next_time = 0
+        cron_scheduler.heap = []
+        for job in cron_scheduler.jobs.values():
+            cron_scheduler.push(job)
+
+        # Step 2 - Call the function
+        await asyncio.sleep(0.1)
+        await cron_scheduler.stop()
+
+        # Step 3 - Assert that everything works
+        callback.assert_awaited_once_with(["a", "b"])
+        assert cron_scheduler.fired == 2
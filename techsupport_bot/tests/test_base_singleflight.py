@@ -0,0 +1,73 @@
+"""
+This is a file to test the base/singleflight.py file
+This contains 3 tests
+"""
+
+
+import asyncio
+
+import pytest
+from base import singleflight
+
+
+class Test_SingleFlight:
+    """Tests to ensure concurrent identical calls are coalesced"""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_calls_share_one_run(self):
+        """Test to ensure concurrent calls with the same key run once"""
+        # Step 1 - Setup env
+        flight = singleflight.SingleFlight()
+        runs = []
+
+        async def work():
+            runs.append(1)
+            await asyncio.sleep(0.01)
+            return "result"
+
+        # Step 2 - Call the function
+        results = await asyncio.gather(*(flight.run("key", work) for _ in range(5)))
+
+        # Step 3 - Assert that everything works
+        assert results == ["result"] * 5
+        assert len(runs) == 1
+        assert flight.coalesced == 4
+        assert "key" not in flight
+
+    @pytest.mark.asyncio
+    async def test_exception_is_shared(self):
+        """Test to ensure every waiting caller gets the exception"""
+        # Step 1 - Setup env
+        flight = singleflight.SingleFlight()
+
+        async def work():
+            await asyncio.sleep(0.01)
+            raise ValueError("upstream failed")
+
+        # Step 2 - Call the function
+        results = await asyncio.gather(
+            flight.run("key", work), flight.run("key", work), return_exceptions=True
+        )
+
+        # Step 3 - Assert that everything works
+        assert all(isinstance(result, ValueError) for result in results)
+        assert len(flight) == 0
+
+    @pytest.mark.asyncio
+    async def test_sequential_calls_run_again(self):
+        """Test to ensure finished calls are not reused"""
+        # Step 1 - Setup env
+        flight = singleflight.SingleFlight()
+        runs = []
+
+        async def work():
+            runs.append(1)
+            return len(runs)
+
+        # Step 2 - Call the function
+        first = await flight.run("key", work)
+        second = await flight.run("key", work)
+
+        # Step 3 - Assert that everything works
+        assert (first, second) == (1, 2)
+        assert flight.coalesced == 0
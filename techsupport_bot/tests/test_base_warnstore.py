@@ -0,0 +1,116 @@
+"""
+This is a file to test the base/warnstore.py file
+This contains 5 tests
+"""
+
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from base import warnstore
+
+
+def setup_local_store(count=2):
+    """A simple function to setup a warning store backed by a fake table
+
+    Args:
+        count (int, optional): The number of warnings user 10 starts with.
+        Defaults to 2.
+
+    Returns:
+        WarningStore: The instance of the WarningStore class
+    """
+    store = warnstore.WarningStore(MagicMock(), max_counts=2)
+    rows = [("1", "10")] * count
+
+    async def create():
+        # a yield, so concurrent writes and counts interleave like real queries
+        await asyncio.sleep(0)
+        rows.append(("1", "10"))
+
+    async def count_warnings(guild_id, user_id):
+        await asyncio.sleep(0)
+        return rows.count((guild_id, user_id))
+
+    store.model = MagicMock()
+    store.model.return_value.create = AsyncMock(side_effect=create)
+    store.model.delete.where.return_value.where.return_value.gino.status = AsyncMock()
+    store.count_warnings = AsyncMock(side_effect=count_warnings)
+    return store
+
+
+class Test_WarningStore:
+    """Tests to ensure warning counts are cached and kept up to date"""
+
+    @pytest.mark.asyncio
+    async def test_count_is_cached(self):
+        """Test to ensure the database is only counted once per user"""
+        # Step 1 - Setup env
+        store = setup_local_store()
+
+        # Step 2 - Call the function
+        first = await store.get_count("1", "10")
+        second = await store.get_count("1", "10")
+
+        # Step 3 - Assert that everything works
+        assert first == second == 2
+        store.count_warnings.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_add_warning_updates_count(self):
+        """Test to ensure a new warning bumps the cached count"""
+        # Step 1 - Setup env
+        store = setup_local_store()
+
+        # Step 2 - Call the function
+        new_count = await store.add_warning("1", "10", "reason")
+
+        # Step 3 - Assert that everything works
+        assert new_count == 3
+        assert await store.get_count("1", "10") == 3
+        store.model.return_value.create.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_concurrent_warnings_are_counted(self):
+        """Test to ensure warns given at the same time don't leave the count low"""
+        # Step 1 - Setup env
+        store = setup_local_store()
+        await store.get_count("1", "10")
+
+        # Step 2 - Call the function
+        new_counts = await asyncio.gather(
+            store.add_warning("1", "10", "first"),
+            store.add_warning("1", "10", "second"),
+        )
+
+        # Step 3 - Assert that everything works
+        assert max(new_counts) == 4
+        assert await store.get_count("1", "10") == 4
+
+    @pytest.mark.asyncio
+    async def test_clear_warnings_resets_count(self):
+        """Test to ensure clearing warnings is one delete and zeroes the count"""
+        # Step 1 - Setup env
+        store = setup_local_store()
+        await store.get_count("1", "10")
+
+        # Step 2 - Call the function
+        await store.clear_warnings("1", "10")
+
+        # Step 3 - Assert that everything works
+        assert await store.get_count("1", "10") == 0
+        store.model.delete.where.return_value.where.return_value.gino.status.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_counts_are_bounded(self):
+        """Test to ensure the least recently used counts are evicted"""
+        # Step 1 - Setup env
+        store = setup_local_store()
+
+        # Step 2 - Call the function
+        for user_id in ["10", "20", "30"]:
+            await store.get_count("1", user_id)
+
+        # Step 3 - Assert that everything works
+        assert list(store.counts) == [("1", "20"), ("1", "30")]
@@ -0,0 +1,184 @@
+"""
+This is a file to test the botlogging/delayed.py file
+This contains 8 tests
+"""
+
+
+from unittest.mock import AsyncMock, MagicMock
+
+import botlogging
+import botlogging.embed as embed_lib
+import discord
+import pytest
+from botlogging import delayed
+
+from .helpers import MockChannel, MockMember
+
+
+class Test_DelayedLogger:
+    """Tests to ensure queued logs are merged, packed and never block"""
+
+    def test_repeated_logs_are_merged(self):
+        """Test to ensure identical logs become a counter"""
+        # Step 1 - Setup env
+        logger = botlogging.DelayedLogger(bot=MagicMock(), send=True, wait_time=0)
+        logger.register_queue()
+        target = MockChannel(id=1)
+
+        # Step 2 - Call the function
+        for _ in range(3):
+            logger.add_pending(
+                delayed.QueuedLog(target, embed_lib.from_level_name("oops", "info"))
+            )
+
+        # Step 3 - Assert that everything works
+        assert len(logger.pending[1]) == 1
+        assert logger.pending[1][0].get_embed().title == "INFO (x3)"
+
+    def test_embeds_are_packed(self):
+        """Test to ensure lone embeds are packed ten to a message"""
+        # Step 1 - Setup env
+        logger = botlogging.DelayedLogger(bot=MagicMock(), send=True, wait_time=0)
+        logger.register_queue()
+        target = MockChannel(id=1)
+        for i in range(12):
+            logger.add_pending(
+                delayed.QueuedLog(target, embed_lib.from_level_name(str(i), "info"))
+            )
+
+        # Step 2 - Call the function
+        first_batch = logger.take_batch(1)
+        second_batch = logger.take_batch(1)
+
+        # Step 3 - Assert that everything works
+        assert len(first_batch) == 10
+        assert len(second_batch) == 2
+
+    def test_logs_with_followups_are_sent_alone(self):
+        """Test to ensure error logs with tracebacks are not packed"""
+        # Step 1 - Setup env
+        logger = botlogging.DelayedLogger(bot=MagicMock(), send=True, wait_time=0)
+        logger.register_queue()
+        target = MockChannel(id=1)
+        logger.add_pending(
+            delayed.QueuedLog(
+                target, embed_lib.from_level_name("error", "error"), followups=["tb"]
+            )
+        )
+        logger.add_pending(
+            delayed.QueuedLog(target, embed_lib.from_level_name("info", "info"))
+        )
+
+        # Step 2 - Call the function
+        batch = logger.take_batch(1)
+
+        # Step 3 - Assert that everything works
+        assert len(batch) == 1
+        assert batch[0].followups == ["tb"]
+
+    @pytest.mark.asyncio
+    async def test_full_queue_drops_and_reports(self):
+        """Test to ensure a full queue drops logs instead of blocking"""
+        # Step 1 - Setup env
+        logger = botlogging.DelayedLogger(
+            bot=MagicMock(), send=True, wait_time=0, queue_size=1
+        )
+        logger.register_queue()
+        owner = MockMember(id=2)
+        owner.send = AsyncMock()
+        logger.bot.get_owner = AsyncMock(return_value=owner)
+        target = MockChannel(id=1)
+        target.send = AsyncMock()
+
+        # Step 2 - Call the function
+        await logger.deliver(target, embed=embed_lib.from_level_name("a", "info"))
+        await logger.deliver(target, embed=embed_lib.from_level_name("b", "info"))
+        await logger.run_once()
+
+        # Step 3 - Assert that everything works
+        assert logger.dropped == 0
+        target.send.assert_awaited_once()
+        assert 2 in logger.pending
+
+    def test_logs_with_different_fields_are_kept(self):
+        """Test to ensure logs that only differ by their fields are not merged"""
+        # Step 1 - Setup env
+        logger = botlogging.DelayedLogger(bot=MagicMock(), send=True, wait_time=0)
+        logger.register_queue()
+        target = MockChannel(id=1)
+
+        # Step 2 - Call the function
+        for user in ["a", "b"]:
+            embed = embed_lib.from_level_name("command", "info")
+            embed.add_field(name="User", value=user)
+            logger.add_pending(delayed.QueuedLog(target, embed))
+
+        # Step 3 - Assert that everything works
+        assert len(logger.pending[1]) == 2
+
+    def test_repeat_after_send_is_queued_again(self):
+        """Test to ensure a log taken to be sent is no longer merged into"""
+        # Step 1 - Setup env
+        logger = botlogging.DelayedLogger(bot=MagicMock(), send=True, wait_time=0)
+        logger.register_queue()
+        target = MockChannel(id=1)
+        target.send = AsyncMock()
+        logger.add_pending(
+            delayed.QueuedLog(target, embed_lib.from_level_name("message", "info"))
+        )
+        logger.take_batch(1)
+
+        # Step 2 - Call the function
+        logger.add_pending(
+            delayed.QueuedLog(target, embed_lib.from_level_name("message", "info"))
+        )
+
+        # Step 3 - Assert that everything works
+        assert len(logger.pending[1]) == 1
+        assert logger.pending[1][0].count == 1
+
+    def test_batches_fit_the_character_limit(self):
+        """Test to ensure a batch stops before the embeds pass 6000 characters"""
+        # Step 1 - Setup env
+        logger = botlogging.DelayedLogger(bot=MagicMock(), send=True, wait_time=0)
+        logger.register_queue()
+        target = MockChannel(id=1)
+        for i in range(4):
+            logger.add_pending(
+                delayed.QueuedLog(
+                    target, embed_lib.from_level_name(str(i) * 2000, "info")
+                )
+            )
+
+        # Step 2 - Call the function
+        batch = logger.take_batch(1)
+
+        # Step 3 - Assert that everything works
+        assert len(batch) == 2
+        assert sum(len(log.get_embed()) for log in batch) <= 6000
+
+    @pytest.mark.asyncio
+    async def test_failed_batch_is_sent_one_at_a_time(self):
+        """Test to ensure the logs of a rejected batch are not dropped"""
+        # Step 1 - Setup env
+        logger = botlogging.DelayedLogger(bot=MagicMock(), send=True, wait_time=0)
+        logger.register_queue()
+        target = MockChannel(id=1)
+        target.send = AsyncMock(
+            side_effect=[
+                discord.HTTPException(MagicMock(status=400), "too big"),
+                None,
+                None,
+            ]
+        )
+        batch = [
+            delayed.QueuedLog(target, embed_lib.from_level_name(str(i), "info"))
+            for i in range(2)
+        ]
+
+        # Step 2 - Call the function
+        await logger.send_batch(batch)
+
+        # Step 3 - Assert that everything works
+        assert target.send.await_count == 3
+        assert "embed" in target.send.await_args_list[1].kwargs
@@ -0,0 +1,91 @@
+"""
+This is a file to test the botlogging/logger.py file
+This contains 4 tests
+"""
+
+
+import logging
+from unittest.mock import AsyncMock, MagicMock
+
+import botlogging
+import pytest
+from botlogging import logger as logger_lib
+
+from .helpers import MockMember
+
+
+def setup_local_logger(fire_and_forget=True):
+    """A simple function to setup a logger that sends to a fake owner
+
+    Args:
+        fire_and_forget (bool, optional): If sends should be scheduled in the
+        background. Defaults to True.
+
+    Returns:
+        tuple: The instance of the BotLogger class and the fake owner
+    """
+    bot = MagicMock()
+    owner = MockMember(id=1)
+    owner.send = AsyncMock()
+    bot.get_owner = AsyncMock(return_value=owner)
+    logger = botlogging.BotLogger(
+        bot=bot, name="test_logger", send=True, fire_and_forget=fire_and_forget
+    )
+    return logger, owner
+
+
+class Test_BotLogger:
+    """Tests to ensure logging doesn't wait on Discord"""
+
+    def test_skipped_below_level(self):
+        """Test to ensure console only logs below the level do nothing"""
+        # Step 1 - Setup env
+        logger, _ = setup_local_logger()
+        logger.console.setLevel(logging.INFO)
+
+        # Step 2 - Call the function
+        result = logger.debug("not shown")
+
+        # Step 3 - Assert that everything works
+        assert result is logger_lib.DONE
+
+    @pytest.mark.asyncio
+    async def test_fire_and_forget_enqueues(self):
+        """Test to ensure Discord logs are queued instead of sent inline"""
+        # Step 1 - Setup env
+        logger, owner = setup_local_logger()
+        logger.register_record_queue()
+
+        # Step 2 - Call the function
+        await logger.info("sent later", send=True)
+
+        # Step 3 - Assert that everything works
+        assert logger.records.qsize() == 1
+        owner.send.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_worker_sends_record(self):
+        """Test to ensure queued logs are sent to the owner"""
+        # Step 1 - Setup env
+        logger, owner = setup_local_logger()
+        logger.register_record_queue()
+        await logger.error("broke", exception=ValueError("bad"))
+
+        # Step 2 - Call the function
+        await logger.send_record(logger.records.get_nowait())
+
+        # Step 3 - Assert that everything works
+        assert owner.send.await_count == 2
+        assert owner.send.await_args_list[0].kwargs["embed"].description == "broke"
+
+    @pytest.mark.asyncio
+    async def test_inline_without_fire_and_forget(self):
+        """Test to ensure logs are sent inline when fire and forget is off"""
+        # Step 1 - Setup env
+        logger, owner = setup_local_logger(fire_and_forget=False)
+
+        # Step 2 - Call the function
+        await logger.warning("sent now", send=True)
+
+        # Step 3 - Assert that everything works
+        owner.send.assert_awaited_once()
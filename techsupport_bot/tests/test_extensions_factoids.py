@@ -0,0 +1,467 @@
+"""
+This is a file to test the extensions/factoids.py file
+This contains 20 tests
+"""
+
+
+import json
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+import sqlalchemy
+import yaml
+from extensions import factoids
+
+from .helpers import MockFactoid
+
+
+def setup_local_extension(bot=None):
+    """A simple function to setup an instance of the factoid extension
+    The preconfig needs the database, so only the state it sets up is created
+
+    Args:
+        bot (MagicMock, optional): A fake bot object. Defaults to None.
+
+    Returns:
+        FactoidManager: The instance of the FactoidManager class
+    """
+    with patch("asyncio.create_task", return_value=None):
+        manager = factoids.FactoidManager(bot)
+    manager.factoid_index = factoids.FactoidIndex()
+    manager.factoid_export_cache = {}
+    manager.factoid_usage = {}
+    return manager
+
+
+class Test_FactoidIndex:
+    """Tests to ensure factoids are found without going to the DB"""
+
+    def test_load_and_get(self):
+        """Test to ensure loaded factoids are found by guild and name"""
+        # Step 1 - Setup env
+        index = factoids.FactoidIndex()
+
+        # Step 2 - Call the function
+        index.load(
+            [
+                MockFactoid(name="a", guild="1", message="a"),
+                MockFactoid(name="a", guild="2", message="a"),
+            ]
+        )
+
+        # Step 3 - Assert that everything works
+        assert index.get("1", "A").guild == "1"
+        assert index.get("2", "a").guild == "2"
+        assert len(index) == 2
+
+    def test_complete_index_misses(self):
+        """Test to ensure a complete index knows unindexed factoids don't exist"""
+        # Step 1 - Setup env
+        index = factoids.FactoidIndex()
+
+        # Step 2 - Call the function
+        before_load = index.is_missing("1", "typo")
+        index.load([MockFactoid(name="a", guild="1", message="a")])
+
+        # Step 3 - Assert that everything works
+        assert not before_load
+        assert index.is_missing("1", "typo")
+        assert not index.is_missing("1", "a")
+
+    def test_negative_lookups(self):
+        """Test to ensure misses are remembered until the factoid is added"""
+        # Step 1 - Setup env
+        index = factoids.FactoidIndex()
+        index.add_missing("1", "Typo")
+
+        # Step 2 - Call the function
+        missing = index.is_missing("1", "typo")
+        index.add(MockFactoid(name="typo", guild="1", message="typo"))
+
+        # Step 3 - Assert that everything works
+        assert missing
+        assert not index.is_missing("1", "typo")
+
+    def test_remove(self):
+        """Test to ensure removed factoids are no longer found"""
+        # Step 1 - Setup env
+        index = factoids.FactoidIndex()
+        index.load(
+            [
+                MockFactoid(name="a", guild="1", message="a"),
+                MockFactoid(name="b", guild="1", message="b", alias="a"),
+            ]
+        )
+
+        # Step 2 - Call the function
+        index.remove("1", "b")
+
+        # Step 3 - Assert that everything works
+        assert index.get("1", "b") is None
+        assert index.is_missing("1", "b")
+        assert index.get("1", "a").name == "a"
+
+
+class Test_FactoidSearch:
+    """Tests to ensure factoid searches are ranked and kept up to date"""
+
+    def test_name_search(self):
+        """Test to ensure name matches are ranked and skip aliases and hidden ones"""
+        # Step 1 - Setup env
+        search = factoids.FactoidSearch()
+        for factoid in [
+            MockFactoid(name="xwindows", guild="1", message="xwindows"),
+            MockFactoid(name="windows", guild="1", message="windows"),
+            MockFactoid(name="windows11", guild="1", message="windows11"),
+            MockFactoid(name="win", guild="1", message="win", alias="windows"),
+            MockFactoid(name="windowsold", guild="1", message="windowsold"),
+        ]:
+            search.add(factoid)
+        search.add(
+            MockFactoid(name="windowsold", guild="1", message="windowsold", hidden=True)
+        )
+
+        # Step 2 - Call the function
+        matches = search.search_names("1", "windows")
+
+        # Step 3 - Assert that everything works
+        assert matches == ["windows", "windows11", "xwindows"]
+
+    def test_content_search(self):
+        """Test to ensure content matches use the embed values but not its keys"""
+        # Step 1 - Setup env
+        search = factoids.FactoidSearch()
+        search.add(
+            MockFactoid(
+                name="embedded",
+                guild="1",
+                message="embedded",
+                embed_config='{"title": "Install drivers", "description": "driver"}',
+            )
+        )
+        search.add(MockFactoid(name="plain", guild="1", message="update the driver"))
+
+        # Step 2 - Call the function
+        matches = search.search_content("1", "driver")
+        keys = search.search_content("1", "title")
+
+        # Step 3 - Assert that everything works
+        assert matches == ["embedded", "plain"]
+        assert keys == []
+
+    def test_modified_factoid_is_reindexed(self):
+        """Test to ensure replacing a factoid removes its old words"""
+        # Step 1 - Setup env
+        index = factoids.FactoidIndex()
+        index.load([MockFactoid(name="a", guild="1", message="old words")])
+
+        # Step 2 - Call the function
+        index.add(MockFactoid(name="a", guild="1", message="new words"))
+
+        # Step 3 - Assert that everything works
+        assert index.search.search_content("1", "old") == []
+        assert index.search.search_content("1", "new") == ["a"]
+
+    def test_suggest(self):
+        """Test to ensure unknown factoid calls get a close name suggested"""
+        # Step 1 - Setup env
+        search = factoids.FactoidSearch()
+        search.add(MockFactoid(name="linux", guild="1", message="linux"))
+        search.add(MockFactoid(name="windows", guild="1", message="windows"))
+
+        # Step 2 - Call the function
+        suggestion = search.suggest("1", "windwos")
+        nothing = search.suggest("1", "macos")
+
+        # Step 3 - Assert that everything works
+        assert suggestion == "windows"
+        assert nothing is None
+
+
+class Test_FactoidExport:
+    """Tests to ensure factoid exports are rendered and cached per version"""
+
+    def test_yaml_export(self):
+        """Test to ensure the yaml export lists parents with their aliases"""
+        # Step 1 - Setup env
+        manager = setup_local_extension(MagicMock())
+        manager.factoid_index.load(
+            [
+                MockFactoid(name="b", guild="1", message="b"),
+                MockFactoid(name="a", guild="1", message="a"),
+                MockFactoid(name="c", guild="1", message="c", alias="a"),
+            ]
+        )
+        ctx = MagicMock()
+        ctx.guild.id = 1
+
+        # Step 2 - Call the function
+        content = manager.get_factoid_export(ctx, "yaml", False)
+
+        # Step 3 - Assert that everything works
+        assert yaml.safe_load(content) == [
+            {"a": {"message": "a", "embed": False, "aliases": "c"}},
+            {"b": {"message": "b", "embed": False}},
+        ]
+
+    def test_json_export(self):
+        """Test to ensure the json export only lists the hidden factoids if asked"""
+        # Step 1 - Setup env
+        manager = setup_local_extension(MagicMock())
+        manager.factoid_index.load(
+            [
+                MockFactoid(name="a", guild="1", message="a"),
+                MockFactoid(name="b", guild="1", message="b", hidden=True),
+            ]
+        )
+        ctx = MagicMock()
+        ctx.guild.id = 1
+
+        # Step 2 - Call the function
+        content = manager.get_factoid_export(ctx, "json", True)
+
+        # Step 3 - Assert that everything works
+        assert json.loads(content) == [
+            {"b": {"message": "b", "embed": False, "hidden": True}}
+        ]
+
+    def test_export_cached_until_write(self):
+        """Test to ensure the export is only rendered again after a write"""
+        # Step 1 - Setup env
+        manager = setup_local_extension(MagicMock())
+        manager.factoid_index.load([MockFactoid(name="a", guild="1", message="a")])
+        ctx = MagicMock()
+        ctx.guild.id = 1
+        first = manager.get_factoid_export(ctx, "html", False)
+
+        # Step 2 - Call the function
+        cached = manager.get_factoid_export(ctx, "html", False)
+        manager.factoid_index.add(MockFactoid(name="b", guild="1", message="b"))
+        rendered = manager.get_factoid_export(ctx, "html", False)
+
+        # Step 3 - Assert that everything works
+        assert cached is first
+        assert "<li><code>b - b</code></li>" in rendered
+        assert "<li><code>b - b</code></li>" not in first
+
+
+class Test_FactoidEmbeds:
+    """Tests to ensure factoid embeds are parsed once and validated up front"""
+
+    def test_embed_parsed_once(self):
+        """Test to ensure the parsed embed is reused as a copy until a write"""
+        # Step 1 - Setup env
+        factoid = MockFactoid(
+            name="a", guild="1", message="a", embed_config='{"title": "old"}'
+        )
+        index = factoids.FactoidIndex()
+        index.load([factoid])
+
+        # Step 2 - Call the function
+        first = index.get_embed(factoid)
+        first.title = "changed"
+        second = index.get_embed(factoid)
+        factoid.embed_config = '{"title": "new"}'
+        index.add(factoid)
+        third = index.get_embed(factoid)
+
+        # Step 3 - Assert that everything works
+        assert second.title == "old"
+        assert third.title == "new"
+
+    def test_check_valid_embed_config(self):
+        """Test to ensure embeds that can't be sent are rejected"""
+        # Step 1 - Setup env
+        manager = setup_local_extension(MagicMock())
+
+        # Step 2 - Call the function
+        valid = manager.check_valid_embed_config('{"title": "a"}')
+        not_json = manager.check_valid_embed_config("{")
+        a_list = manager.check_valid_embed_config('[{"title": "a"}]')
+        too_long = manager.check_valid_embed_config(json.dumps({"title": "a" * 257}))
+
+        # Step 3 - Assert that everything works
+        assert valid is None
+        assert "not valid JSON" in not_json
+        assert "single" in a_list
+        assert "title" in too_long
+
+
+class Test_FactoidImport:
+    """Tests to ensure imported files are validated as a whole in memory"""
+
+    def test_export_round_trip(self):
+        """Test to ensure a yaml export can be imported again"""
+        # Step 1 - Setup env
+        exporter = setup_local_extension(MagicMock())
+        exporter.factoid_index.load(
+            [
+                MockFactoid(
+                    name="a", guild="1", message="a", embed_config='{"title": "a"}'
+                ),
+                MockFactoid(name="b", guild="1", message="b", alias="a"),
+            ]
+        )
+        ctx = MagicMock()
+        ctx.guild.id = 1
+        data = yaml.safe_load(exporter.get_factoid_export(ctx, "yaml", False))
+        importer = setup_local_extension(MagicMock())
+
+        # Step 2 - Call the function
+        rows, errors = importer.get_import_rows("2", data)
+
+        # Step 3 - Assert that everything works
+        assert not errors
+        assert [(row["name"], row["alias"]) for row in rows] == [
+            ("a", None),
+            ("b", "a"),
+        ]
+        assert rows[0]["embed_config"] == '{"title": "a"}'
+
+    def test_invalid_entries_skipped(self):
+        """Test to ensure existing, duplicate and invalid factoids are skipped"""
+        # Step 1 - Setup env
+        manager = setup_local_extension(MagicMock())
+        manager.factoid_index.load([MockFactoid(name="old", guild="1", message="old")])
+        data = [
+            {"old": {"message": "again"}},
+            {"new": {"message": "new"}},
+            {"bad name": {"message": "x"}},
+            {"empty": {}},
+        ]
+
+        # Step 2 - Call the function
+        rows, errors = manager.get_import_rows("1", data)
+
+        # Step 3 - Assert that everything works
+        assert [row["name"] for row in rows] == ["new"]
+        assert len(errors) == 3
+
+    def test_alias_recursion(self):
+        """Test to ensure aliases can't be factoids or belong to two parents"""
+        # Step 1 - Setup env
+        manager = setup_local_extension(MagicMock())
+        manager.factoid_index.load(
+            [MockFactoid(name="taken", guild="1", message="taken")]
+        )
+        data = {
+            "a": {"message": "a", "aliases": "b, c, taken"},
+            "b": {"message": "b", "aliases": ["c", "a", "d"]},
+        }
+
+        # Step 2 - Call the function
+        rows, errors = manager.get_import_rows("1", data)
+
+        # Step 3 - Assert that everything works
+        assert [(row["name"], row["alias"]) for row in rows] == [
+            ("a", None),
+            ("b", None),
+            ("c", "a"),
+            ("d", "b"),
+        ]
+        assert len(errors) == 4
+
+
+class Test_AliasGraph:
+    """Tests to ensure alias questions are answered from the index"""
+
+    def test_get_aliases(self):
+        """Test to ensure aliases follow renames and re-parenting"""
+        # Step 1 - Setup env
+        index = factoids.FactoidIndex()
+        alias = MockFactoid(name="b", guild="1", message="b", alias="a")
+        index.load(
+            [
+                MockFactoid(name="a", guild="1", message="a"),
+                alias,
+                MockFactoid(name="c", guild="1", message="c", alias="a"),
+            ]
+        )
+
+        # Step 2 - Call the function
+        before = [factoid.name for factoid in index.get_aliases("1", "a")]
+        alias.alias = "d"
+        index.add(alias)
+        index.remove("1", "c")
+
+        # Step 3 - Assert that everything works
+        assert before == ["b", "c"]
+        assert index.get_aliases("1", "a") == []
+        assert index.get_aliases("1", "d") == [alias]
+
+    def test_canonical_name_and_cycles(self):
+        """Test to ensure alias chains are followed and loops are caught"""
+        # Step 1 - Setup env
+        index = factoids.FactoidIndex()
+        index.load(
+            [
+                MockFactoid(name="a", guild="1", message="a"),
+                MockFactoid(name="b", guild="1", message="b", alias="a"),
+            ]
+        )
+
+        # Step 2 - Call the function
+        canonical = index.get_canonical_name("1", "B")
+        cycle = index.would_create_cycle("1", "a", "b")
+        no_cycle = index.would_create_cycle("1", "c", "b")
+
+        # Step 3 - Assert that everything works
+        assert canonical == "a"
+        assert cycle
+        assert not no_cycle
+
+
+class Test_FactoidUsage:
+    """Tests to ensure factoid calls are counted in memory and written in batches"""
+
+    @pytest.mark.asyncio
+    async def test_usage_flushed_once(self):
+        """Test to ensure many calls become one upsert"""
+        # Step 1 - Setup env
+        bot = MagicMock()
+        bot.db.status = AsyncMock()
+        manager = setup_local_extension(bot)
+        manager.models.FactoidUsage = MagicMock()
+        manager.models.FactoidUsage.__table__ = sqlalchemy.Table(
+            "factoid_usage",
+            sqlalchemy.MetaData(),
+            sqlalchemy.Column("factoid_id", sqlalchemy.Integer, primary_key=True),
+            sqlalchemy.Column("uses", sqlalchemy.Integer),
+            sqlalchemy.Column("last_used", sqlalchemy.DateTime),
+        )
+        for factoid_id in [1, 1, 2]:
+            manager.record_usage(MockFactoid(factoid_id=factoid_id))
+
+        # Step 2 - Call the function
+        await manager.flush_usage()
+        await manager.flush_usage()
+
+        # Step 3 - Assert that everything works
+        bot.db.status.assert_awaited_once()
+        assert manager.factoid_usage == {}
+
+    @pytest.mark.asyncio
+    async def test_failed_flush_keeps_usage(self):
+        """Test to ensure counts aren't lost when the DB write fails"""
+        # Step 1 - Setup env
+        bot = MagicMock()
+        bot.logger.error = AsyncMock()
+        bot.db.status = AsyncMock(side_effect=OSError)
+        manager = setup_local_extension(bot)
+        manager.models.FactoidUsage = MagicMock()
+        manager.models.FactoidUsage.__table__ = sqlalchemy.Table(
+            "factoid_usage",
+            sqlalchemy.MetaData(),
+            sqlalchemy.Column("factoid_id", sqlalchemy.Integer, primary_key=True),
+            sqlalchemy.Column("uses", sqlalchemy.Integer),
+            sqlalchemy.Column("last_used", sqlalchemy.DateTime),
+        )
+        manager.record_usage(MockFactoid(factoid_id=1))
+        manager.record_usage(MockFactoid(factoid_id=1))
+
+        # Step 2 - Call the function
+        await manager.flush_usage()
+
+        # Step 3 - Assert that everything works
+        assert manager.factoid_usage[1]["uses"] == 2
+        bot.logger.error.assert_awaited_once()
@@ -0,0 +1,389 @@
+"""
+This is a file to test the extensions/protect.py file
+This contains 13 tests
+"""
+
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from extensions import protect
+
+from .helpers import MockGuildConfig, MockMessage, MockRawMessageUpdateEvent
+
+
+def setup_local_extension(bot=None):
+    """A simple function to setup an instance of the protect extension
+
+    Args:
+        bot (MagicMock, optional): A fake bot object. Defaults to None.
+
+    Returns:
+        Protector: The instance of the Protector class
+    """
+    with patch("asyncio.create_task", return_value=None):
+        return protect.Protector(bot)
+
+
+class Test_KeywordAutomaton:
+    """Tests to ensure every keyword is found in one pass"""
+
+    def test_overlapping_keywords(self):
+        """Test to ensure keywords inside other keywords are all found"""
+        # Step 1 - Setup env
+        automaton = protect.KeywordAutomaton(
+            [(0, "he"), (1, "she"), (2, "hers"), (3, "his")]
+        )
+
+        # Step 2 - Call the function
+        found = automaton.search("ushers")
+
+        # Step 3 - Assert that everything works
+        assert found == {0, 1, 2}
+
+
+class Test_ProtectRuleSet:
+    """Tests to ensure the compiled string map matches like the config says"""
+
+    def test_case_sensitivity(self):
+        """Test to ensure only sensitive keywords ignore case"""
+        # Step 1 - Setup env
+        rule_set = protect.ProtectRuleSet(
+            MockGuildConfig(
+                guild_id="1",
+                config_version=1,
+                extensions={
+                    "protect": {
+                        "string_map": {
+                            "value": {
+                                "Bad": {"message": "a"},
+                                "Worse": {"sensitive": True},
+                            }
+                        }
+                    }
+                },
+            )
+        )
+
+        # Step 2 - Call the function
+        triggered = rule_set.search("bad and worse")
+
+        # Step 3 - Assert that everything works
+        assert triggered.trigger == "Worse"
+
+    def test_delete_rule_wins(self):
+        """Test to ensure the first deleting rule is returned over later rules"""
+        # Step 1 - Setup env
+        rule_set = protect.ProtectRuleSet(
+            MockGuildConfig(
+                guild_id="1",
+                config_version=1,
+                extensions={
+                    "protect": {
+                        "string_map": {
+                            "value": {
+                                "one": {"message": "a"},
+                                "two": {"message": "b", "delete": True},
+                                "three": {"regex": "thr+ee"},
+                            }
+                        }
+                    }
+                },
+            )
+        )
+
+        # Step 2 - Call the function
+        triggered = rule_set.search("one two threee")
+
+        # Step 3 - Assert that everything works
+        assert triggered.trigger == "two"
+        assert rule_set.search("one threee").trigger == "three"
+        assert rule_set.search("nothing") is None
+
+    def test_bad_regex(self):
+        """Test to ensure bad patterns are reported and skipped"""
+        # Step 1 - Setup env
+        config = MockGuildConfig(
+            guild_id="1",
+            config_version=1,
+            extensions={
+                "protect": {
+                    "string_map": {
+                        "value": {"bad": {"regex": "("}, "good": {"regex": r"(a)\1"}}
+                    }
+                }
+            },
+        )
+
+        # Step 2 - Call the function
+        rule_set = protect.ProtectRuleSet(config)
+
+        # Step 3 - Assert that everything works
+        assert len(rule_set.errors) == 1
+        assert rule_set.combined_regex is None
+        assert rule_set.search("aa").trigger == "good"
+
+    def test_is_current(self):
+        """Test to ensure the rules are compiled again when the config changes"""
+        # Step 1 - Setup env
+        config = MockGuildConfig(
+            guild_id="1",
+            config_version=1,
+            extensions={"protect": {"string_map": {"value": {"one": {}}}}},
+        )
+        rule_set = protect.ProtectRuleSet(config)
+
+        # Step 2 - Call the function
+        new_config = MockGuildConfig(
+            guild_id="1",
+            config_version=2,
+            extensions={"protect": {"string_map": {"value": {"one": {}}}}},
+        )
+
+        # Step 3 - Assert that everything works
+        assert rule_set.is_current(config)
+        assert not rule_set.is_current(new_config)
+
+
+class Test_RegexSandbox:
+    """Tests to ensure regexes run in the sandbox with a time budget"""
+
+    @pytest.mark.asyncio
+    async def test_profiles_matches(self):
+        """Test to ensure sandboxed regexes match and record their times"""
+        # Step 1 - Setup env
+        rule_set = protect.ProtectRuleSet(
+            MockGuildConfig(
+                guild_id="1",
+                config_version=1,
+                extensions={
+                    "protect": {"string_map": {"value": {"one": {"regex": "o+ne"}}}}
+                },
+            )
+        )
+        sandbox = protect.RegexSandbox(workers=1, budget=5, strikes=1)
+
+        # Step 2 - Call the function
+        try:
+            matched, quarantined = await sandbox.search(rule_set, "a oone")
+        finally:
+            await sandbox.close()
+
+        # Step 3 - Assert that everything works
+        assert matched == {0}
+        assert not quarantined
+        profiles = sandbox.get_guild_profiles("1")
+        assert profiles[0][0] == ("1", "one", "o+ne")
+        assert len(profiles[0][1].samples) == 1
+
+    @pytest.mark.asyncio
+    async def test_quarantines_slow_regex(self):
+        """Test to ensure a regex that blows the budget is quarantined"""
+        # Step 1 - Setup env
+        rule_set = protect.ProtectRuleSet(
+            MockGuildConfig(
+                guild_id="1",
+                config_version=1,
+                extensions={
+                    "protect": {
+                        "string_map": {
+                            "value": {
+                                "slow": {"regex": "(a+)+$"},
+                                "fast": {"regex": "b"},
+                            }
+                        }
+                    }
+                },
+            )
+        )
+        sandbox = protect.RegexSandbox(workers=1, budget=0.5, strikes=1)
+
+        # Step 2 - Call the function
+        try:
+            matched, quarantined = await sandbox.search(rule_set, "a" * 40 + "b!")
+            next_matched, _ = await sandbox.search(rule_set, "b")
+        finally:
+            await sandbox.close()
+
+        # Step 3 - Assert that everything works
+        assert matched == {1}
+        assert quarantined == [("1", "slow", "(a+)+$")]
+        assert next_matched == {1}
+
+    @pytest.mark.asyncio
+    async def test_other_guilds_dont_get_strikes(self):
+        """Test to ensure a slow regex can't give strikes to rules it shares the pool with,
+        and only the messages that owned a timeout run their regexes alone"""
+        # Step 1 - Setup env
+        slow_rules = protect.ProtectRuleSet(
+            MockGuildConfig(
+                guild_id="1",
+                config_version=1,
+                extensions={
+                    "protect": {"string_map": {"value": {"slow": {"regex": "(a+)+$"}}}}
+                },
+            )
+        )
+        fast_rules = protect.ProtectRuleSet(
+            MockGuildConfig(
+                guild_id="2",
+                config_version=1,
+                extensions={
+                    "protect": {"string_map": {"value": {"hello": {"regex": "hello"}}}}
+                },
+            )
+        )
+        sandbox = protect.RegexSandbox(workers=2, budget=0.5, strikes=2)
+        sandbox.run_alone = AsyncMock(wraps=sandbox.run_alone)
+        paste = "a" * 40 + "!"
+
+        # Step 2 - Call the function
+        try:
+            results = await asyncio.gather(
+                *[sandbox.search(slow_rules, paste) for _ in range(2)],
+                *[sandbox.search(fast_rules, "hello " + paste) for _ in range(3)],
+            )
+        finally:
+            await sandbox.close()
+
+        # Step 3 - Assert that everything works
+        assert [matched for matched, _ in results[2:]] == [{0}, {0}, {0}]
+        assert sandbox.run_alone.await_count == 2
+        assert list(sandbox.offences) == [("1", "slow", "(a+)+$")]
+        assert sandbox.quarantined == {("1", "slow", "(a+)+$")}
+
+    def test_offences_decay(self):
+        """Test to ensure old strikes don't count towards a quarantine"""
+        # Step 1 - Setup env
+        sandbox = protect.RegexSandbox(workers=1, budget=1, strikes=2)
+        key = ("1", "rule", "a")
+        sandbox.add_offence(key)
+        sandbox.offences[key][0] -= sandbox.offence_seconds + 1
+
+        # Step 2 - Call the function
+        quarantine = sandbox.add_offence(key)
+
+        # Step 3 - Assert that everything works
+        assert not quarantine
+        assert len(sandbox.offences[key]) == 1
+
+
+class Test_RawMessageEdit:
+    """Tests to ensure edits that can't need a scan are skipped without any I/O"""
+
+    @pytest.mark.asyncio
+    async def test_unprotected_channel(self):
+        """Test to ensure edits in unprotected channels don't get the config"""
+        # Step 1 - Setup env
+        bot = MagicMock()
+        bot.get_context_config = AsyncMock()
+        bot.guild_config_cache.peek.return_value = {"config_version": 1}
+        protector = setup_local_extension(bot)
+        protector.protected_channels = {"1": (1, {"10"})}
+        protector.scanned_contents = {}
+        payload = MockRawMessageUpdateEvent(
+            guild_id=1, channel_id=20, message_id=5, data={"id": "5", "content": "new"}
+        )
+
+        # Step 2 - Call the function
+        await protector.on_raw_message_edit(payload)
+
+        # Step 3 - Assert that everything works
+        bot.get_context_config.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_changed_config_is_checked(self):
+        """Test to ensure known channels are ignored once the config version changes"""
+        # Step 1 - Setup env
+        bot = MagicMock()
+        bot.guild_config_cache.peek.return_value = {"config_version": 2}
+        bot.get_guild.return_value = None
+        protector = setup_local_extension(bot)
+        protector.protected_channels = {"1": (1, {"10"})}
+        protector.scanned_contents = {}
+        payload = MockRawMessageUpdateEvent(
+            guild_id=1, channel_id=20, message_id=5, data={"id": "5", "content": "new"}
+        )
+
+        # Step 2 - Call the function
+        await protector.on_raw_message_edit(payload)
+
+        # Step 3 - Assert that everything works
+        bot.get_guild.assert_called_once_with(1)
+
+    @pytest.mark.asyncio
+    async def test_embed_only_edit(self):
+        """Test to ensure edits without new content are skipped"""
+        # Step 1 - Setup env
+        bot = MagicMock()
+        bot.get_context_config = AsyncMock()
+        bot.guild_config_cache.peek.return_value = {"config_version": 1}
+        protector = setup_local_extension(bot)
+        protector.protected_channels = {"1": (1, {"10"})}
+        protector.scanned_contents = {5: "scanned"}
+        payloads = [
+            MockRawMessageUpdateEvent(
+                guild_id=1, channel_id=10, message_id=5, data={"id": "5"}
+            ),
+            MockRawMessageUpdateEvent(
+                guild_id=1,
+                channel_id=10,
+                message_id=5,
+                data={"id": "5", "content": "same"},
+                cached_message=MockMessage(content="same"),
+            ),
+            MockRawMessageUpdateEvent(
+                guild_id=1,
+                channel_id=10,
+                message_id=5,
+                data={"id": "5", "content": "scanned"},
+            ),
+        ]
+
+        # Step 2 - Call the function
+        for payload in payloads:
+            await protector.on_raw_message_edit(payload)
+
+        # Step 3 - Assert that everything works
+        bot.get_context_config.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_uses_cached_message(self):
+        """Test to ensure a changed message is scanned without fetching it"""
+        # Step 1 - Setup env
+        channel = MagicMock()
+        channel.fetch_message = AsyncMock()
+        message = MagicMock(id=5)
+        bot = MagicMock()
+        bot.guild_config_cache.peek.return_value = {"config_version": 1}
+        bot.get_channel.return_value = channel
+        bot.cached_messages = [message]
+        bot.get_context = AsyncMock()
+        bot.get_context_config = AsyncMock(
+            return_value=MockGuildConfig(
+                guild_id="1",
+                extensions={"protect": {"channels": {"value": ["10"]}}},
+            )
+        )
+        protector = setup_local_extension(bot)
+        protector.protected_channels = {"1": (1, {"10"})}
+        protector.scanned_contents = {}
+        protector.extension_enabled = MagicMock(return_value=True)
+        protector.match = AsyncMock(return_value=True)
+        protector.response = AsyncMock()
+        payload = MockRawMessageUpdateEvent(
+            guild_id=1,
+            channel_id=10,
+            message_id=5,
+            data={"id": "5", "content": "new"},
+            cached_message=MockMessage(content="old"),
+        )
+
+        # Step 2 - Call the function
+        await protector.on_raw_message_edit(payload)
+
+        # Step 3 - Assert that everything works
+        channel.fetch_message.assert_not_awaited()
+        bot.get_context.assert_awaited_once_with(message)
+        protector.response.assert_awaited_once()
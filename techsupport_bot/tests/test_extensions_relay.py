@@ -0,0 +1,100 @@
+"""
+This is a file to test the extensions/relay.py file
+This contains 4 tests
+"""
+
+
+from unittest.mock import AsyncMock, MagicMock
+
+import munch
+import pytest
+from extensions import relay
+
+
+def setup_local_mappings(rows=None):
+    """A simple function to setup the relay map store with a fake database
+
+    Args:
+        rows (list, optional): The IRCChannelMapping rows in the database.
+        Defaults to None.
+
+    Returns:
+        RelayMappings: The instance of the RelayMappings class
+    """
+    mappings = relay.RelayMappings(bot=MagicMock())
+    mappings.model = MagicMock()
+    mappings.model.query.gino.all = AsyncMock(return_value=rows or [])
+    mappings.model.create = AsyncMock()
+    mappings.model.delete.where.return_value.gino.status = AsyncMock()
+    return mappings
+
+
+class Test_RelayMappings:
+    """Tests to ensure the maps are read from a snapshot and written as deltas"""
+
+    @pytest.mark.asyncio
+    async def test_load(self):
+        """Test to ensure the database is read into the snapshot"""
+        # Step 1 - Setup env
+        rows = [
+            munch.Munch(guild_id="1", discord_channel_id="10", irc_channel_id="#a"),
+            munch.Munch(guild_id="2", discord_channel_id="20", irc_channel_id="#b"),
+        ]
+        mappings = setup_local_mappings(rows)
+
+        # Step 2 - Call the function
+        await mappings.load()
+
+        # Step 3 - Assert that everything works
+        assert mappings.loaded
+        assert mappings.get_irc_channel("10") == "#a"
+        assert mappings.get_discord_channel("#b") == "20"
+        assert mappings.get_guild_maps("1") == [("10", "#a")]
+
+    @pytest.mark.asyncio
+    async def test_link_swaps_snapshot(self):
+        """Test to ensure a link writes one row and replaces the snapshot"""
+        # Step 1 - Setup env
+        mappings = setup_local_mappings()
+        old_snapshot = mappings.snapshot
+
+        # Step 2 - Call the function
+        linked = await mappings.link("1", "10", "#a")
+
+        # Step 3 - Assert that everything works
+        assert linked
+        assert "10" in mappings
+        assert not old_snapshot
+        mappings.model.create.assert_awaited_once()
+        mappings.model.query.gino.all.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_link_already_linked(self):
+        """Test to ensure a channel that is already linked isn't written again"""
+        # Step 1 - Setup env
+        mappings = setup_local_mappings()
+        await mappings.link("1", "10", "#a")
+
+        # Step 2 - Call the function
+        linked = await mappings.link("1", "20", "#a")
+
+        # Step 3 - Assert that everything works
+        assert not linked
+        assert len(mappings) == 1
+        mappings.model.create.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_unlink(self):
+        """Test to ensure an unlink deletes the row and drops it from the snapshot"""
+        # Step 1 - Setup env
+        mappings = setup_local_mappings()
+        await mappings.link("1", "10", "#a")
+
+        # Step 2 - Call the function
+        irc_channel = await mappings.unlink("10")
+
+        # Step 3 - Assert that everything works
+        assert irc_channel == "#a"
+        assert "10" not in mappings
+        assert not mappings.get_guild_maps("1")
+        assert await mappings.unlink("10") is None
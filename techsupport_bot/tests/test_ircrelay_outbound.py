@@ -0,0 +1,133 @@
+"""
+This is a file to test the ircrelay/outbound.py file
+This contains 7 tests
+"""
+
+
+from unittest.mock import MagicMock
+
+from ircrelay import outbound
+
+
+class Test_OutboundQueue:
+    """Tests to ensure messages to IRC are queued and sent with flood control"""
+
+    def test_token_bucket_limits_sends(self):
+        """Test to ensure only as many lines as the bucket allows are sent"""
+        # Step 1 - Setup env
+        send = MagicMock()
+        queue = outbound.OutboundQueue(
+            send=send, max_depth=5, rate=0, burst=2, policy="summarize"
+        )
+        for number in range(3):
+            queue.put("#a", f"line {number}")
+
+        # Step 2 - Call the function
+        queue.flush()
+
+        # Step 3 - Assert that everything works
+        assert send.call_count == 2
+        assert queue.get_depth() == 1
+
+    def test_merge_same_author(self):
+        """Test to ensure consecutive lines from one author become one line"""
+        # Step 1 - Setup env
+        send = MagicMock()
+        queue = outbound.OutboundQueue(
+            send=send, max_depth=2, rate=0, burst=2, policy="summarize"
+        )
+        prefix = "[D] <user> "
+
+        # Step 2 - Call the function
+        queue.put("#a", f"{prefix}one", author=1, prefix=prefix)
+        queue.put("#a", f"{prefix}two", author=1, prefix=prefix)
+        queue.put("#a", "[D] <other> three", author=2, prefix="[D] <other> ")
+        queue.flush()
+
+        # Step 3 - Assert that everything works
+        assert send.call_args_list[0].args == ("#a", "[D] <user> one | two")
+        assert queue.get_stats()["#a"]["merged"] == 1
+
+    def test_channels_take_turns(self):
+        """Test to ensure a busy channel doesn't starve the others"""
+        # Step 1 - Setup env
+        send = MagicMock()
+        queue = outbound.OutboundQueue(
+            send=send, max_depth=5, rate=0, burst=2, policy="summarize"
+        )
+        for number in range(3):
+            queue.put("#a", f"a {number}")
+        queue.put("#b", "b 0")
+
+        # Step 2 - Call the function
+        queue.flush()
+
+        # Step 3 - Assert that everything works
+        assert [call.args[0] for call in send.call_args_list] == ["#a", "#b"]
+
+    def test_summarize_overflow(self):
+        """Test to ensure lost lines are counted once the queue drains"""
+        # Step 1 - Setup env
+        send = MagicMock()
+        queue = outbound.OutboundQueue(
+            send=send, max_depth=2, rate=0, burst=3, policy="summarize"
+        )
+        for number in range(4):
+            queue.put("#a", f"line {number}")
+
+        # Step 2 - Call the function
+        queue.flush()
+        queue.bucket.tokens = 1
+        queue.flush()
+
+        # Step 3 - Assert that everything works
+        assert queue.get_stats()["#a"]["dropped"] == 2
+        assert "2 message(s)" in send.call_args_list[-1].args[1]
+
+    def test_link_overflow(self):
+        """Test to ensure lost lines are handed off to be pasted"""
+        # Step 1 - Setup env
+        paste = MagicMock()
+        send = MagicMock()
+        queue = outbound.OutboundQueue(
+            send=send, paste=paste, max_depth=2, rate=0, burst=3, policy="link"
+        )
+        for number in range(3):
+            queue.put("#a", f"line {number}")
+
+        # Step 2 - Call the function
+        queue.flush()
+
+        # Step 3 - Assert that everything works
+        paste.assert_called_once_with("#a", "line 2")
+
+    def test_send_error_is_skipped(self):
+        """Test to ensure a line that fails to send doesn't stop the others"""
+        # Step 1 - Setup env
+        send = MagicMock()
+        queue = outbound.OutboundQueue(
+            send=send, max_depth=2, rate=0, burst=2, policy="summarize"
+        )
+        send.side_effect = [ValueError("Messages limited to 512 bytes"), None]
+        queue.put("#a", "bad line")
+        queue.put("#b", "ok line")
+
+        # Step 2 - Call the function
+        queue.flush()
+
+        # Step 3 - Assert that everything works
+        assert send.call_args_list[1].args == ("#b", "ok line")
+        assert queue.get_depth() == 0
+
+    def test_split_by_bytes(self):
+        """Test to ensure lines are cut by their encoded length, not characters"""
+        # Step 1 - Setup env
+        queue = outbound.OutboundQueue(send=MagicMock())
+
+        # Step 2 - Call the function
+        pieces = queue.split("#a", "é" * 430)
+
+        # Step 3 - Assert that everything works
+        assert "".join(pieces) == "é" * 430
+        for piece in pieces:
+            assert len(f"PRIVMSG #a :{piece}\r\n".encode("utf-8")) <= 512